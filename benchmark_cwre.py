@@ -0,0 +1,337 @@
+"""
+Benchmark reproducible del pipeline de selección CWRE.
+
+Mide score_coincidencia, el scoring vectorizado, los tres selectores (con
+scoring completo y con la recuperación en dos etapas, más su recall frente al
+scoring completo) y la ruta completa de /api/mando-integral (cliente ASGI en proceso, sin red) sobre
+catálogos sintéticos de distinto tamaño y con historiales de distinta longitud.
+Todo se genera a partir de una semilla fija, así que dos ejecuciones sobre el
+mismo commit miden exactamente los mismos casos.
+
+Uso:
+    python benchmark_cwre.py                              # 200 / 10k / 100k misiones
+    python benchmark_cwre.py --tamanos 200 --salida base.json
+    python benchmark_cwre.py --tamanos 100000 --candidatos 500,2000
+    python benchmark_cwre.py --salida nuevo.json --comparar base.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+# El vigilante del catálogo no debe correr durante las mediciones
+os.environ.setdefault("OTG_CATALOGO_RECARGA_SEGUNDOS", "0")
+
+import httpx
+import numpy as np
+
+import main
+
+SEMILLA = 20240601
+TAMANOS = (200, 10_000, 100_000)
+LARGOS_HISTORIAL = (0, 5, 50)
+MUESTRAS_ASIGNACION = 25 # Llamadas medidas con tracemalloc (aparte del cronómetro)
+MENTE_BENCHMARK = "aburrido"
+MARCAS_DESAHOGO = ("walmart", "amazon", "instagram", "spotify")
+
+# ============================================================
+# GENERADORES SINTÉTICOS
+# ============================================================
+def generar_vector(rng, completo):
+    """Vector de necesidades: las 18 claves (estilo SALIR) o 5 dominantes (estilo CASA)."""
+    claves = main.NECESIDADES_SCORING if completo else rng.sample(main.NECESIDADES_SCORING, 5)
+    return {clave: rng.randrange(0, 101, 5) for clave in claves}
+
+def generar_mision_salir(rng, mision_id):
+    mision = {"id": mision_id, "gps": f"lugar {mision_id}"}
+    for campo in main.CAMPOS_BILINGUES_SALIR:
+        mision[campo] = f"{campo} {mision_id}"
+        mision[f"{campo}_en"] = f"{campo} en {mision_id}"
+    mision["vector_necesidades"] = generar_vector(rng, completo=True)
+    return mision
+
+def generar_particiones(tamano, rng):
+    """CASA_ES/CASA_EN y SALIR/<mente> con `tamano` misiones cada una."""
+    casa_es, casa_en = [], []
+    for mision_id in range(1, tamano + 1):
+        vector = generar_vector(rng, completo=False)
+        casa_es.append({"id": mision_id, "titulo": f"Misión {mision_id}", "descripcion": "Respira.", "vector_necesidades": vector})
+        casa_en.append({"id": mision_id, "titulo": f"Mission {mision_id}", "descripcion": "Breathe.", "vector_necesidades": vector})
+    salir = [generar_mision_salir(rng, 1_000_000 + mision_id) for mision_id in range(tamano)]
+    return {"CASA_ES": casa_es, "CASA_EN": casa_en, f"SALIR/{MENTE_BENCHMARK}": salir}
+
+def generar_perfil(rng):
+    perfil = {clave: rng.randint(0, 100) for clave in main.NECESIDADES_SCORING}
+    perfil["indicador_ansiedad"] = rng.choice((0, 30, 60, 80, 100))
+    return perfil
+
+def generar_historial(rng, ids, largo):
+    return rng.sample(ids, min(largo, len(ids)))
+
+def generar_payload(rng, ids_casa, ids_salir):
+    """Mezcla realista: 45% CASA, 45% SALIR, 10% recuperación forzada por marca."""
+    payload = {
+        "perfil_local": generar_perfil(rng),
+        "lang": rng.choice(("es", "en")),
+        "zip": rng.choice(("", "33101")),
+        "budget": rng.choice(("0", "1", "2")),
+        "historial_casa": generar_historial(rng, ids_casa, main.MAX_HISTORY_CASA),
+        "historial_salir": generar_historial(rng, ids_salir, main.MAX_HISTORY_SALIR),
+    }
+    tirada = rng.random()
+    if tirada < 0.45:
+        payload["modo"] = "CASA"
+    elif tirada < 0.9:
+        payload.update(modo="SALIR", mente=MENTE_BENCHMARK)
+    else:
+        payload.update(modo="SALIR", mente=MENTE_BENCHMARK, desahogo=f"estoy harto de {rng.choice(MARCAS_DESAHOGO)}")
+    return payload
+
+def cargar_catalogo_sintetico(tamano, semilla, directorio):
+    ruta = os.path.join(directorio, f"catalogo_{tamano}.jsonl")
+    main.escribir_catalogo_jsonl(generar_particiones(tamano, random.Random(semilla)), ruta)
+    return main.CatalogoCompilado(main.ArchivoCatalogo(ruta)).precargar()
+
+# ============================================================
+# MEDICIÓN
+# ============================================================
+def resumir(caso, duraciones_ns, asignaciones, **contexto):
+    ordenadas = sorted(duraciones_ns)
+    total_s = sum(ordenadas) / 1e9
+    return {
+        "caso": caso,
+        **contexto,
+        "iteraciones": len(ordenadas),
+        "p50_us": round(ordenadas[len(ordenadas) // 2] / 1e3, 2),
+        "p99_us": round(ordenadas[min(len(ordenadas) - 1, int(len(ordenadas) * 0.99))] / 1e3, 2),
+        "media_us": round(statistics.fmean(ordenadas) / 1e3, 2),
+        "por_segundo": round(len(ordenadas) / total_s, 1) if total_s else None,
+        "asignacion_pico_bytes": round(statistics.fmean(asignaciones)) if asignaciones else None,
+        "asignacion_pico_bytes_max": max(asignaciones) if asignaciones else None,
+    }
+
+def medir_asignaciones(funcion, casos):
+    """Pico de memoria asignada por llamada (bytes), con tracemalloc activo solo aquí."""
+    picos = []
+    tracemalloc.start()
+    try:
+        for caso in casos[:MUESTRAS_ASIGNACION]:
+            base = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            funcion(*caso)
+            picos.append(tracemalloc.get_traced_memory()[1] - base)
+    finally:
+        tracemalloc.stop()
+    return picos
+
+def seleccion_recuperada(selector, misiones, perfil, historial, limite):
+    filas, scores = main.puntuar_candidatos(misiones, perfil, historial, limite=limite)
+    return selector(misiones, perfil, historial, scores=scores, filas=filas)
+
+def recall_seleccion(selector, casos, limite):
+    """Fracción de las misiones elegidas con scoring completo que también elige la recuperación."""
+    coincidencias = total = 0
+    for misiones, perfil, historial in casos:
+        random.seed(0)
+        completas = {m.id for m in selector(misiones, perfil, historial)}
+        random.seed(0)
+        recuperadas = {m.id for m in seleccion_recuperada(selector, misiones, perfil, historial, limite)}
+        coincidencias += len(completas & recuperadas)
+        total += len(completas)
+    return round(coincidencias / total, 4) if total else None
+
+def medir(caso, funcion, casos, semilla, segundos, minimo, **contexto):
+    """Cronometra `funcion(*caso)` recorriendo `casos` hasta agotar el presupuesto de tiempo."""
+    random.seed(semilla) # Los selectores usan el `random` global
+    for argumentos in casos[:3]:
+        funcion(*argumentos) # Calentamiento: compila particiones y llena cachés perezosas
+    duraciones = []
+    limite = time.perf_counter() + segundos
+    while len(duraciones) < minimo or (time.perf_counter() < limite and len(duraciones) < len(casos)):
+        argumentos = casos[len(duraciones) % len(casos)]
+        inicio = time.perf_counter_ns()
+        funcion(*argumentos)
+        duraciones.append(time.perf_counter_ns() - inicio)
+    random.seed(semilla)
+    return resumir(caso, duraciones, medir_asignaciones(funcion, casos), **contexto)
+
+async def medir_http(payloads, semilla, segundos, minimo):
+    """Ruta completa de /api/mando-integral a través de la app ASGI, sin sockets."""
+    transporte = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transporte, base_url="http://benchmark") as cliente:
+        random.seed(semilla)
+        for payload in payloads[:3]:
+            (await cliente.post("/api/mando-integral", json=payload)).raise_for_status()
+        duraciones, bytes_respuesta = [], []
+        limite = time.perf_counter() + segundos
+        while len(duraciones) < minimo or (time.perf_counter() < limite and len(duraciones) < len(payloads)):
+            payload = payloads[len(duraciones) % len(payloads)]
+            inicio = time.perf_counter_ns()
+            respuesta = await cliente.post("/api/mando-integral", json=payload)
+            duraciones.append(time.perf_counter_ns() - inicio)
+            respuesta.raise_for_status()
+            bytes_respuesta.append(len(respuesta.content))
+        picos = []
+        tracemalloc.start()
+        try:
+            for payload in payloads[:MUESTRAS_ASIGNACION]:
+                base = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+                await cliente.post("/api/mando-integral", json=payload)
+                picos.append(tracemalloc.get_traced_memory()[1] - base)
+        finally:
+            tracemalloc.stop()
+    return duraciones, picos, round(statistics.fmean(bytes_respuesta))
+
+# ============================================================
+# SUITE
+# ============================================================
+def benchmark_tamano(catalogo, tamano, args):
+    rng = random.Random(args.semilla + tamano)
+    casa = catalogo.misiones_casa("ES")
+    salir = catalogo.misiones_salir(MENTE_BENCHMARK)
+    ids_casa = [m.id for m in casa]
+    ids_salir = [m.id for m in salir]
+    perfiles = [generar_perfil(rng) for _ in range(args.casos)]
+    resultados = []
+    medicion = dict(semilla=args.semilla, segundos=args.segundos, minimo=args.minimo)
+
+    for largo in args.historiales:
+        historiales_salir = [generar_historial(rng, ids_salir, largo) for _ in perfiles]
+        historiales_casa = [generar_historial(rng, ids_casa, largo) for _ in perfiles]
+        contexto = dict(tamano_catalogo=tamano, largo_historial=largo)
+
+        pares = [
+            (perfil, mision.vector_necesidades, historial, mision.id)
+            for perfil, historial in zip(perfiles, historiales_salir)
+            for mision in (rng.choice(salir),)
+        ]
+        resultados.append(medir("score_coincidencia", main.score_coincidencia, pares, **medicion, **contexto))
+
+        casos_salir = list(zip([salir] * len(perfiles), perfiles, historiales_salir))
+        resultados.append(medir("puntuar_misiones", main.puntuar_misiones, casos_salir, **medicion, **contexto))
+        resultados.append(medir("seleccionar_mision_inteligente", main.seleccionar_mision_inteligente, casos_salir, **medicion, **contexto))
+        resultados.append(medir(
+            "seleccionar_n_misiones_inteligentes",
+            lambda misiones, perfil, historial: main.seleccionar_n_misiones_inteligentes(3, misiones, perfil, historial),
+            casos_salir, **medicion, **contexto
+        ))
+        casos_casa = list(zip([casa] * len(perfiles), perfiles, historiales_casa))
+        resultados.append(medir("seleccionar_misiones_casa_inteligente", main.seleccionar_misiones_casa_inteligente, casos_casa, **medicion, **contexto))
+
+        # Recuperación en dos etapas frente al scoring completo de arriba
+        selectores = (
+            ("seleccionar_n_misiones_inteligentes", casos_salir,
+             lambda misiones, perfil, historial, **extra: main.seleccionar_n_misiones_inteligentes(3, misiones, perfil, historial, **extra)),
+            ("seleccionar_misiones_casa_inteligente", casos_casa, main.seleccionar_misiones_casa_inteligente),
+        )
+        for limite in args.candidatos:
+            if not 0 < limite < tamano:
+                continue
+            for nombre, casos, selector in selectores:
+                resultado = medir(
+                    f"{nombre}_recuperacion",
+                    lambda misiones, perfil, historial: seleccion_recuperada(selector, misiones, perfil, historial, limite),
+                    casos, **medicion, **contexto, candidatos=limite
+                )
+                resultado["recall"] = recall_seleccion(selector, casos[:args.casos_recall], limite)
+                resultados.append(resultado)
+
+    payloads = [generar_payload(rng, ids_casa, ids_salir) for _ in range(args.casos)]
+    anterior = main.CATALOGO
+    main.instalar_catalogo(catalogo)
+    try:
+        for caso, lote in (
+            ("mando_integral_http", payloads),
+            ("mando_integral_http_compacto", [{**payload, "compacto": True} for payload in payloads]),
+        ):
+            duraciones, picos, bytes_medios = asyncio.run(medir_http(lote, **medicion))
+            resultados.append(resumir(
+                caso, duraciones, picos,
+                tamano_catalogo=tamano, largo_historial=None, bytes_respuesta=bytes_medios
+            ))
+    finally:
+        main.instalar_catalogo(anterior)
+    return resultados
+
+def commit_actual():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)), check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def clave_resultado(resultado):
+    return (resultado["caso"], resultado["tamano_catalogo"], resultado["largo_historial"], resultado.get("candidatos"))
+
+def comparar(actual, ruta_base):
+    """Imprime el cociente p50/p99 actual/base por caso (>1 = más lento que la base)."""
+    with open(ruta_base, encoding="utf-8") as archivo:
+        base = {clave_resultado(r): r for r in json.load(archivo)["resultados"]}
+    print(f"\nComparación contra {ruta_base}:")
+    for resultado in actual["resultados"]:
+        previo = base.get(clave_resultado(resultado))
+        if previo is None:
+            continue
+        cociente_p50 = resultado["p50_us"] / previo["p50_us"] if previo["p50_us"] else float("nan")
+        cociente_p99 = resultado["p99_us"] / previo["p99_us"] if previo["p99_us"] else float("nan")
+        print(f"  {resultado['caso']:<40} n={resultado['tamano_catalogo']:<7} h={str(resultado['largo_historial']):<4} "
+              f"p50 x{cociente_p50:.2f}  p99 x{cociente_p99:.2f}")
+
+def lista_enteros(texto):
+    return [int(valor) for valor in texto.split(",") if valor]
+
+def main_benchmark(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark del pipeline de selección CWRE")
+    parser.add_argument("--semilla", type=int, default=SEMILLA)
+    parser.add_argument("--tamanos", type=lista_enteros, default=list(TAMANOS), help="p. ej. 200,10000,100000")
+    parser.add_argument("--historiales", type=lista_enteros, default=list(LARGOS_HISTORIAL), help="longitudes de historial")
+    parser.add_argument("--casos", type=int, default=500, help="perfiles sintéticos por tamaño")
+    parser.add_argument("--segundos", type=float, default=1.0, help="presupuesto de tiempo por caso")
+    parser.add_argument("--minimo", type=int, default=20, help="iteraciones mínimas por caso")
+    parser.add_argument("--candidatos", type=lista_enteros, default=[main.RECUPERACION_CANDIDATOS],
+                        help="tamaños de lista corta para la recuperación en dos etapas (0 = no medirla)")
+    parser.add_argument("--casos-recall", type=int, default=100, help="perfiles con los que se mide el recall")
+    parser.add_argument("--salida", help="ruta del JSON de resultados (por defecto, stdout)")
+    parser.add_argument("--comparar", help="JSON de una ejecución anterior para comparar")
+    args = parser.parse_args(argv)
+
+    informe = {
+        "meta": {
+            "commit": commit_actual(),
+            "fecha": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "plataforma": platform.platform(),
+            "semilla": args.semilla,
+        },
+        "resultados": [],
+    }
+    with tempfile.TemporaryDirectory() as directorio:
+        for tamano in args.tamanos:
+            print(f"Catálogo sintético de {tamano} misiones...", file=sys.stderr)
+            catalogo = cargar_catalogo_sintetico(tamano, args.semilla, directorio)
+            informe["resultados"] += benchmark_tamano(catalogo, tamano, args)
+
+    texto = json.dumps(informe, indent=2, ensure_ascii=False)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            archivo.write(texto + "\n")
+    else:
+        print(texto)
+    if args.comparar:
+        comparar(informe, args.comparar)
+
+if __name__ == "__main__":
+    main_benchmark()
@@ -0,0 +1,163 @@
+"""
+Generador de carga para /api/mando-integral contra un servidor real (HTTP, no ASGI en proceso).
+
+Envía una mezcla realista de tráfico (CASA, SALIR y recuperación forzada por marca)
+con N conexiones concurrentes durante un tiempo fijo y reporta throughput, latencias
+p50/p99 y errores como JSON.
+
+Uso:
+    # Contra un servidor ya levantado
+    python carga_mando.py --url http://127.0.0.1:8000 --concurrencia 64 --segundos 20
+
+    # Levanta gunicorn (gunicorn.conf.py) con cada configuración y compara
+    python carga_mando.py --lanzar --workers 1,2,4 --ejecucion hilos,directo --salida carga.json
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+SEMILLA = 20240601
+MENTES = ("aburrido", "agotado", "estresado", "cansado", "ansioso")
+NECESIDADES = (
+    "movimiento", "naturaleza", "silencio", "agua", "sol", "sombra", "aire_fresco", "creatividad", "comunidad",
+    "aprendizaje", "juego", "contemplacion", "descanso", "organizacion", "alimentacion", "musica", "risa", "esperanza",
+)
+DESAHOGOS_MARCA = ("no aguanto más walmart", "otra vez en amazon", "horas en instagram", "spotify todo el día")
+DESAHOGOS_NEUTROS = ("", "", "estoy cansado", "necesito aire", "mucho ruido hoy")
+
+def generar_payload(rng, proporcion_casa, proporcion_marca):
+    payload = {
+        "lang": rng.choice(("es", "en")),
+        "zip": rng.choice(("", "33101", "10001")),
+        "budget": rng.choice(("0", "1", "2")),
+        "perfil": rng.choice(("solo", "familia", "accesible")),
+        "mente": rng.choice(MENTES),
+        "perfil_local": {necesidad: rng.randint(0, 100) for necesidad in NECESIDADES},
+        "desahogo": rng.choice(DESAHOGOS_NEUTROS),
+    }
+    payload["perfil_local"]["indicador_ansiedad"] = rng.choice((0, 30, 60, 90))
+    tirada = rng.random()
+    if tirada < proporcion_marca:
+        payload.update(modo="SALIR", desahogo=rng.choice(DESAHOGOS_MARCA), historial_salir=[])
+    elif tirada < proporcion_marca + proporcion_casa:
+        payload.update(modo="CASA", historial_casa=rng.sample(range(1, 80), 4))
+    else:
+        payload.update(modo="SALIR", historial_salir=rng.sample(range(100, 260), 3))
+    return payload
+
+def percentil(ordenadas, fraccion):
+    return ordenadas[min(len(ordenadas) - 1, int(len(ordenadas) * fraccion))]
+
+async def ejecutar_carga(url, concurrencia, segundos, payloads):
+    """Cada conexión virtual envía peticiones una tras otra hasta agotar el tiempo."""
+    latencias, estados = [], {}
+    siguiente = itertools.cycle(payloads)
+    limites = httpx.Limits(max_connections=concurrencia, max_keepalive_connections=concurrencia)
+    async with httpx.AsyncClient(base_url=url, limits=limites, timeout=30) as cliente:
+        fin = time.perf_counter() + segundos
+
+        async def usuario():
+            while time.perf_counter() < fin:
+                inicio = time.perf_counter()
+                try:
+                    respuesta = await cliente.post("/api/mando-integral", json=next(siguiente))
+                    estado = respuesta.status_code
+                except httpx.HTTPError as e:
+                    estado = type(e).__name__
+                latencias.append(time.perf_counter() - inicio)
+                estados[estado] = estados.get(estado, 0) + 1
+
+        inicio_total = time.perf_counter()
+        await asyncio.gather(*(usuario() for _ in range(concurrencia)))
+        duracion = time.perf_counter() - inicio_total
+
+    ordenadas = sorted(latencias)
+    correctas = estados.get(200, 0)
+    return {
+        "peticiones": len(ordenadas),
+        "por_segundo": round(correctas / duracion, 1),
+        "p50_ms": round(percentil(ordenadas, 0.50) * 1e3, 2) if ordenadas else None,
+        "p99_ms": round(percentil(ordenadas, 0.99) * 1e3, 2) if ordenadas else None,
+        "media_ms": round(statistics.fmean(ordenadas) * 1e3, 2) if ordenadas else None,
+        "estados": {str(estado): cantidad for estado, cantidad in sorted(estados.items(), key=str)},
+    }
+
+def esperar_servidor(url, segundos=60):
+    limite = time.time() + segundos
+    while time.time() < limite:
+        try:
+            httpx.get(f"{url}/api/get-company-questions?company=x", timeout=1)
+            return True
+        except httpx.HTTPError:
+            time.sleep(0.25)
+    return False
+
+def lanzar_servidor(puerto, workers, ejecucion):
+    directorio = os.path.dirname(os.path.abspath(__file__))
+    entorno = {**os.environ, "PORT": str(puerto), "OTG_WORKERS": str(workers), "OTG_EJECUCION": ejecucion}
+    return subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "main:app", "--config", "gunicorn.conf.py"],
+        cwd=directorio, env=entorno, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+def main_carga(argv=None):
+    parser = argparse.ArgumentParser(description="Generador de carga para /api/mando-integral")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrencia", type=int, default=32)
+    parser.add_argument("--segundos", type=float, default=15)
+    parser.add_argument("--casa", type=float, default=0.45, help="proporción de tráfico CASA")
+    parser.add_argument("--marca", type=float, default=0.10, help="proporción de recuperación forzada")
+    parser.add_argument("--payloads", type=int, default=2000, help="payloads distintos (se reciclan)")
+    parser.add_argument("--semilla", type=int, default=SEMILLA)
+    parser.add_argument("--lanzar", action="store_true", help="arranca gunicorn con cada configuración")
+    parser.add_argument("--workers", default="2", help="lista de workers para --lanzar, p. ej. 1,2,4")
+    parser.add_argument("--ejecucion", default="hilos", help="lista de OTG_EJECUCION para --lanzar")
+    parser.add_argument("--puerto", type=int, default=8765)
+    parser.add_argument("--salida", help="ruta del JSON de resultados (por defecto, stdout)")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.semilla)
+    payloads = [generar_payload(rng, args.casa, args.marca) for _ in range(args.payloads)]
+    mezcla = {"casa": args.casa, "salir": round(1 - args.casa - args.marca, 3), "recuperacion_forzada": args.marca}
+    resultados = []
+
+    if not args.lanzar:
+        resultado = asyncio.run(ejecutar_carga(args.url, args.concurrencia, args.segundos, payloads))
+        resultados.append({"url": args.url, "concurrencia": args.concurrencia, "mezcla": mezcla, **resultado})
+    else:
+        url = f"http://127.0.0.1:{args.puerto}"
+        for workers, ejecucion in itertools.product(
+            [int(w) for w in args.workers.split(",")], args.ejecucion.split(",")
+        ):
+            print(f"workers={workers} ejecucion={ejecucion}...", file=sys.stderr)
+            servidor = lanzar_servidor(args.puerto, workers, ejecucion)
+            try:
+                if not esperar_servidor(url):
+                    print("  el servidor no arrancó", file=sys.stderr)
+                    continue
+                resultado = asyncio.run(ejecutar_carga(url, args.concurrencia, args.segundos, payloads))
+            finally:
+                servidor.terminate()
+                servidor.wait(timeout=30)
+            resultados.append({
+                "workers": workers, "ejecucion": ejecucion, "concurrencia": args.concurrencia, "mezcla": mezcla, **resultado
+            })
+
+    texto = json.dumps({"semilla": args.semilla, "resultados": resultados}, indent=2, ensure_ascii=False)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            archivo.write(texto + "\n")
+    else:
+        print(texto)
+
+if __name__ == "__main__":
+    main_carga()
@@ -0,0 +1,42 @@
+# OPEN THAN GO SYSTEM - Configuración de servicio (gunicorn + UvicornWorker)
+# Procfile: gunicorn main:app --config gunicorn.conf.py
+# Todo se puede sobrescribir por entorno sin tocar este archivo:
+#   OTG_WORKERS        workers (por defecto: CPUs disponibles para el proceso, mínimo 2)
+#   OTG_PRELOAD        "1" (defecto) carga main.py en el maestro antes del fork
+#   OTG_KEEPALIVE      segundos que se mantiene abierta una conexión HTTP/1.1 ociosa
+#   OTG_BACKLOG        conexiones pendientes en la cola del socket
+#   OTG_TIMEOUT        segundos antes de reiniciar un worker bloqueado
+#   OTG_MAX_REQUESTS   reinicio periódico de workers (0 = nunca)
+import os
+
+def cpus_disponibles():
+    """CPUs que este proceso puede usar (respeta taskset/cgroups cuando el SO lo expone)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+CPUS = cpus_disponibles()
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+worker_class = "uvicorn.workers.UvicornWorker"
+# Workers asíncronos: uno por CPU basta para saturar la máquina (la selección ya sale del event loop);
+# mínimo 2 para que un reinicio no deje el servicio sin nadie atendiendo.
+workers = int(os.environ.get("OTG_WORKERS", max(2, CPUS)))
+
+# preload_app: main.py (catálogo compilado, matrices de scoring, registro de marcas, regex de
+# detección) se carga una sola vez en el maestro y los workers lo comparten copy-on-write.
+preload_app = os.environ.get("OTG_PRELOAD", "1") == "1"
+if preload_app:
+    # Compila todas las particiones antes del fork para que también se compartan
+    os.environ.setdefault("OTG_CATALOGO_PRECARGA", "1")
+
+# Los pools de selección de cada worker se reparten las CPUs en lugar de pedir todas cada uno
+os.environ.setdefault("OTG_SELECCION_TRABAJADORES", str(max(1, CPUS // workers)))
+
+keepalive = int(os.environ.get("OTG_KEEPALIVE", 5)) # UvicornWorker lo usa como timeout_keep_alive
+backlog = int(os.environ.get("OTG_BACKLOG", 2048))
+timeout = int(os.environ.get("OTG_TIMEOUT", 30))
+graceful_timeout = 20
+max_requests = int(os.environ.get("OTG_MAX_REQUESTS", 0))
+max_requests_jitter = max_requests // 10
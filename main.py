@@ -1,14 +1,47 @@
 # OPEN THAN GO SYSTEM - Contextual Wellbeing Routing Engine (CWRE) V.6.0.1 # Company: May Roga LLC # File: main.py - SECCIÓN 1 DE 2 (Backend Core)
-from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import JSONResponse, FileResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
+from starlette.concurrency import run_in_threadpool
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints, ValidationError, create_model, field_validator
+from typing import Annotated, Any, List, Optional, Union
 import uvicorn
 import os
+import bisect
+import heapq
 import random
 import re
+import sys
+import json
+import sqlite3
+import weakref
 from datetime import datetime
 import urllib.parse
+import hashlib
+import logging
+import math
+import gzip
+import mimetypes
+import threading
+import time
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from collections import OrderedDict
+from types import MappingProxyType
 import stripe
+import numpy as np
+
+try:
+    import orjson
+except ImportError: # Opcional: sin orjson las respuestas usan el codificador estándar
+    orjson = None
+
+try:
+    import brotli
+except ImportError: # Opcional: sin brotli los estáticos solo se pre-comprimen en gzip
+    brotli = None
+
+logger = logging.getLogger(__name__)
 
 # ============================================================
 # INYECCIÓN CRÍTICA DE CONTROL: PASARELA STRIPE & BYPASS MAESTRO
@@ -24,6 +57,13 @@ PLANES_STRIPE = {
     "mensual": "price_1TtblSBOA5mT4t0PGiYvT2l9",
     "anual": "price_1TtbltBOA5mT4t0PpJ8io219"
 }
+# Checkout: OTG_STRIPE_API_BASE apunta a un stand-in local (stripe-mock, p. ej. http://localhost:12111)
+STRIPE_API_BASE = os.environ.get("OTG_STRIPE_API_BASE")
+STRIPE_TIMEOUT_SEGUNDOS = float(os.environ.get("OTG_STRIPE_TIMEOUT", 15))
+STRIPE_TRABAJADORES = int(os.environ.get("OTG_STRIPE_TRABAJADORES", 4))
+STRIPE_REINTENTOS = int(os.environ.get("OTG_STRIPE_REINTENTOS", 2)) # Seguros: todo checkout lleva idempotency key
+VENTANA_IDEMPOTENCIA_CHECKOUT = int(os.environ.get("OTG_STRIPE_VENTANA_SEGUNDOS", 600))
+TTL_CHECKOUT_SEGUNDOS = float(os.environ.get("OTG_STRIPE_CACHE_TTL_SEGUNDOS", 30))
 # ============================================================
 
 link_base = "https://www.google.com/maps/search/?api=1&query="
@@ -32,7 +72,122 @@ app = FastAPI()
 # Ensure the 'static' directory exists before mounting
 if not os.path.exists("static"):
     os.makedirs("static")
-app.mount("/static", StaticFiles(directory="static"), name="static")
+
+# ============================================================
+# RECURSOS ESTÁTICOS EN MEMORIA (ETag + Cache-Control + gzip/brotli)
+# Al arrancar se leen los archivos de static/, se calcula un ETag
+# fuerte (sha256 del contenido) y las variantes comprimidas. Cada
+# petición es un lookup: 304 si If-None-Match coincide, si no la
+# variante que acepte el cliente. session.html referencia engine.js
+# con ?v=<versión> (prefijo del ETag): un asset se sirve como inmutable
+# solo si la petición trae esa misma versión; sin ?v= o con una versión
+# vieja se revalida (no-cache + ETag/304), como el HTML.
+# OTG_ESTATICOS_CACHE=0 vuelve a StaticFiles (desarrollo: sin reiniciar).
+# ============================================================
+CACHE_ESTATICOS = os.environ.get("OTG_ESTATICOS_CACHE", "1") == "1"
+CACHE_CONTROL_INMUTABLE = "public, max-age=31536000, immutable"
+CACHE_CONTROL_REVALIDAR = "no-cache"
+TAMANO_MINIMO_COMPRESION = 512
+TIPOS_COMPRIMIBLES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+
+def etag_fuerte(contenido):
+    return f'"{hashlib.sha256(contenido).hexdigest()[:32]}"'
+
+class RecursoEstatico:
+    """Cuerpo y variantes pre-comprimidas de una respuesta que no cambia mientras vive el proceso."""
+    __slots__ = ("tipo", "etag", "version", "cache_control", "versionado", "variantes")
+
+    def __init__(self, contenido, tipo, cache_control, versionado=False):
+        self.tipo = tipo
+        self.etag = etag_fuerte(contenido)
+        self.version = self.etag.strip('"')[:12] # El ?v= de las URLs versionadas
+        self.cache_control = cache_control
+        self.versionado = versionado
+        self.variantes = {"identity": contenido}
+        if len(contenido) >= TAMANO_MINIMO_COMPRESION and tipo.startswith(TIPOS_COMPRIMIBLES):
+            comprimido = gzip.compress(contenido, compresslevel=9, mtime=0)
+            if len(comprimido) < len(contenido):
+                self.variantes["gzip"] = comprimido
+            if brotli is not None:
+                comprimido = brotli.compress(contenido, quality=11)
+                if len(comprimido) < len(contenido):
+                    self.variantes["br"] = comprimido
+
+    def responder(self, request):
+        cache_control = self.cache_control
+        if self.versionado and request.query_params.get("v") == self.version:
+            cache_control = CACHE_CONTROL_INMUTABLE # La URL cambia con el contenido
+        cabeceras = {"ETag": self.etag, "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+        if coincide_etag(request.headers.get("if-none-match"), self.etag):
+            return Response(status_code=304, headers=cabeceras)
+        codificacion = elegir_codificacion(request.headers.get("accept-encoding", ""), self.variantes)
+        if codificacion != "identity":
+            cabeceras["Content-Encoding"] = codificacion
+        return Response(self.variantes[codificacion], media_type=self.tipo, headers=cabeceras)
+
+def coincide_etag(if_none_match, etag):
+    if not if_none_match:
+        return False
+    candidatos = [valor.strip() for valor in if_none_match.split(",")]
+    # Comparación débil (RFC 9110 §13.1.2): W/"x" vale para un 304 de "x"
+    return "*" in candidatos or etag in candidatos or f"W/{etag}" in candidatos
+
+def elegir_codificacion(accept_encoding, variantes):
+    """La mejor variante disponible aceptada por el cliente (br > gzip > identity), respetando q=0."""
+    aceptadas = {}
+    for parte in accept_encoding.lower().split(","):
+        nombre, _, parametros = parte.strip().partition(";")
+        calidad = 1.0
+        if parametros.strip().startswith("q="):
+            try:
+                calidad = float(parametros.strip()[2:])
+            except ValueError:
+                calidad = 0.0
+        aceptadas[nombre.strip()] = calidad
+    for codificacion in ("br", "gzip"):
+        if codificacion in variantes and aceptadas.get(codificacion, aceptadas.get("*", 0)) > 0:
+            return codificacion
+    return "identity"
+
+def tipo_mime(ruta):
+    tipo = mimetypes.guess_type(ruta)[0] or "application/octet-stream"
+    if tipo.startswith("text/") or tipo in ("application/javascript", "image/svg+xml"):
+        tipo += "; charset=utf-8"
+    return tipo
+
+def cargar_recursos_estaticos(directorio):
+    """{ruta relativa: RecursoEstatico} de todo el directorio; session.html enlaza los assets por versión."""
+    recursos = {}
+    for raiz, _, archivos in os.walk(directorio):
+        for nombre in archivos:
+            ruta = os.path.join(raiz, nombre)
+            relativa = os.path.relpath(ruta, directorio).replace(os.sep, "/")
+            if relativa == "session.html":
+                continue
+            with open(ruta, "rb") as archivo:
+                recursos[relativa] = RecursoEstatico(archivo.read(), tipo_mime(ruta), CACHE_CONTROL_REVALIDAR, versionado=True)
+    ruta_html = os.path.join(directorio, "session.html")
+    if os.path.exists(ruta_html):
+        with open(ruta_html, "rb") as archivo:
+            html = archivo.read()
+        for relativa, recurso in recursos.items():
+            url = f'"/static/{relativa}"'.encode()
+            html = html.replace(url, f'"/static/{relativa}?v={recurso.version}"'.encode())
+        recursos["session.html"] = RecursoEstatico(html, "text/html; charset=utf-8", CACHE_CONTROL_REVALIDAR)
+    return recursos
+
+if CACHE_ESTATICOS:
+    RECURSOS_ESTATICOS = cargar_recursos_estaticos("static")
+
+    @app.api_route("/static/{ruta:path}", methods=["GET", "HEAD"])
+    async def recurso_estatico(ruta: str, request: Request):
+        recurso = RECURSOS_ESTATICOS.get(ruta)
+        if recurso is None:
+            raise HTTPException(status_code=404, detail="Not Found")
+        return recurso.responder(request)
+else:
+    RECURSOS_ESTATICOS = {}
+    app.mount("/static", StaticFiles(directory="static"), name="static")
 
 DEFAULT_NECESSITY_VECTOR = {
     "movimiento": 50,
@@ -60,11 +215,80 @@ DEFAULT_NECESSITY_VECTOR = {
 # MOTOR DE HISTORIAL INTELIGENTE CWRE V2
 # Anti-Repetición + Exploración Controlada
 # ============================================================
-MAX_HISTORY_SALIR = 5
-MAX_HISTORY_CASA = 8
+MAX_HISTORY_SALIR = int(os.environ.get("OTG_MAX_HISTORIAL_SALIR", 5))
+MAX_HISTORY_CASA = int(os.environ.get("OTG_MAX_HISTORIAL_CASA", 8))
 MAX_HISTORY_ORACULO = 12 # This is handled by frontend (engine.js)
 EXPLORATION_RATE = 0.20
 HISTORY_PENALTY_BASE = 40
+# Curva de penalización por recencia (OTG_HISTORIAL_CURVA), factor de HISTORY_PENALTY_BASE
+# según la posición de la misión contando desde la más reciente (0 = la última):
+#   "escalonada"               1.5, 1.0, 0.7 y 0.3 para el resto (la original)
+#   "exponencial:<semivida>"   1.5 * 0.5 ** (posición / semivida)
+#   "lineal:<posiciones>"      de 1.5 a 0 en ese número de posiciones
+CURVA_HISTORIAL = os.environ.get("OTG_HISTORIAL_CURVA", "escalonada")
+
+def curva_penalizacion(config):
+    nombre, _, parametro = config.partition(":")
+    if nombre == "escalonada":
+        return lambda posicion: (1.5, 1.0, 0.70)[posicion] if posicion < 3 else 0.30
+    if nombre == "exponencial":
+        semivida = float(parametro or 3)
+        return lambda posicion: 1.5 * 0.5 ** (posicion / semivida)
+    if nombre == "lineal":
+        posiciones = float(parametro or MAX_HISTORY_SALIR)
+        return lambda posicion: max(0.0, 1.5 * (1 - posicion / posiciones))
+    raise ValueError(f"OTG_HISTORIAL_CURVA no reconocida: {config!r}")
+
+class CurvaPenalizacion:
+    """Penalización por posición, tabulada hasta el historial más largo que se guarda."""
+
+    def __init__(self, curva, longitud):
+        self.curva = curva
+        self.tabla = tuple(HISTORY_PENALTY_BASE * curva(posicion) for posicion in range(longitud))
+
+    def __call__(self, posicion):
+        if posicion < len(self.tabla):
+            return self.tabla[posicion]
+        return HISTORY_PENALTY_BASE * self.curva(posicion)
+
+PENALIZACION_POR_POSICION = CurvaPenalizacion(
+    curva_penalizacion(CURVA_HISTORIAL), max(MAX_HISTORY_SALIR, MAX_HISTORY_CASA)
+)
+
+class IndiceHistorial:
+    """
+    Historial compilado una vez por petición: {id: posición desde la más reciente}.
+    Penalización y bonus de exploración se leen en O(1) por misión.
+    """
+    __slots__ = ("recencia",)
+
+    def __init__(self, historial):
+        self.recencia = {}
+        for posicion, mision_id in enumerate(reversed(historial or ())):
+            self.recencia.setdefault(mision_id, posicion) # Con repetidos cuenta la aparición más reciente
+
+    @classmethod
+    def de(cls, historial):
+        return historial if isinstance(historial, cls) else cls(historial)
+
+    def __contains__(self, mision_id):
+        return mision_id in self.recencia
+
+    def __len__(self):
+        return len(self.recencia)
+
+    def penalizacion(self, mision_id):
+        posicion = self.recencia.get(mision_id)
+        return 0 if posicion is None else PENALIZACION_POR_POSICION(posicion)
+
+    def bonus(self, mision_id):
+        posicion = self.recencia.get(mision_id)
+        if posicion is None:
+            return 20 # Bonificación significativa si nunca se ha visto
+        # Reducir bonificación si ya se ha visto pero no está en el historial reciente
+        if posicion >= int(MAX_HISTORY_SALIR / 2):
+            return 5
+        return 0
 
 def limitar_historial(historial, limite):
     if historial is None:
@@ -72,28 +296,10 @@ def limitar_historial(historial, limite):
     return historial[-limite:]
 
 def penalizacion_historial(mision_id, historial):
-    if not historial:
-        return 0
-    historial = list(reversed(historial)) # Prioriza las más recientes
-    for posicion, antiguo_id in enumerate(historial):
-        if antiguo_id == mision_id:
-            if posicion == 0: # Última misión
-                return HISTORY_PENALTY_BASE * 1.5 # Más penalización para la última
-            elif posicion == 1:
-                return HISTORY_PENALTY_BASE
-            elif posicion == 2:
-                return HISTORY_PENALTY_BASE * 0.70
-            elif posicion <= (len(historial) - 1):
-                return HISTORY_PENALTY_BASE * 0.30
-    return 0
+    return IndiceHistorial.de(historial).penalizacion(mision_id)
 
 def bonus_exploracion(mision_id, historial):
-    if not historial or mision_id not in historial:
-        return 20 # Bonificación significativa si nunca se ha visto
-    # Reducir bonificación si ya se ha visto pero no está en el historial reciente
-    if mision_id not in limitar_historial(historial, int(MAX_HISTORY_SALIR / 2)):
-        return 5
-    return 0
+    return IndiceHistorial.de(historial).bonus(mision_id)
 
 def actualizar_historial(historial, nuevo_id, limite):
     historial = historial or []
@@ -111,234 +317,460 @@ def diversidad_vector(vector1, vector2):
         )
     return distancia
 
-# === MODIFICACIÓN: CONSTANTES DE TIEMPO Y PROPÓSITO ACORTADAS PARA LECTURA RÁPIDA ===
-WHEN_ES = "Ahora. Levántate."
-WHEN_EN = "Now. Move."
-FOR_WHAT_ES = "Rompe la rutina. Recuérda estás vivo."
-FOR_WHAT_EN = "Break routine. Remember you are alife."
-
 # ============================================================
 # CATÁLOGO DE MISIONES CWRE V2.1
 # Adaptado para Microacciones de Recuperación Mental y sin elementos de estrés laboral/financiero.
+# Vive en data/catalogo_misiones.jsonl (JSON-lines): una línea
+# {"particion": "CASA_ES" | "CASA_EN" | "SALIR/<mente>"} abre cada
+# partición y le siguen sus misiones, una por línea.
+# ============================================================
+RUTA_CATALOGO = os.environ.get(
+    "OTG_CATALOGO_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "catalogo_misiones.jsonl")
+)
+# Con OTG_CATALOGO_PRECARGA=1 todas las particiones se compilan al importar (útil con preload_app)
+PRECARGAR_CATALOGO = os.environ.get("OTG_CATALOGO_PRECARGA", "0") == "1"
+
+# ============================================================
+# COMPILADOR DEL CATÁLOGO
+# Valida cada partición y la congela en registros inmutables con
+# __slots__: índice por id, índice por ánimo y textos ya resueltos
+# por idioma. El hot path no vuelve a hacer fallbacks con .get().
 # ============================================================
-BASE_MISIONES = {
-    "CASA_ES": [
-        {"id": 1, "titulo": "Corta el piloto automático", "descripcion": "Escanea tu cuerpo. Ubica el peso exacto en tu espalda. Míralo. Estás vivo.", "vector_necesidades": {"contemplacion": 90, "descanso": 80, "silencio": 70, "organizacion": 50, "movimiento": 30}},
-        {"id": 2, "titulo": "Desconexión total", "descripcion": "Siente tu silla. El piso sostiene tu peso gratis. Déjate caer.", "vector_necesidades": {"descanso": 90, "contemplacion": 80, "silencio": 70, "organizacion": 40, "esperanza": 60}},
-        {"id": 3, "titulo": "Aislamiento de pantalla", "descripcion": "Voltea el teléfono. Mira una esquina del techo 30 segundos. Rompe el bucle.", "vector_necesidades": {"silencio": 95, "descanso": 85, "contemplacion": 90, "organizacion": 60, "creatividad": 20}},
-        {"id": 4, "titulo": "Soltar la carga", "descripcion": "Siente tus hombros libres. Ya no tienes esa mochila de peso invisible.", "vector_necesidades": {"descanso": 90, "movimiento": 60, "risa": 40, "esperanza": 80, "organizacion": 30}},
-        {"id": 5, "titulo": "El reset del agua", "descripcion": "Un trago pequeño de agua fría. Siente el líquido. Es la vida entrando.", "vector_necesidades": {"agua": 100, "descanso": 70, "silencio": 50, "movimiento": 20, "salud": 80}},
-        {"id": 7, "titulo": "El aire de la ventana", "descripcion": "Abre la ventana. Deja que el aire te golpee la cara. Siente el exterior.", "vector_necesidades": {"aire_fresco": 100, "naturaleza": 80, "contemplacion": 70, "descanso": 60, "movimiento": 30}},
-        {"id": 8, "titulo": "Rotación de energía", "descripcion": "Gira muñecas y tobillos. Tu cuerpo es tuyo. Tú gobiernas este motor.", "vector_necesidades": {"movimiento": 95, "descanso": 60, "juego": 40, "salud": 80, "creatividad": 20}},
-        {"id": 9, "titulo": "Anclaje del presente", "descripcion": "Cierra los ojos. Di una sola cosa buena que tienes hoy. Dilo fuerte.", "vector_necesidades": {"contemplacion": 100, "silencio": 90, "esperanza": 95, "aprendizaje": 70, "risa": 30}},
-        {"id": 11, "titulo": "Pies en la tierra", "descripcion": "Quítate zapatos. Apoya plantas en el piso. Siente el frío. Conéctate.", "vector_necesidades": {"naturaleza": 90, "movimiento": 70, "contemplacion": 80, "silencio": 60, "descanso": 70}},
-        {"id": 12, "titulo": "Estiramiento al cielo", "descripcion": "Brazo arriba. Toca el techo. Mantén la tensión. Suelta de golpe.", "vector_necesidades": {"movimiento": 95, "descanso": 60, "salud": 80, "creatividad": 30, "juego": 20}},
-        {"id": 14, "titulo": "Columna recta", "descripcion": "Endereza la espalda. Un hilo invisible tira de tu cabeza. Respira.", "vector_necesidades": {"salud": 90, "movimiento": 70, "descanso": 80, "silencio": 60, "contemplacion": 70}},
-        {"id": 15, "titulo": "Contacto frío", "descripcion": "Toca una superficie fría. Siente la temperatura real. Aterriza.", "vector_necesidades": {"naturaleza": 80, "silencio": 70, "contemplacion": 90, "descanso": 60, "movimiento": 20}},
-        {"id": 16, "titulo": "Ventilación total", "descripcion": "Abre la ventana. Deja que el aire ruede. Huele el cambio.", "vector_necesidades": {"aire_fresco": 100, "naturaleza": 90, "creatividad": 70, "contemplacion": 80, "movimiento": 40}},
-        {"id": 17, "titulo": "Sacudida de estrés", "descripcion": "Párate y sacude manos y piernas como quitándote agua. Hazlo 10 segundos.", "vector_necesidades": {"movimiento": 100, "risa": 80, "descanso": 70, "juego": 60, "esperanza": 70}},
-        {"id": 18, "titulo": "Mirada lejana", "descripcion": "Mira el objeto más lejano por tu ventana. Descansa el enfoque.", "vector_necesidades": {"contemplacion": 95, "silencio": 85, "naturaleza": 70, "descanso": 80, "creatividad": 40}},
-        {"id": 19, "titulo": "Memoria feliz", "descripcion": "Cierra los ojos y recuerda un momento real de calma en tu niñez.", "vector_necesidades": {"esperanza": 90, "contemplacion": 95, "risa": 70, "silencio": 80, "descanso": 85}},
-        {"id": 20, "titulo": "Sonrisa forzada", "descripcion": "Sonríe 15 segundos. Cambia tu química cerebral ahora.", "vector_necesidades": {"risa": 100, "esperanza": 90, "juego": 70, "creatividad": 50, "salud": 80}},
-        {"id": 21, "titulo": "Agradecimiento", "descripcion": "Cierra los ojos. Agradece una cosa buena de esta semana.", "vector_necesidades": {"esperanza": 100, "contemplacion": 90, "silencio": 80, "descanso": 70, "comunidad": 60}},
-        {"id": 22, "titulo": "Relaxa ojos", "descripcion": "Tápate los ojos con palmas templadas. Un minuto de oscuridad.", "vector_necesidades": {"descanso": 100, "silencio": 90, "contemplacion": 80, "salud": 70, "naturaleza": 20}},
-        {"id": 23, "titulo": "Ritmo cardíaco", "descripcion": "Mano derecha en el pecho. Siente el latido. Es tu motor.", "vector_necesidades": {"contemplacion": 100, "silencio": 90, "descanso": 80, "salud": 70, "movimiento": 10}},
-        {"id": 24, "titulo": "Suelta cuello", "descripcion": "Círculos lentos de cabeza. Libera la tensión de pantalla.", "vector_necesidades": {"movimiento": 80, "descanso": 90, "salud": 90, "silencio": 70, "organizacion": 30}},
-        {"id": 25, "titulo": "Ejercicio de palmas", "descripcion": "Frota manos hasta sentir calor. Colócalas en hombros.", "vector_necesidades": {"movimiento": 70, "descanso": 80, "salud": 85, "silencio": 60, "contemplacion": 50}},
-        {"id": 26, "titulo": "Sonidos lejanos", "descripcion": "Identifica el sonido más lejano fuera de casa.", "vector_necesidades": {"silencio": 90, "contemplacion": 95, "naturaleza": 80, "aprendizaje": 70, "descanso": 70}},
-        {"id": 27, "titulo": "Estiramiento lateral", "descripcion": "Inclina el cuerpo suavemente a cada lado.", "vector_necesidades": {"movimiento": 90, "salud": 85, "descanso": 70, "organizacion": 40, "silencio": 50}},
-        {"id": 28, "titulo": "El vaso vacío", "descripcion": "Mira un vaso. Concéntrate en su forma un minuto.", "vector_necesidades": {"contemplacion": 100, "silencio": 90, "creatividad": 60, "aprendizaje": 50, "descanso": 70}},
-        {"id": 29, "titulo": "Suelta mandíbula", "descripcion": "Abre grande la boca, mueve mandíbula a los lados.", "vector_necesidades": {"movimiento": 80, "salud": 90, "risa": 70, "descanso": 80, "silencio": 60}},
-        {"id": 30, "titulo": "Pasos lentos", "descripcion": "Diez pasos lentos, conscientes, en tu cuarto.", "vector_necesidades": {"movimiento": 70, "contemplacion": 80, "silencio": 75, "descanso": 70, "organizacion": 60}},
-        {"id": 31, "titulo": "Masaje suave", "descripcion": "Yemas en las sienes. Círculos muy lentos.", "vector_necesidades": {"descanso": 100, "salud": 90, "silencio": 85, "contemplacion": 70, "movimiento": 20}},
-        {"id": 32, "titulo": "Conciencia aire", "descripcion": "Siente el aire frío entrar, el cálido salir.", "vector_necesidades": {"aire_fresco": 100, "silencio": 90, "contemplacion": 95, "descanso": 80, "naturaleza": 70}},
-        {"id": 33, "titulo": "Espalda firme", "descripcion": "Omóplatos atrás, abre el pecho.", "vector_necesidades": {"movimiento": 85, "salud": 90, "organizacion": 70, "descanso": 70, "esperanza": 60}},
-        {"id": 34, "titulo": "Apoyo total", "descripcion": "Siente la silla sosteniendo tu peso total.", "vector_necesidades": {"descanso": 95, "contemplacion": 90, "silencio": 80, "naturaleza": 40, "movimiento": 10}},
-        {"id": 35, "titulo": "Cuenta atrás", "descripcion": "Del 20 al 1. Despacio. Calma el ruido.", "vector_necesidades": {"organizacion": 100, "aprendizaje": 80, "silencio": 90, "contemplacion": 95, "descanso": 70}},
-        {"id": 36, "titulo": "Toca textura", "descripcion": "Pasa dedos por una textura real. Madera o tela.", "vector_necesidades": {"contemplacion": 90, "creatividad": 70, "aprendizaje": 60, "naturaleza": 50, "silencio": 70}},
-        {"id": 37, "titulo": "Estira dedos", "descripcion": "Separa dedos lo más posible 5 segundos. Suelta.", "vector_necesidades": {"movimiento": 90, "salud": 80, "descanso": 70, "juego": 40, "organizacion": 30}},
-        {"id": 38, "titulo": "Sonido interno", "descripcion": "Escucha tu respiración. No la fuerces.", "vector_necesidades": {"silencio": 100, "contemplacion": 95, "descanso": 90, "salud": 85, "naturaleza": 60}},
-        {"id": 39, "titulo": "Mirada fija", "descripcion": "Punto pequeño en la pared. Fijo. Sin parpadear.", "vector_necesidades": {"contemplacion": 100, "silencio": 90, "organizacion": 80, "aprendizaje": 70, "descanso": 75}},
-        {"id": 40, "titulo": "Suelta brazos", "descripcion": "Cuelga brazos. Sacúdelos suavemente.", "vector_necesidades": {"movimiento": 95, "descanso": 80, "salud": 85, "risa": 60, "juego": 50}},
-        {"id": 41, "titulo": "Contacto ropa", "descripcion": "Nota el peso de la ropa sobre tu piel.", "vector_necesidades": {"contemplacion": 90, "silencio": 80, "descanso": 70, "naturaleza": 30, "movimiento": 10}},
-        {"id": 42, "titulo": "Aire profundo", "descripcion": "Infla vientre, retén 3 segundos, suelta lento.", "vector_necesidades": {"silencio": 100, "descanso": 95, "salud": 90, "aire_fresco": 80, "contemplacion": 90}},
-        {"id": 43, "titulo": "Rotación hombros", "descripcion": "Hombros a orejas, cae de golpe.", "vector_necesidades": {"movimiento": 90, "salud": 85, "descanso": 80, "risa": 50, "organizacion": 40}},
-        {"id": 44, "titulo": "Escucha silencio", "descripcion": "Busca el silencio entre respiraciones.", "vector_necesidades": {"silencio": 100, "contemplacion": 95, "descanso": 90, "aprendizaje": 80, "naturaleza": 70}},
-        {"id": 45, "titulo": "Mirada techo", "descripcion": "Mira techo. Estira cuello sin mover hombros.", "vector_necesidades": {"movimiento": 70, "descanso": 80, "salud": 80, "contemplacion": 70, "silencio": 60}},
-        {"id": 46, "titulo": "Siente base", "descripcion": "Contacto firme de piernas con silla.", "vector_necesidades": {"descanso": 90, "contemplacion": 85, "silencio": 75, "naturaleza": 40, "movimiento": 20}},
-        {"id": 48, "titulo": "Limpieza mental", "descripcion": "Exhala preocupación aburrida. Fuera de ti.", "vector_necesidades": {"esperanza": 90, "silencio": 80, "descanso": 85, "risa": 50, "creatividad": 60}},
-        {"id": 49, "titulo": "Toca mesa", "descripcion": "Palmas en mesa. Nota la stability.", "vector_necesidades": {"contemplacion": 90, "organizacion": 80, "silencio": 70, "descanso": 60, "naturaleza": 30}},
-        {"id": 50, "titulo": "Presencia total", "descripcion": "Estás aquí. Estás a salvo. Tienes el control.", "vector_necesidades": {"esperanza": 100, "contemplacion": 95, "silencio": 90, "descanso": 85, "organizacion": 70}},
-        {"id": 51, "titulo": "Canta una melodía", "descripcion": "Tararea tu canción favorita suavemente. No pienses, solo siente el sonido.", "vector_necesidades": {"musica": 100, "risa": 70, "creatividad": 80, "descanso": 60, "juego": 50}},
-        {"id": 52, "titulo": "Escribe 3 deseos", "descripcion": "En un papel, anota tres deseos simples que te gustaría cumplir hoy.", "vector_necesidades": {"creatividad": 90, "aprendizaje": 70, "organizacion": 80, "esperanza": 95, "contemplacion": 70}},
-        {"id": 53, "titulo": "Paseo por el pasillo", "descripcion": "Camina lentamente por el pasillo de tu casa, sintiendo cada paso.", "vector_necesidades": {"movimiento": 70, "contemplacion": 80, "silencio": 70, "descanso": 60, "organizacion": 50}},
-        {"id": 54, "titulo": "Mira una planta", "descripcion": "Si tienes una planta en casa, obsérvala con atención durante un minuto.", "vector_necesidades": {"naturaleza": 90, "contemplacion": 95, "silencio": 80, "descanso": 70, "aprendizaje": 60}},
-        {"id": 55, "titulo": "Dibuja un círculo", "descripcion": "Toma un lápiz y papel. Dibuja círculos perfectos sin pensar en nada más.", "vector_necesidades": {"creatividad": 100, "juego": 80, "contemplacion": 70, "silencio": 60, "descanso": 50}},
-        {"id": 57, "titulo": "Abre un libro al azar", "descripcion": "Toma un libro, ábrelo en una página aleatoria y lee la primera frase.", "vector_necesidades": {"aprendizaje": 90, "creatividad": 70, "contemplacion": 80, "silencio": 70, "descanso": 60}},
-        {"id": 58, "titulo": "Escucha la lluvia", "descripcion": "Si llueve, abre la ventana y escucha el sonido de las gotas caer.", "vector_necesidades": {"naturaleza": 100, "silencio": 95, "agua": 90, "contemplacion": 90, "descanso": 85}},
-        {"id": 59, "titulo": "Baila sin música", "descripcion": "Mueve tu cuerpo libremente por un minuto, como si nadie te viera.", "vector_necesidades": {"movimiento": 100, "juego": 90, "risa": 80, "creatividad": 70, "musica": 50}},
-        {"id": 60, "titulo": "Bebe una infusión", "descripcion": "Prepara una infusión caliente y bébela lentamente, sintiendo el calor.", "vector_necesidades": {"alimentacion": 90, "descanso": 100, "silencio": 80, "salud": 70, "contemplacion": 70}},
-        {"id": 61, "titulo": "Mira tus manos", "descripcion": "Observa las líneas y detalles de tus manos. Son herramientas poderosas.", "vector_necesidades": {"contemplacion": 95, "aprendizaje": 70, "silencio": 80, "esperanza": 60, "creatividad": 50}},
-        {"id": 62, "titulo": "Imagina un paisaje", "descripcion": "Cierra los ojos e imagina tu paisaje natural favorito por 30 segundos.", "vector_necesidades": {"naturaleza": 100, "contemplacion": 95, "silencio": 90, "descanso": 85, "creatividad": 80}},
-        {"id": 63, "titulo": "Estira la espalda", "descripcion": "Siéntate en el suelo con las piernas estiradas y trata de tocar tus pies.", "vector_necesidades": {"movimiento": 90, "salud": 85, "descanso": 70, "organizacion": 40, "silencio": 50}},
-        {"id": 64, "titulo": "Respira por la nariz", "descripcion": "Haz 5 respiraciones profundas, solo por la nariz, notando el aire.", "vector_necesidades": {"silencio": 100, "descanso": 95, "salud": 90, "aire_fresco": 80, "contemplacion": 90}},
-        {"id": 65, "titulo": "Juego de sombras", "descripcion": "Con las manos, crea una forma en la pared con la luz de una lámpara.", "vector_necesidades": {"juego": 100, "creatividad": 90, "risa": 70, "contemplacion": 60, "descanso": 50}},
-        {"id": 66, "titulo": "Un abrazo imaginario", "descripcion": "Abraza tus brazos fuertemente, imaginando que es un ser querido.", "vector_necesidades": {"comunidad": 90, "esperanza": 80, "descanso": 70, "risa": 60, "silencio": 50}},
-        {"id": 67, "titulo": "Encuentra un objeto azul", "descripcion": "Busca rápidamente 5 objetos azules en tu entorno. Enfoca tu vista.", "vector_necesidades": {"organizacion": 80, "aprendizaje": 70, "juego": 60, "creatividad": 50, "contemplacion": 70}},
-        {"id": 69, "titulo": "Observa el cielo", "descripcion": "Abre la ventana o sal al balcón. Observa el cielo por un minuto.", "vector_necesidades": {"naturaleza": 95, "contemplacion": 100, "aire_fresco": 90, "silencio": 80, "descanso": 70}},
-        {"id": 70, "titulo": "Masaje facial", "descripcion": "Con las yemas de los dedos, masajea suavemente tu frente y mejillas.", "vector_necesidades": {"descanso": 100, "salud": 90, "silencio": 85, "movimiento": 50, "contemplacion": 70}},
-        {"id": 71, "titulo": "Cierra los ojos y escucha", "descripcion": "Siéntate cómodo, cierra los ojos y solo escucha los sonidos de tu casa.", "vector_necesidades": {"silencio": 100, "contemplacion": 95, "descanso": 90, "aprendizaje": 70, "naturaleza": 60}},
-        {"id": 72, "titulo": "Tensa y relaja los pies", "descripcion": "Aprieta los dedos de tus pies durante 5 segundos y luego relájalos.", "vector_necesidades": {"movimiento": 90, "descanso": 80, "salud": 70, "organizacion": 40, "silencio": 50}},
-        {"id": 74, "titulo": "Olor consciente", "descripcion": "Huelea una flor, café o especia. Concéntrate en el aroma.", "vector_necesidades": {"naturaleza": 80, "alimentacion": 70, "contemplacion": 90, "silencio": 80, "descanso": 70}},
-        {"id": 75, "titulo": "Cambia de silla", "descripcion": "Siéntate en otra silla o lugar de la casa por 5 minutos. Pequeño cambio.", "vector_necesidades": {"movimiento": 60, "creatividad": 50, "descanso": 70, "organizacion": 40, "contemplacion": 60}},
-        # === MODIFICACIÓN: MICROACCIONES DE RECUPERACIÓN MENTAL (ID 151-160) - DESCRIPCIONES ACORTADAS ===
-        {"id": 151, "titulo": "EL RETO DE LA SUSCRIPCIÓN OLVIDADA", "descripcion": "Revisa tu email/banco. Cancela una suscripción olvidada. Recupera control y ahorra.", "vector_necesidades": {"organizacion": 90, "aprendizaje": 70, "descanso": 80, "esperanza": 85, "contemplacion": 60}},
-        {"id": 152, "titulo": "EL RETO DE LOS TRES GASTOS", "descripcion": "En tu teléfono, anota solo los 3 gastos clave de esta semana. Enfócate solo hoy.", "vector_necesidades": {"organizacion": 100, "descanso": 90, "silencio": 70, "aprendizaje": 60, "contemplacion": 80}},
-        {"id": 153, "titulo": "EL RETO DEL ORDEN DIGITAL", "descripcion": "Borra 20 capturas/archivos inútiles. El orden digital reduce la carga mental.", "vector_necesidades": {"organizacion": 100, "silencio": 80, "descanso": 85, "creatividad": 50, "contemplacion": 70}},
-        {"id": 154, "titulo": "EL RETO DEL SILENCIO", "descripcion": "Silencia apps que te causan ansiedad 1 hora. Tu atención necesita descanso.", "vector_necesidades": {"silencio": 100, "descanso": 95, "contemplacion": 90, "organizacion": 70, "esperanza": 80}},
-        {"id": 155, "titulo": "EL RETO DE LA GRATITUD", "descripcion": "Escribe 3 cosas que hoy tienes y antes deseabas. Recuerda tu progreso.", "vector_necesidades": {"esperanza": 100, "contemplacion": 95, "creatividad": 80, "aprendizaje": 70, "silencio": 60}},
-        {"id": 156, "titulo": "EL RETO DEL AGUA", "descripcion": "Levántate lento, bebe un vaso de agua. Vuelve respirando en calma.", "vector_necesidades": {"agua": 100, "movimiento": 70, "descanso": 90, "salud": 85, "silencio": 50}},
-        {"id": 157, "titulo": "EL RETO DE LA VENTANA", "descripcion": "Abre ventana 2 min. Observa el cielo. Sin teléfono.", "vector_necesidades": {"aire_fresco": 100, "naturaleza": 90, "contemplacion": 95, "descanso": 80, "silencio": 70}},
-        {"id": 158, "titulo": "EL RETO DEL ORDEN", "descripcion": "Guarda 5 objetos desordenados. Cinco bastan hoy.", "vector_necesidades": {"organizacion": 100, "descanso": 70, "contemplacion": 60, "movimiento": 30, "silencio": 50}},
-        {"id": 159, "titulo": "EL RETO DE LA RESPIRACIÓN", "descripcion": "Haz 5 respiraciones profundas, lentas. Nada más.", "vector_necesidades": {"silencio": 100, "descanso": 95, "salud": 90, "contemplacion": 90, "aire_fresco": 80}},
-        {"id": 160, "titulo": "EL RETO DEL DESCANSO VISUAL", "descripcion": "2 min: mira un punto lejano. Descansa tus ojos de la pantalla.", "vector_necesidades": {"contemplacion": 95, "silencio": 85, "descanso": 90, "naturaleza": 70, "salud": 80}},
-    ],
-    "CASA_EN": [
-        {"id": 1, "titulo": "Cut the autopilot", "descripcion": "Scan your body. Pinpoint the exact weight on your back. See it. You are alive.", "vector_necesidades": {"contemplacion": 90, "descanso": 80, "silencio": 70, "organizacion": 50, "movimiento": 30}},
-        {"id": 2, "titulo": "Total Disconnection", "descripcion": "Feel your chair. The floor supports your weight for free. Let yourself fall.", "vector_necesidades": {"descanso": 90, "contemplacion": 80, "silencio": 70, "organizacion": 40, "esperanza": 60}},
-        {"id": 3, "titulo": "Screen Isolation", "descripcion": "Flip your phone. Look at a corner of the ceiling for 30 seconds. Break the loop.", "vector_necesidades": {"silencio": 95, "descanso": 85, "contemplacion": 90, "organizacion": 60, "creatividad": 20}},
-        {"id": 4, "titulo": "Release the Burden", "descripcion": "Feel your shoulders free. That invisible backpack of weight is gone.", "vector_necesidades": {"descanso": 90, "movimiento": 60, "risa": 40, "esperanza": 80, "organizacion": 30}},
-        {"id": 5, "titulo": "The Water Reset", "descripcion": "A small sip of cold water. Feel the liquid. It's life entering.", "vector_necesidades": {"agua": 100, "descanso": 70, "silencio": 50, "movimiento": 20, "salud": 80}},
-        {"id": 7, "titulo": "Street Air", "descripcion": "Open the window. Let the air hit your face. Feel the outside.", "vector_necesidades": {"aire_fresco": 100, "naturaleza": 80, "contemplacion": 70, "descanso": 60, "movimiento": 30}},
-        {"id": 8, "titulo": "Energy Rotation", "descripcion": "Rotate wrists and ankles. Your body is yours. You govern this engine.", "vector_necesidades": {"movimiento": 95, "descanso": 60, "juego": 40, "salud": 80, "creatividad": 20}},
-        {"id": 9, "titulo": "Present Anchor", "descripcion": "Close your eyes. Say one good thing you have today. Say it loud.", "vector_necesidades": {"contemplacion": 100, "silencio": 90, "esperanza": 95, "aprendizaje": 70, "risa": 30}},
-        {"id": 11, "titulo": "Feet on the Ground", "descripcion": "Take off your shoes. Rest soles on the floor. Feel the cold. Connect.", "vector_necesidades": {"naturaleza": 90, "movimiento": 70, "contemplacion": 80, "silencio": 60, "descanso": 70}},
-        {"id": 12, "titulo": "Sky Stretch", "descripcion": "Arm up. Touch the ceiling. Maintain tension. Release suddenly.", "vector_necesidades": {"movimiento": 95, "descanso": 60, "salud": 80, "creatividad": 30, "juego": 20}},
-        {"id": 14, "titulo": "Straight Spine", "descripcion": "Straighten your back. An invisible thread pulls your head. Breathe.", "vector_necesidades": {"salud": 90, "movimiento": 70, "descanso": 80, "silencio": 60, "contemplacion": 70}},
-        {"id": 15, "titulo": "Cold Contact", "descripcion": "Touch a cold surface. Feel the real temperature. Ground yourself.", "vector_necesidades": {"naturaleza": 80, "silencio": 70, "contemplacion": 90, "descanso": 60, "movimiento": 20}},
-        {"id": 16, "titulo": "Total Ventilation", "descripcion": "Open the front door. Let the air flow. Smell the change.", "vector_necesidades": {"aire_fresco": 100, "naturaleza": 90, "creatividad": 70, "contemplacion": 80, "movimiento": 40}},
-        {"id": 17, "titulo": "Stress Shake-off", "descripcion": "Stand up and shake hands and legs as if shaking off water. Do it for 10 seconds.", "vector_necesidades": {"movimiento": 100, "risa": 80, "descanso": 70, "juego": 60, "esperanza": 70}},
-        {"id": 18, "titulo": "Distant Gaze", "descripcion": "Look at the farthest object outside your window. Rest your focus.", "vector_necesidades": {"contemplacion": 95, "silencio": 85, "naturaleza": 70, "descanso": 80, "creatividad": 40}},
-        {"id": 19, "titulo": "Happy Memory", "descripcion": "Close your eyes and recall a real moment of calm from your childhood.", "vector_necesidades": {"esperanza": 90, "contemplacion": 95, "risa": 70, "silencio": 80, "descanso": 85}},
-        {"id": 20, "titulo": "Forced Smile", "descripcion": "Smile for 15 seconds. Change your brain chemistry now.", "vector_necesidades": {"risa": 100, "esperanza": 90, "juego": 70, "creatividad": 50, "salud": 80}},
-        {"id": 21, "titulo": "Gratitude", "descripcion": "Close your eyes. Be thankful for one good thing this week.", "vector_necesidades": {"esperanza": 100, "contemplacion": 90, "silencio": 80, "descanso": 70, "comunidad": 60}},
-        {"id": 22, "titulo": "Relax Eyes", "descripcion": "Cover your eyes with warm palms. One minute of darkness.", "vector_necesidades": {"descanso": 100, "silencio": 90, "contemplacion": 80, "salud": 70, "naturaleza": 20}},
-        {"id": 23, "titulo": "Heart Rate", "descripcion": "Right hand on chest. Feel the heartbeat. It's your engine.", "vector_necesidades": {"contemplacion": 100, "silencio": 90, "descanso": 80, "salud": 70, "movimiento": 10}},
-        {"id": 24, "titulo": "Release Neck", "descripcion": "Slow head circles. Release screen tension.", "vector_necesidades": {"movimiento": 80, "descanso": 90, "salud": 90, "silencio": 70, "organizacion": 30}},
-        {"id": 25, "titulo": "Palm Exercise", "descripcion": "Rub hands until warm. Place them on shoulders.", "vector_necesidades": {"movimiento": 70, "descanso": 80, "salud": 85, "silencio": 60, "contemplacion": 50}},
-        {"id": 26, "titulo": "Distant Sounds", "descripcion": "Identify the farthest sound outside your home.", "vector_necesidades": {"silencio": 90, "contemplacion": 95, "naturaleza": 80, "aprendizaje": 70, "descanso": 70}},
-        {"id": 27, "titulo": "Side Stretch", "descripcion": "Gently lean your body to each side.", "vector_necesidades": {"movimiento": 90, "salud": 85, "descanso": 70, "organizacion": 40, "silencio": 50}},
-        {"id": 28, "titulo": "The Empty Glass", "descripcion": "Look at a glass. Focus on its shape for one minute.", "vector_necesidades": {"contemplacion": 100, "silencio": 90, "creatividad": 60, "aprendizaje": 50, "descanso": 70}},
-        {"id": 29, "titulo": "Release Jaw", "descripcion": "Open your mouth wide, move your jaw side to side.", "vector_necesidades": {"movimiento": 80, "salud": 90, "risa": 70, "descanso": 80, "silencio": 60}},
-        {"id": 30, "titulo": "Slow Steps", "descripcion": "Ten slow, conscious steps in your room.", "vector_necesidades": {"movimiento": 70, "contemplacion": 80, "silencio": 75, "descanso": 70, "organizacion": 60}},
-        {"id": 31, "titulo": "Gentle Massage", "descripcion": "Fingertips on temples. Very slow circles.", "vector_necesidades": {"descanso": 100, "salud": 90, "silencio": 85, "contemplacion": 70, "movimiento": 20}},
-        {"id": 32, "titulo": "Air Awareness", "descripcion": "Feel the cold air enter, the warm air leave.", "vector_necesidades": {"aire_fresco": 100, "silencio": 90, "contemplacion": 95, "descanso": 80, "naturaleza": 70}},
-        {"id": 33, "titulo": "Firm Back", "descripcion": "Shoulder blades back, open your chest.", "vector_necesidades": {"movimiento": 85, "salud": 90, "organizacion": 70, "descanso": 70, "esperanza": 60}},
-        {"id": 34, "titulo": "Total Support", "descripcion": "Feel the chair supporting your full weight.", "vector_necesidades": {"descanso": 95, "contemplacion": 90, "silencio": 80, "naturaleza": 40, "movimiento": 10}},
-        {"id": 35, "titulo": "Countdown", "descripcion": "From 20 to 1. Slowly. Calm the noise.", "vector_necesidades": {"organizacion": 100, "aprendizaje": 80, "silencio": 90, "contemplacion": 95, "descanso": 70}},
-        {"id": 36, "titulo": "Touch Texture", "descripcion": "Run fingers over a real texture. Wood or fabric.", "vector_necesidades": {"contemplacion": 90, "creatividad": 70, "aprendizaje": 60, "naturaleza": 50, "silencio": 70}},
-        {"id": 37, "titulo": "Stretch Fingers", "descripcion": "Spread fingers as wide as possible for 5 seconds. Release.", "vector_necesidades": {"movimiento": 90, "salud": 80, "descanso": 70, "juego": 40, "organizacion": 30}},
-        {"id": 38, "titulo": "Internal Sound", "descripcion": "Listen to your breath. Don't force it.", "vector_necesidades": {"silencio": 100, "contemplacion": 95, "descanso": 90, "salud": 85, "naturaleza": 60}},
-        {"id": 39, "titulo": "Fixed Gaze", "descripcion": "Small spot on the wall. Fixed. Without blinking.", "vector_necesidades": {"contemplacion": 100, "silencio": 90, "organizacion": 80, "aprendizaje": 70, "descanso": 75}},
-        {"id": 40, "titulo": "Release Arms", "descripcion": "Hang arms. Shake them gently.", "vector_necesidades": {"movimiento": 95, "descanso": 80, "salud": 85, "risa": 60, "juego": 50}},
-        {"id": 41, "titulo": "Clothes Contact", "descripcion": "Notice the weight of clothes on your skin.", "vector_necesidades": {"contemplacion": 90, "silencio": 80, "descanso": 70, "naturaleza": 30, "movimiento": 10}},
-        {"id": 42, "titulo": "Deep Air", "descripcion": "Inflate belly, hold 3 seconds, release slowly.", "vector_necesidades": {"silencio": 100, "descanso": 95, "salud": 90, "aire_fresco": 80, "contemplacion": 90}},
-        {"id": 43, "titulo": "Shoulder Rotation", "descripcion": "Hombros a orejas, cae de golpe.", "vector_necesidades": {"movimiento": 90, "salud": 85, "descanso": 80, "risa": 50, "organizacion": 40}},
-        {"id": 44, "titulo": "Listen to Silence", "descripcion": "Search for silence between breaths.", "vector_necesidades": {"silencio": 100, "contemplacion": 95, "descanso": 90, "aprendizaje": 80, "naturaleza": 70}},
-        {"id": 45, "titulo": "Ceiling Gaze", "descripcion": "Look at the ceiling. Stretch neck without moving shoulders.", "vector_necesidades": {"movimiento": 70, "descanso": 80, "salud": 80, "contemplacion": 70, "silencio": 60}},
-        {"id": 46, "titulo": "Feel Base", "descripcion": "Firm contact of legs with chair.", "vector_necesidades": {"descanso": 90, "contemplacion": 85, "silencio": 75, "naturaleza": 40, "movimiento": 20}},
-        {"id": 48, "titulo": "Limpieza mental", "descripcion": "Exhala preocupación aburrida. Fuera de ti.", "vector_necesidades": {"esperanza": 90, "silencio": 80, "descanso": 85, "risa": 50, "creatividad": 60}},
-        {"id": 49, "titulo": "Toca mesa", "descripcion": "Palmas en mesa. Nota la stability.", "vector_necesidades": {"contemplacion": 90, "organizacion": 80, "silencio": 70, "descanso": 60, "naturaleza": 30}},
-        {"id": 50, "titulo": "Presencia total", "descripcion": "Estás aquí. Estás a salvo. Tienes el control.", "vector_necesidades": {"esperanza": 100, "contemplacion": 95, "silencio": 90, "descanso": 85, "organizacion": 70}},
-        {"id": 51, "titulo": "Canta una melodía", "descripcion": "Tararea tu canción favorita suavemente. No pienses, solo siente el sonido.", "vector_necesidades": {"musica": 100, "risa": 70, "creatividad": 80, "descanso": 60, "juego": 50}},
-        {"id": 52, "titulo": "Escribe 3 deseos", "descripcion": "En un papel, anota tres deseos simples que te gustaría cumplir hoy.", "vector_necesidades": {"creatividad": 90, "aprendizaje": 70, "organizacion": 80, "esperanza": 95, "contemplacion": 70}},
-        {"id": 53, "titulo": "Paseo por el pasillo", "descripcion": "Camina lentamente por el pasillo de tu casa, sintiendo cada paso.", "vector_necesidades": {"movimiento": 70, "contemplacion": 80, "silencio": 70, "descanso": 60, "organizacion": 50}},
-        {"id": 54, "titulo": "Mira una planta", "descripcion": "Si tienes una planta en casa, obsérvala con atención durante un minuto.", "vector_necesidades": {"naturaleza": 90, "contemplacion": 95, "silencio": 80, "descanso": 70, "aprendizaje": 60}},
-        {"id": 55, "titulo": "Dibuja un círculo", "descripcion": "Toma un lápiz y papel. Dibuja círculos perfectos sin pensar en nada más.", "vector_necesidades": {"creatividad": 100, "juego": 80, "contemplacion": 70, "silencio": 60, "descanso": 50}},
-        {"id": 57, "titulo": "Abre un libro al azar", "descripcion": "Toma un libro, ábrelo en una página aleatoria y lee la primera frase.", "vector_necesidades": {"aprendizaje": 90, "creatividad": 70, "contemplacion": 80, "silencio": 70, "descanso": 60}},
-        {"id": 58, "titulo": "Escucha la lluvia", "descripcion": "Si llueve, abre la ventana y escucha el sonido de las gotas caer.", "vector_necesidades": {"naturaleza": 100, "silencio": 95, "agua": 90, "contemplacion": 90, "descanso": 85}},
-        {"id": 59, "titulo": "Baila sin música", "descripcion": "Mueve tu cuerpo libremente por un minuto, como si nadie te viera.", "vector_necesidades": {"movimiento": 100, "juego": 90, "risa": 80, "creatividad": 70, "musica": 50}},
-        {"id": 60, "titulo": "Bebe una infusión", "descripcion": "Prepara una infusión caliente y bébela lentamente, sintiendo el calor.", "vector_necesidades": {"alimentacion": 90, "descanso": 100, "silencio": 80, "salud": 70, "contemplacion": 70}},
-        {"id": 61, "titulo": "Mira tus manos", "descripcion": "Observa las líneas y detalles de tus manos. Son herramientas poderosas.", "vector_necesidades": {"contemplacion": 95, "aprendizaje": 70, "silencio": 80, "esperanza": 60, "creatividad": 50}},
-        {"id": 62, "titulo": "Imagina un paisaje", "descripcion": "Cierra los ojos e imagina tu paisaje natural favorito por 30 segundos.", "vector_necesidades": {"naturaleza": 100, "contemplacion": 95, "silencio": 90, "descanso": 85, "creatividad": 80}},
-        {"id": 63, "titulo": "Estira la espalda", "descripcion": "Siéntate en el suelo con las piernas estiradas y trata de tocar tus pies.", "vector_necesidades": {"movimiento": 90, "salud": 85, "descanso": 70, "organizacion": 40, "silencio": 50}},
-        {"id": 64, "titulo": "Respira por la nariz", "descripcion": "Haz 5 respiraciones profundas, solo por la nariz, notando el aire.", "vector_necesidades": {"silencio": 100, "descanso": 95, "salud": 90, "aire_fresco": 80, "contemplacion": 90}},
-        {"id": 65, "titulo": "Juego de sombras", "descripcion": "Con las manos, crea una forma en la pared con la luz de una lámpara.", "vector_necesidades": {"juego": 100, "creatividad": 90, "risa": 70, "contemplacion": 60, "descanso": 50}},
-        {"id": 66, "titulo": "Un abrazo imaginario", "descripcion": "Abraza tus brazos fuertemente, imaginando que es un ser querido.", "vector_necesidades": {"comunidad": 90, "esperanza": 80, "descanso": 70, "risa": 60, "silencio": 50}},
-        {"id": 67, "titulo": "Encuentra un objeto azul", "descripcion": "Busca rápidamente 5 objetos azules en tu entorno. Enfoca tu vista.", "vector_necesidades": {"organizacion": 80, "aprendizaje": 70, "juego": 60, "creatividad": 50, "contemplacion": 70}},
-        {"id": 69, "titulo": "Observa el cielo", "descripcion": "Abre la ventana o sal al balcón. Observa el cielo por un minuto.", "vector_necesidades": {"naturaleza": 95, "contemplacion": 100, "aire_fresco": 90, "silencio": 80, "descanso": 70}},
-        {"id": 70, "titulo": "Masaje facial", "descripcion": "Con las yemas de los dedos, masajea suavemente tu frente y mejillas.", "vector_necesidades": {"descanso": 100, "salud": 90, "silencio": 85, "movimiento": 50, "contemplacion": 70}},
-        {"id": 71, "titulo": "Cierra los ojos y escucha", "descripcion": "Siéntate cómodo, cierra los ojos y solo escucha los sonidos de tu casa.", "vector_necesidades": {"silencio": 100, "contemplacion": 95, "descanso": 90, "aprendizaje": 70, "naturaleza": 60}},
-        {"id": 72, "titulo": "Tensa y relaja los pies", "descripcion": "Aprieta los dedos de tus pies durante 5 segundos y luego relájalos.", "vector_necesidades": {"movimiento": 90, "descanso": 80, "salud": 70, "organizacion": 40, "silencio": 50}},
-        {"id": 74, "titulo": "Olor consciente", "descripcion": "Huelea una flor, café o especia. Concéntrate en el aroma.", "vector_necesidades": {"naturaleza": 80, "alimentacion": 70, "contemplacion": 90, "silencio": 80, "descanso": 70}},
-        {"id": 75, "titulo": "Cambia de silla", "descripcion": "Siéntate en otra silla o lugar de la casa por 5 minutos. Pequeño cambio.", "vector_necesidades": {"movimiento": 60, "creatividad": 50, "descanso": 70, "organizacion": 40, "contemplacion": 60}},
-        # === MODIFICACIÓN: MICROACCIONES DE RECUPERACIÓN MENTAL (ID 151-160) - DESCRIPCIONES ACORTADAS ===
-        {"id": 151, "titulo": "THE FORGOTTEN SUBSCRIPTION CHALLENGE", "descripcion": "Check email/banking app. Cancel forgotten subscription. Regain control and save.", "vector_necesidades": {"organizacion": 90, "aprendizaje": 70, "descanso": 80, "esperanza": 85, "contemplacion": 60}},
-        {"id": 152, "titulo": "THE THREE EXPENSES CHALLENGE", "descripcion": "On your phone, list only 3 key expenses for this week. Focus only today.", "vector_necesidades": {"organizacion": 100, "descanso": 90, "silencio": 70, "aprendizaje": 60, "contemplacion": 80}},
-        {"id": 153, "titulo": "THE DIGITAL ORDER CHALLENGE", "descripcion": "Delete 20 useless screenshots/files. Digital order reduces mental load.", "vector_necesidades": {"organizacion": 100, "silencio": 80, "descanso": 85, "creatividad": 50, "contemplacion": 70}},
-        {"id": 154, "titulo": "THE SILENCE CHALLENGE", "descripcion": "Silence anxiety-inducing apps for 1 hour. Your attention needs rest.", "vector_necesidades": {"silencio": 100, "descanso": 95, "contemplacion": 90, "organizacion": 70, "esperanza": 80}},
-        {"id": 155, "titulo": "THE GRATITUDE CHALLENGE", "descripcion": "List 3 things you have today you once desired. Remember your progress.", "vector_necesidades": {"esperanza": 100, "contemplacion": 95, "creatividad": 80, "aprendizaje": 70, "silencio": 60}},
-        {"id": 156, "titulo": "THE WATER CHALLENGE", "descripcion": "Slowly stand, drink a glass of water. Return breathing calmly.", "vector_necesidades": {"agua": 100, "movimiento": 70, "descanso": 90, "salud": 85, "silencio": 50}},
-        {"id": 157, "titulo": "THE WINDOW CHALLENGE", "descripcion": "Open window 2 min. Observe the sky. No phone.", "vector_necesidades": {"aire_fresco": 100, "naturaleza": 90, "contemplacion": 95, "descanso": 80, "silencio": 70}},
-        {"id": 158, "titulo": "THE ORDER CHALLENGE", "descripcion": "Put away 5 misplaced items. Five are enough today.", "vector_necesidades": {"organizacion": 100, "descanso": 70, "contemplacion": 60, "movimiento": 30, "silencio": 50}},
-        {"id": 159, "titulo": "THE BREATHING CHALLENGE", "descripcion": "Take 5 deep, slow breaths. Nothing else.", "vector_necesidades": {"silencio": 100, "descanso": 95, "salud": 90, "contemplacion": 90, "aire_fresco": 80}},
-        {"id": 160, "titulo": "THE VISUAL REST CHALLENGE", "descripcion": "2 min: look at a distant point. Rest your eyes from the screen.", "vector_necesidades": {"contemplacion": 95, "silencio": 85, "descanso": 90, "naturaleza": 70, "salud": 80}},
-    ],
-    "SALIR": {
-        "agotado": [
-            {"id": 101, "titulo": "Sombra de árbol", "titulo_en": "Tree Shade", "porque": "Mente cansada de pantallas. Necesitas desconectar.", "porque_en": "Screen-tired. Need to disconnect.", "que_hacer": "Busca un gran árbol. Toca su corteza. Siente la sombra fresca.", "que_hacer_en": "Find a large tree. Touch its bark. Feel the cool shade.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Un parque verde.", "donde_en": "A green park.", "gps": "parks with shade", "vector_necesidades": {"movimiento": 60, "naturaleza": 100, "silencio": 80, "agua": 20, "sol": 40, "sombra": 100, "aire_fresco": 100, "creatividad": 30, "comunidad": 20, "aprendizaje": 40, "juego": 30, "contemplacion": 95, "descanso": 90, "organizacion": 20, "alimentacion": 0, "musica": 10, "risa": 30, "esperanza": 85} }, {"id": 106, "titulo": "Café en silencio", "titulo_en": "Quiet Cafe", "porque": "Exiges un respiro mental. Evita ruidos. Busca calma.", "porque_en": "Demanding a mental break. Avoid noise. Seek calm.", "que_hacer": "Visita una cafetería tranquila. Pide tu bebida. Observa sin distracciones.", "que_hacer_en": "Visit a quiet cafe. Order your drink. Observe without distractions.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Establecimiento local pacífico.", "donde_en": "Peaceful local establishment.", "gps": "quiet cafe", "vector_necesidades": {"movimiento": 20, "naturaleza": 10, "silencio": 90, "agua": 30, "sol": 30, "sombra": 80, "aire_fresco": 40, "creatividad": 60, "comunidad": 50, "aprendizaje": 70, "juego": 10, "contemplacion": 95, "descanso": 85, "organizacion": 70, "alimentacion": 60, "musica": 40, "risa": 20, "esperanza": 70} }, {"id": 107, "titulo": "Jardín Botánico", "titulo_en": "Botanical Garden", "porque": "Cerebro agotado. Reconéctate con lo natural. Aire puro.", "porque_en": "Exhausted brain. Reconnect with nature. Pure air.", "que_hacer": "Pasea sin prisa por senderos. Contempla plantas verdes. Respira hondo.", "que_hacer_en": "Stroll leisurely through paths. Contemplate green plants. Breathe deeply.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Paraje botánico público.", "donde_en": "Public botanical site.", "gps": "botanical garden", "vector_necesidades": {"movimiento": 70, "naturaleza": 100, "silencio": 75, "agua": 50, "sol": 70, "sombra": 90, "aire_fresco": 100, "creatividad": 80, "comunidad": 40, "aprendizaje": 80, "juego": 30, "contemplacion": 90, "descanso": 80, "organizacion": 30, "alimentacion": 10, "musica": 50, "risa": 30, "esperanza": 90} },
-
-            {"id": 108, "titulo": "Mirador Panorámico", "titulo_en": "Scenic Overlook", "porque": "Requieres perspectiva. Eleva tu mirada. Rompe la rutina visual.", "porque_en": "Requiring perspective. Elevate your gaze. Break visual routine.", "que_hacer": "Encuentra un punto alto. Observa el horizonte. Siente la inmensidad.", "que_hacer_en": "Find a high point. Observe the horizon. Feel the immensity.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Mirador público.", "donde_en": "Public overlook.", "gps": "scenic overlook", "vector_necesidades": {"movimiento": 40, "naturaleza": 90, "silencio": 85, "agua": 60, "sol": 80, "sombra": 50, "aire_fresco": 95, "creatividad": 70, "comunidad": 30, "aprendizaje": 50, "juego": 10, "contemplacion": 100, "descanso": 70, "organizacion": 10, "alimentacion": 0, "musica": 20, "risa": 15, "esperanza": 95} }, {"id": 109, "titulo": "Clase de Meditación", "titulo_en": "Meditation Class", "porque": "Mente sobrecargada. Busca calma interna. Regula tu ser.", "porque_en": "Overloaded mind. Seek inner calm. Regulate your being.", "que_hacer": "Asiste a una sesión guiada. Concéntrate en la respiración. Suelta.", "que_hacer_en": "Attend a guided session. Focus on breathing. Let go.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Centro de yoga o meditación.", "donde_en": "Yoga or meditation center.", "gps": "meditation class", "vector_necesidades": {"movimiento": 10, "naturaleza": 20, "silencio": 100, "agua": 0, "sol": 10, "sombra": 100, "aire_fresco": 60, "creatividad": 50, "comunidad": 60, "aprendizaje": 90, "juego": 5, "contemplacion": 100, "descanso": 100, "organizacion": 80, "alimentacion": 0, "musica": 70, "risa": 5, "esperanza": 90} }, {"id": 126, "titulo": "Observación de Nubes", "titulo_en": "Cloud Gazing", "porque": "Pensamiento agitado. Enfoca tu mirada en la inmensidad. Deja fluir las ideas.", "porque_en": "Agitated thoughts. Focus on vastness. Let ideas flow.", "que_hacer": "Busca un lugar abierto. Recuéstate. Observa el cielo.", "que_hacer_en": "Find an open space. Lie down. Watch the sky.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Parque o campo abierto.", "donde_en": "Park or open field.", "gps": "open field for cloud gazing", "vector_necesidades": {"movimiento": 20, "naturaleza": 95, "silencio": 90, "agua": 10, "sol": 70, "sombra": 30, "aire_fresco": 90, "creatividad": 60, "comunidad": 10, "aprendizaje": 40, "juego": 20, "contemplacion": 100, "descanso": 95, "organizacion": 10, "alimentacion": 0, "musica": 20, "risa": 15, "esperanza": 85} },
-
-            { "id": 355, "titulo": "Soberanía en Tránsito", "titulo_en": "Transit Sovereignty", "porque": "Agotamiento periférico absoluto. Fatiga acumulada por conducir o navegar el tráfico pesado.", "porque_en": "Absolute peripheral exhaustion. Accumulated fatigue from driving or navigating heavy traffic.", "que_hacer": "Abre tu aplicación de transporte. Solicita un viaje corto hacia la zona verde más cercana. Si ya estás dentro, suelta el teléfono. Cierra los ojos un minuto entero. Apoya las palmas sobre tus muslos. Respira en calma.", "que_hacer_en": "Open your ride app. Request a short trip to the nearest green area. If already inside, drop your phone. Close your eyes for a whole minute. Place palms on your thighs. Breathe calmly.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Cabina de transporte, parada o asiento de pasajero.", "donde_en": "Transit vehicle cabin, stop, or passenger seat.", "gps": "quiet public square", "vector_necesidades": {"descanso": 100, "silencio": 90, "movimiento": 15, "contemplacion": 85, "esperanza": 80, "salud": 80, "aire_fresco": 60} }, { "id": 356, "titulo": "Módulo de Cambio Frecuencial", "titulo_en": "Frequency Shift Module", "porque": "Saturación mental y cansancio auditivo debido al ruido mecánico o pantallas.", "porque_en": "Mental saturation and auditory fatigue due to mechanical noise or screens.", "que_hacer": "Abre Spotify de forma consciente. Busca frecuencias binaurales o sonidos de la naturaleza. Colócate auriculares. Apoya tu cabeza hacia atrás. Inhala hondo. Permite que el audio estabilice tu mente.", "que_hacer_en": "Open Spotify mindfully. Search for binaural beats or nature sounds. Put on headphones. Lean your head back. Inhale deeply. Allow the audio to stabilize your mind.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Tu espacio de descanso, oficina vacía o vehículo.", "donde_en": "Your resting space, empty office, or vehicle.", "gps": "quiet open park", "vector_necesidades": {"musica": 100, "descanso": 95, "silencio": 65, "contemplacion": 90, "esperanza": 85, "salud": 80, "creatividad": 40} }, { "id": 357, "titulo": "Mapeo de Flujos", "titulo_en": "Flow Mapping", "porque": "Agotamiento por sedentarismo. Mover las piernas en un entorno amplio limpia tu sangre.", "porque_en": "Exhaustion from sedentary lifestyle. Moving your legs in a spacious setting clears your blood.", "que_hacer": "Dirígete al almacén mayorista de tu área. Camina a paso firme por los pasillos perimetrales sin prisa de comprar. Observa el lugar. Usa este sitio climatizado para activar tus extremidades.", "que_hacer_en": "Head to the wholesale warehouse in your area. Walk steadily through the perimeter aisles without any shopping rush. Observe the place. Use this climate-controlled site to activate your limbs.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Pasillos industriales de una gran tienda de tu Código Postal.", "donde_en": "Industrial aisles of a large warehouse store in your Zip Code.", "gps": "wholesale club or market", "vector_necesidades": {"movimiento": 85, "organizacion": 70, "contemplacion": 60, "comunidad": 50, "juego": 30, "descanso": 20, "silencio": 10} },
-
-            { "id": 358, "titulo": "Oasis Burocrático", "titulo_en": "Bureaucratic Oasis", "porque": "Fatiga extrema producida por esperas tensas, trámites o estímulos digitales repetitivos.", "porque_en": "Extreme fatigue produced by tense waiting, procedures, or repetitive digital stimuli.", "que_hacer": "Ubica la biblioteca pública más cercana. Ingresa en absoluto silencio. Toma asiento en la sala común o zona de lectura. Disfruta de la quietud del entorno. Permite que tus ojos descansen por completo.", "que_hacer_en": "Locate the nearest public library. Enter in absolute silence. Take a seat in the common room or reading zone. Enjoy the stillness of the environment. Allow your eyes to rest completely.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Sala de lectura, biblioteca municipal o zona de estudio de USA.", "donde_en": "Reading room, municipal library, or USA study zone.", "gps": "public library", "vector_necesidades": {"aprendizaje": 100, "silencio": 100, "contemplacion": 90, "descanso": 85, "organizacion": 70, "salud": 80} }, {"id": 201, "titulo": "Soberanía en Tránsito", "titulo_en": "Transit Sovereignty", "porque": "Cuerpo al límite y mente saturada de conducir o moverte en tráfico continuo.", "porque_en": "Body and mind saturated from driving or continuous traffic.", "que_hacer": "Abre tu app de transporte. Solicita un viaje corto a una zona tranquila. Cierra los ojos. Suelta el teléfono. Apoya las palmas en las rodillas. Ejecuta el Módulo de Silencio por un minuto.", "que_hacer_en": "Open your ride app. Request a short trip to a quiet area. Close your eyes. Drop the phone. Place palms on knees. Execute the Silence Module for one minute.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Cabina de transporte o asiento de pasajero.", "donde_en": "Rideshare cabin or passenger seat.", "gps": "quiet park bench", "vector_necesidades": {"descanso": 100, "silencio": 90, "movimiento": 10, "contemplacion": 80, "esperanza": 80, "naturaleza": 20, "aire_fresco": 50} }, {"id": 202, "titulo": "Módulo Auditivo", "titulo_en": "Auditory Reset", "porque": "Agotamiento mental agudo por ruidos y pantallas.", "porque_en": "Acute mental exhaustion from noise and screens.", "que_hacer": "Abre Spotify. Busca sonidos de lluvia o música relajante. Ponte auriculares. Cierra los ojos un minuto. Deja que las frecuencias limpien el cansancio.", "que_hacer_en": "Open Spotify. Search for rain sounds or relaxing music. Put on headphones. Close your eyes for one minute. Let frequencies clear the fatigue.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Cualquier rincón cómodo o dentro de tu auto.", "donde_en": "Any comfortable spot or inside your car.", "gps": "quiet library space", "vector_necesidades": {"musica": 100, "descanso": 95, "silencio": 60, "contemplacion": 90, "esperanza": 85, "creatividad": 40} },
-
-            {"id": 203, "titulo": "Descompresión de Entorno", "titulo_en": "Environment Decompression", "porque": "Saturación del espacio habitual. Necesitas un lugar diseñado para el confort.", "porque_en": "Usual space saturation. Need a place designed for comfort.", "que_hacer": "Ubica un hotel cercano. Ve a su sala de descanso sin costo. Siéntate recto. Nota el piso. Relaja la vista mirando un punto lejano dos minutos.", "que_hacer_en": "Locate a nearby hotel. Go to its lounge area at zero cost. Sit straight. Feel the floor. Relax your eyes looking at a distant point for two minutes.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Lobby o zona de descanso de un hotel local.", "donde_en": "Lobby or lounge area of a local hotel.", "gps": "hotel lobby", "vector_necesidades": {"descanso": 100, "silencio": 85, "contemplacion": 95, "organizacion": 70, "esperanza": 80, "movimiento": 20} }, {"id": 204, "titulo": "Sabotaje de Espera", "titulo_en": "Waiting Sabotage", "porque": "Falta de nutrición intelectual real y exceso de estímulos vacíos.", "porque_en": "Lack of real intellectual nourishment and excess of empty stimuli.", "que_hacer": "Ve al campus o área de libros de una universidad cercana. Camina en silencio por pasillos o zonas verdes. Respira aire fresco. Observa en calma.", "que_hacer_en": "Go to the campus or book section of a nearby university. Walk silently through corridors or green zones. Breathe fresh air. Observe calmly.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Campus universitario o biblioteca pública.", "donde_en": "University campus or public library.", "gps": "university library", "vector_necesidades": {"aprendizaje": 100, "silencio": 90, "contemplacion": 85, "descanso": 70, "aire_fresco": 75, "movimiento": 40} }, ], "estresado": [ {"id": 102, "titulo": "Caminata en subida", "titulo_en": "Uphill Walk", "porque": "Cuerpo tenso. Libera tensiones al andar. Siente tu fuerza.", "porque_en": "Tense body. Release tension by walking. Feel your strength.", "que_hacer": "Encuentra una rampa o escaleras públicas. Sube a paso firme. Usa tu energía.", "que_hacer_en": "Find a public ramp or stairs. Climb steadily. Use your energy.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Escalera pública.", "donde_en": "Public stairs.", "gps": "public stairs", "vector_necesidades": {"movimiento": 100, "naturaleza": 30, "silencio": 50, "agua": 10, "sol": 70, "sombra": 20, "aire_fresco": 85, "creatividad": 10, "comunidad": 30, "aprendizaje": 10, "juego": 20, "contemplacion": 60, "descanso": 10, "organizacion": 30, "alimentacion": 0, "musica": 20, "risa": 20, "esperanza": 75} },
-
-            {"id": 110, "titulo": "Yoga al Aire Libre", "titulo_en": "Outdoor Yoga", "porque": "Mente acelerada. Conecta cuerpo y naturaleza. Respira de forma consciente.", "porque_en": "Racing mind. Connect body and nature. Conscious breathing.", "que_hacer": "Busca un parque. Extiende tu lona. Sigue una rutina de estiramientos o posturas físicas.", "que_hacer_en": "Find a park. Lay your mat. Follow a stretching or physical posture routine.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Parque tranquilo.", "donde_en": "Quiet park.", "gps": "outdoor yoga park", "vector_necesidades": {"movimiento": 90, "naturaleza": 90, "silencio": 70, "agua": 20, "sol": 70, "sombra": 60, "aire_fresco": 95, "creatividad": 60, "comunidad": 40, "aprendizaje": 50, "juego": 10, "contemplacion": 80, "descanso": 70, "organizacion": 50, "alimentacion": 0, "musica": 40, "risa": 20, "esperanza": 80} }, {"id": 111, "titulo": "Gimnasio Comunitario", "titulo_en": "Community Gym", "porque": "Necesitas liberar energía. Convierte la tensión en fuerza. Activa tu cuerpo.", "porque_en": "Need to release energy. Convert tension to strength. Activate your body.", "que_hacer": "Visita un centro deportivo público. Enfócate en tu rutina de ejercicios. Suda.", "que_hacer_en": "Visit a public sports center. Focus on your exercise routine. Sweat.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Gimnasio o centro deportivo.", "donde_en": "Gym or sports center.", "gps": "community gym", "vector_necesidades": {"movimiento": 100, "naturaleza": 5, "silencio": 20, "agua": 10, "sol": 20, "sombra": 80, "aire_fresco": 60, "creatividad": 20, "comunidad": 70, "aprendizaje": 40, "juego": 30, "contemplacion": 5, "descanso": 0, "organizacion": 80, "alimentacion": 0, "musica": 80, "risa": 40, "esperanza": 60} }, { "id": 320, "titulo": "Liberación de Impacto", "titulo_en": "Impact Release", "porque": "Rigidez muscular y rabia acumulada. Necesitas romper la coraza física.", "porque_en": "Muscular rigidity and accumulated anger. You need to break the physical armor.", "que_hacer": "Dirígete al parque de trampolines o centro de escalada más cercano. Compra un pase rápido. Salta con fuerza descargando el peso en la lona, o usa tus manos para subir un muro. Deja que el esfuerzo extremo drene el agobio diario.", "que_hacer_en": "Head to the nearest trampoline park or climbing center. Buy a quick pass. Jump with strength discharging weight on the mat, or use your hands to climb a wall. Let extreme effort drain daily overwhelm.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Parque de trampolines o centro deportivo de alta descarga en tu Código Postal.", "donde_en": "Trampoline park or high-discharge sports center in your Zip Code.", "gps": "trampoline park or climbing gym", "vector_necesidades": {"movimiento": 100, "juego": 100, "risa": 90, "salud": 95, "descanso": 0, "silencio": 10, "comunidad": 60, "esperanza": 90} },
-
-            { "id": 321, "titulo": "Módulo de Hidro-Calma", "titulo_en": "Hydro-Calm Module", "porque": "Sistema nervioso en alerta roja permanente. El agua templada en movimiento es el alivio corporal definitivo.", "porque_en": "Nervous system on permanent red alert. Moving warm water is the ultimate body relief.", "que_hacer": "Visita el centro recreativo con piscina municipal o YMCA de tu perímetro. Sumérgete en el agua templada o jacuzzi. Cierra los ojos. Deja que las burbujas den un masaje a tu espalda. Concéntrate dos minutos únicamente en flotar.", "que_hacer_en": "Visit the recreation center with a municipal pool or YMCA in your perimeter. Submerge in warm water or a jacuzzi. Close your eyes. Let the bubbles massage your back. Focus for two minutes solely on floating.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "YMCA, alberca climatizada o spa comunitario local.", "donde_en": "YMCA, heated pool, or local community spa.", "gps": "ymca pool or public spa", "vector_necesidades": {"agua": 100, "descanso": 100, "salud": 95, "silencio": 60, "contemplacion": 90, "sombra": 80, "esperanza": 85, "movimiento": 20} }, { "id": 322, "titulo": "Quiebre de Frecuencias", "titulo_en": "Frequency Break", "porque": "Mente acelerada con ideas fijas y zumbido interno debido al estrés digital continuo.", "porque_en": "Racing mind with fixed ideas and internal buzzing due to continuous digital stress.", "que_hacer": "Busca un estudio de yoga o meditación en tu zona. Asiste a una sesión o recuéstate en su vestíbulo público si está disponible. Cierra los ojos. Escucha el silencio del lugar. Inhala en cuatro tiempos y exhala en ocho.", "que_hacer_en": "Search for a yoga or meditation studio in your area. Attend a session or lie down in its public lobby if available. Close your eyes. Listen to the silence of the place. Inhale for four counts and exhale for eight.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Estudio de yoga, centro de meditación o sound healing en USA.", "donde_en": "Yoga studio, meditation center, or sound healing spot in the USA.", "gps": "sound healing or yoga studio", "vector_necesidades": {"silencio": 100, "descanso": 95, "musica": 90, "contemplacion": 95, "salud": 90, "esperanza": 90, "organizacion": 70} }, { "id": 323, "titulo": "Aislamiento Orgánico", "titulo_en": "Organic Isolation", "porque": "Estrés de la ciudad. Requieres elementos del bosque y aire puro para calmar tu cuerpo.", "porque_en": "City stress. You need forest elements and pure air to calm your body.", "que_hacer": "Dirígete de inmediato al parque estatal o reserva protegida más cercana de tu Código Postal. Entra al sendero. Camina descalzo sobre la tierra o toca la corteza de un gran árbol por un minuto completo. Siente la brisa fresca en tu cara lejos del concreto.", "que_hacer_en": "Head immediately to the nearest State Park or protected reserve in your Zip Code. Enter the trail. Walk barefoot on the earth or touch the bark of a large tree for a full minute. Feel the fresh breeze on your face away from concrete.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Sendero boscoso, reserva natural o parque estatal de tu región.", "donde_en": "Wooded trail, nature reserve, or state park in your region.", "gps": "state park trail or nature reserve", "vector_necesidades": {"naturaleza": 100, "aire_fresco": 100, "silencio": 85, "movimiento": 60, "contemplacion": 90, "descanso": 60, "esperanza": 95, "sol": 70} },
-
-            { "id": 112, "titulo": "Sendero Corto Natural", "titulo_en": "Short Nature Trail", "porque": "Sobrecarga de estímulos. Desconéctate un momento. Camina en paz.", "porque_en": "Stimuli overload. Disconnect. Walk in peace.", "que_hacer": "Encuentra un camino verde. Anda a paso ligero. Observa el paisaje.", "que_hacer_en": "Find a green path. Walk briskly. Observe the landscape.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Sendero natural o bosque.", "donde_en": "Nature trail or forest.", "gps": "short nature trail", "vector_necesidades": {"movimiento": 85, "naturaleza": 100, "silencio": 80, "agua": 40, "sol": 60, "sombra": 70, "aire_fresco": 100, "creatividad": 40, "comunidad": 20, "aprendizaje": 50, "juego": 20, "contemplacion": 90, "descanso": 60, "organizacion": 20, "alimentacion": 0, "musica": 20, "risa": 10, "esperanza": 85} }, { "id": 113, "titulo": "Pista de Atletismo", "titulo_en": "Running Track", "porque": "Mente acelerada. Libera esa fuerza extra. Enfoca tu ritmo.", "porque_en": "Racing mind. Release that extra strength. Focus your rhythm.", "que_hacer": "Dirígete a un circuito público. Corre o avanza a tu propio paso. Suelta tensiones.", "que_hacer_en": "Go to a public circuit. Run or move at your own pace. Release tension.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Pista de atletismo pública.", "donde_en": "Public running track.", "gps": "public running track", "vector_necesidades": {"movimiento": 100, "naturaleza": 30, "silencio": 40, "agua": 10, "sol": 80, "sombra": 30, "aire_fresco": 90, "creatividad": 10, "comunidad": 50, "aprendizaje": 20, "juego": 30, "contemplacion": 50, "descanso": 10, "organizacion": 70, "alimentacion": 0, "musica": 50, "risa": 20, "esperanza": 70} }, { "id": 251, "titulo": "Soberanía en Movimiento", "titulo_en": "Sovereignty in Motion", "porque": "Saturación nerviosa por el encierro dentro de cabinas de transporte, tráfico denso y sobrecarga de trayectos.", "porque_en": "Nervous saturation from confinement inside transport cabins, heavy traffic, and transit overload.", "que_hacer": "Si viajas en auto en este Código Postal, despega la mirada de la pantalla. Apoya las palmas firmes sobre tus rodillas. Endereza la columna. Inhala hondo en cuatro segundos. Retén el aire. Exhala todo el aire residual de golpe. Siente tu peso sostenido por el asiento.", "que_hacer_en": "If you are traveling by car in this Zip Code, take your eyes off the screen. Place your palms firmly on your knees. Straighten your spine. Inhale deeply for four counts. Hold your breath. Exhale all residual air at once. Feel your weight supported by the seat.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Cabina de transporte, asiento de pasajero o parada de autobús de USA.", "donde_en": "Transit cabin, passenger seat, or USA bus stop.", "gps": "quiet rest areas or public plazas", "vector_necesidades": {"descanso": 95, "silencio": 85, "movimiento": 20, "contemplacion": 90, "organizacion": 60, "esperanza": 80} },
-
-            { "id": 252, "titulo": "Hackeo al Tráfico", "titulo_en": "Traffic Hack", "porque": "Nivel de estrés elevado por embotellamientos, ruidos de autopista y el automatismo de las carreteras.", "porque_en": "Elevated stress levels from traffic jams, highway noise, and the automation of roads.", "que_hacer": "Si estás conduciendo o atrapado en el tráfico interestatal, aprovecha la próxima luz roja o área de descanso segura. Suelta la tensión de la mandíbula abriendo grande la boca diez segundos. Estira tus dedos sobre el volante liberando la rigidez acumulada en tus muñecas. Mira a través de la ventana el cielo abierto. Respira con calma.", "que_hacer_en": "If driving or caught in interstate traffic, take advantage of the next red light or safe rest area. Release jaw tension by opening your mouth wide for 10 seconds. Stretch your fingers over the steering wheel, releasing stiffness built up in your wrists. Look through the window at the open sky. Breathe calmly.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Área de servicio de autopista, rampa pública o intersección vial.", "donde_en": "Highway service area, public ramp, or road intersection.", "gps": "highway rest stop or overlook", "vector_necesidades": {"movimiento": 80, "descanso": 70, "silencio": 50, "aire_fresco": 85, "organizacion": 40, "salud": 85} }, {"id": 127, "titulo": "Ruta en Bicicleta Urbana", "titulo_en": "Urban Bike Route", "porque": "Necesitas liberar tensión y moverte rápido. Siente el viento. Explora tu entorno.", "porque_en": "Need to release tension, move fast. Feel wind. Explore.", "que_hacer": "Encuentra un carril bici seguro y pedalea. Siente la velocidad y el control.", "que_hacer_en": "Find a safe bike lane and pedal. Feel speed and control.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Carril bici o parque con ruta.", "donde_en": "Bike lane or park with route.", "gps": "bike lane or route", "vector_necesidades": {"movimiento": 100, "naturaleza": 60, "silencio": 30, "agua": 10, "sol": 80, "sombra": 40, "aire_fresco": 95, "creatividad": 30, "comunidad": 50, "aprendizaje": 40, "juego": 70, "contemplacion": 60, "descanso": 30, "organizacion": 60, "alimentacion": 0, "musica": 50, "risa": 40, "esperanza": 80} }, {"id": 211, "titulo": "Soberanía de Cabina", "titulo_en": "Cabin Sovereignty", "porque": "Saturación nerviosa por presiones y ruidos de tránsito masivo.", "porque_en": "Nervous saturation from mass transit pressures or noise.", "que_hacer": "En el aeropuerto o cerca de él, busca la ventana más grande con vista al cielo. Haz tres inhalaciones profundas. Siente el viento. Tu organismo no pertenece a la prisa industrial.", "que_hacer_en": "At or near the airport, find the largest sky-view window. Take three deep breaths. Feel the wind. Your body is not for industrial haste.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Terminal de aeropuerto o zona de observación abierta.", "donde_en": "Airport terminal or open observation zone.", "gps": "airport observation area", "vector_necesidades": {"aire_fresco": 100, "contemplacion": 95, "silencio": 60, "descanso": 50, "movimiento": 30, "esperanza": 80} },
-
-            {"id": 212, "titulo": "Depuración Exocrina", "titulo_en": "Exocrine Cleansing", "porque": "Exceso de adrenalina acumulada por estrés laboral.", "porque_en": "Excess adrenaline accumulated from work stress.", "que_hacer": "Ve al gimnasio o piscina pública más cercana. Haz fuerza de forma continua un minuto. Suda para liberar tensiones. Activa tu cuerpo.", "que_hacer_en": "Go to the nearest gym or public pool. Use strength continuously for one minute. Sweat to release tension. Activate your body.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Gimnasio público, cancha o alberca comunitaria.", "donde_en": "Public gym, court, or community pool.", "gps": "community fitness center", "vector_necesidades": {"movimiento": 100, "agua": 80, "salud": 90, "juego": 50, "descanso": 0, "silencio": 20, "risa": 40} }, {"id": 213, "titulo": "Estabilización Somática", "titulo_en": "Somatic Stabilization", "porque": "Aceleración del ritmo cardíaco y sensación física de vulnerabilidad.", "porque_en": "Accelerated heart rate and physical feeling of vulnerability.", "que_hacer": "Visita una clínica o farmacia local. Busca agua potable. Bebe un vaso pequeño despacio. Saborea cada trago. Siente cómo te hidratas.", "que_hacer_en": "Visit a local clinic or pharmacy. Find drinking water. Drink a small cup slowly. Taste every sip. Feel yourself hydrate.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Área de descanso de una farmacia o clínica local.", "donde_en": "Lounge area of a local pharmacy or clinic.", "gps": "pharmacy health lounge", "vector_necesidades": {"agua": 100, "salud": 95, "descanso": 80, "silencio": 70, "organizacion": 80, "esperanza": 85} }, ], "aburrido": [ {"id": 103, "titulo": "Paseo de colores", "titulo_en": "Color Walk", "porque": "Días repetitivos. Busca novedad. Despierta tu visión.", "porque_en": "Repetitive days. Seek novelty. Awaken sight.", "que_hacer": "Camina lento. Encuentra murales o arte urbano en tu zona.", "que_hacer_en": "Walk slowly. Find murals or street art in your area.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Calle con murales.", "donde_en": "Street with murals.", "gps": "street art", "vector_necesidades": {"movimiento": 80, "naturaleza": 20, "silencio": 40, "agua": 10, "sol": 80, "sombra": 50, "aire_fresco": 90, "creatividad": 100, "comunidad": 60, "aprendizaje": 70, "juego": 55, "contemplacion": 85, "descanso": 30, "organizacion": 20, "alimentacion": 20, "musica": 30, "risa": 60, "esperanza": 95} },
-
-            { "id": 307, "titulo": "Descompresión de Perímetro", "titulo_en": "Perimeter Decompression", "porque": "Monotonía del espacio habitual. Necesitas un entorno de hermoso diseño para cambiar tus estímulos visuales.", "porque_en": "Usual space monotony. You need a beautifully designed environment to change your visual stimuli.", "que_hacer": "Ubica el hotel o resort más cercano. Ingresa de forma gratuita. Siéntate en una de sus butacas públicas. Observa la arquitectura. Mantén la espalda recta. Descansa un minuto de las pantallas.", "que_hacer_en": "Locate the nearest hotel or resort. Enter for free. Sit in one of its public armchairs. Observe the architecture. Keep your spine straight. Take a one-minute break from screens.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Lobby o zona de descanso pública de un hotel local.", "donde_en": "Lobby or public lounge area of a local hotel.", "gps": "hotel lobby", "vector_necesidades": {"descanso": 100, "silencio": 85, "contemplacion": 95, "organizacion": 80, "esperanza": 80, "comunidad": 50, "movimiento": 20} }, { "id": 308, "titulo": "Ampliación del Horizonte", "titulo_en": "Horizon Expansion", "porque": "Falta de perspectiva y estancamiento. Ver el movimiento de viajes globales te devuelve el enfoque.", "porque_en": "Lack of perspective and stagnation. Watching the movement of global travel returns your focus.", "que_hacer": "Si estás cerca de una central de transporte de USA, dirígete al vestíbulo principal. Busca el ventanal más amplio con vista al cielo. Realiza tres respiraciones lentas asimilando la inmensidad del espacio.", "que_hacer_en": "If near a USA transit center, head to the main lobby. Find the widest window with a view of the sky. Take three slow breaths, taking in the immensity of space.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Vestíbulo público de aeropuerto o central de transportes.", "donde_en": "Public airport lobby or transit center.", "gps": "transit center or airport terminal", "vector_necesidades": {"contemplacion": 100, "aire_fresco": 90, "esperanza": 95, "descanso": 70, "silencio": 50, "movimiento": 30, "apprentissage": 60} }, { "id": 309, "titulo": "Distracción Absoluta", "titulo_en": "Absolute Distraction", "porque": "Bucle mental de apatía o rutina plana. Necesitas un impacto visual de colores, sonidos y juego.", "porque_en": "Mental loop of apathy or flat routine. You need a visual impact of colors, sounds, and play.", "que_hacer": "Dirígete al parque de atracciones o centro de entretenimiento más cercano. Observa las luces. Escucha las risas del entorno. Permítete conectar con una dinámica de ocio simple para romper la inercia del día.", "que_hacer_en": "Head to the nearest amusement park or entertainment center. Observe the lights. Listen to the laughter around you. Allow yourself to connect with a simple leisure dynamic to break the daytime inertia.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Parque recreativo, zona infantil o centro de juegos local.", "donde_en": "Recreation park, kid zone, or local arcade center.", "gps": "amusement park or arcade", "vector_necesidades": {"juego": 100, "risa": 100, "comunidad": 80, "movimiento": 70, "esperanza": 90, "silencio": 20, "descanso": 50, "creatividad": 60} },
-
-            { "id": 310, "titulo": "Exploración de Espacios", "titulo_en": "Space Exploration", "porque": "Falta de inspiración y estancamiento estético. Visualizar arquitecturas alternativas expande tu mente.", "porque_en": "Lack of inspiration and aesthetic stagnation. Visualizing alternative architectures expands your mind.", "que_hacer": "Abre la aplicación de Airbnb de forma contemplativa. Filtra por diseños de cabañas o casas de campo en tu estado. Analiza el lugar, las texturas y los planos visuales como un ejercicio de imaginación sin obligación de reservar.", "que_hacer_en": "Open the Airbnb app contemplatively. Filter by cabin or country house designs in your state. Analyze the place, textures, and visual layouts as an exercise of imagination without the obligation to book.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Interfaz móvil desde tu zona de descanso habitual.", "donde_en": "Mobile interface from your usual resting space.", "gps": "local post office", "vector_necesidades": {"creatividad": 100, "contemplacion": 95, "juego": 70, "organizacion": 80, "esperanza": 85, "descanso": 60, "aprendizaje": 60} }, { "id": 311, "titulo": "Mapeo de Flujos", "titulo_en": "Flow Mapping", "porque": "Rutina plana. Caminar por un entorno de suministro masivo altera tu percepción y activa tu cuerpo.", "porque_en": "Flat routine. Walking through a mass supply environment alters your perception and activates your body.", "que_hacer": "Dirígete al club de precios más cercano. Avanza a paso firme por los pasillos perimetrales. Observa los grandes volúmenes de mercancía. Usa esta tienda gigante para mover tus piernas de forma constante.", "que_hacer_en": "Head to the nearest price club. Walk steadily through the perimeter aisles. Observe the large volumes of merchandise. Use this giant store to move your legs constantly.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Pasillos industriales de un gran almacén de USA.", "donde_en": "Industrial aisles of a large USA warehouse store.", "gps": "wholesale club or warehouse", "vector_necesidades": {"movimiento": 85, "organizacion": 75, "comunidad": 60, "contemplacion": 60, "juego": 40, "descanso": 10, "silencio": 5} }, { "id": 312, "titulo": "Sabotaje de Espera", "titulo_en": "Waiting Sabotage", "porque": "Bucle mental aburrido. Necesitas una inyección de aire fresco y entornos de estudio para reenfocarte.", "porque_en": "Bored mental loop. You need an injection of fresh air and learning environments to refocus.", "que_hacer": "Ubica el campus universitario o colegio más cercano. Camina en total silencio por sus áreas verdes y plazas comunes. Utiliza este espacio abierto para respirar libremente y observar con absoluta calma.", "que_hacer_en": "Locate the nearest university campus or college. Walk in total silence through its green areas and common plazas. Use this open space to breathe freely and observe with absolute calm.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Áreas comunes abiertas de un campus universitario.", "donde_en": "Open common areas of a university campus.", "gps": "university campus or public school", "vector_necesidades": {"aprendizaje": 100, "aire_fresco": 95, "silencio": 90, "contemplacion": 85, "descanso": 70, "movimiento": 40} },
-
-            { "id": 304, "titulo": "Soberanía en Tránsito", "titulo_en": "Transit Sovereignty", "porque": "Inercia mental por estar estancado en casa. Necesitas un cambio geográfico rápido para alterar tus pensamientos.", "porque_en": "Mental inertia from being stuck at home. You need a rapid geographical change to alter your thoughts.", "que_hacer": "Abre tu aplicación de transporte. Solicita un viaje corto hacia un parque desconocido. Durante el trayecto, suelta el teléfono. Mira a través de la ventana de forma contemplativa. Asimila la velocidad del entorno.", "que_hacer_en": "Open your ride app. Request a short trip to an unknown park. During the route, drop your phone. Look through the window contemplatively. Assimilate the environment's speed.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Asiento de pasajero en un coche de transporte urbano.", "donde_en": "Passenger seat in an urban transit vehicle.", "gps": "public transit hub or central park", "vector_necesidades": {"juego": 80, "movimiento": 70, "contemplacion": 85, "comunidad": 60, "descanso": 40, "silencio": 30, "esperanza": 80} }, { "id": 305, "titulo": "Descompresión Visual", "titulo_en": "Visual Decompression", "porque": "Bucle cognitivo severo debido a la rutina monótona. Requieres un quiebre estético controlado.", "porque_en": "Severe cognitive loop due to monotonous routine. You require a controlled aesthetic break.", "que_hacer": "Abre YouTube de forma consciente. Busca filmaciones aéreas de paisajes naturales. Observa la pantalla fijamente por dos minutos enteros. Respira hondo para relajar tus músculos del ojo.", "que_hacer_en": "Open YouTube mindfully. Search for aerial footage of natural landscapes. Watch the screen fixedly for two whole minutes. Breathe deeply to relax your eye muscles.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Interfaz de tu teléfono en un rincón con luz tenue.", "donde_en": "Your phone interface in a dimly lit corner.", "gps": "local coffee lounge", "vector_necesidades": {"contemplacion": 100, "descanso": 90, "creatividad": 80, "esperanza": 90, "silencio": 50, "naturaleza": 70, "movimiento": 5} }, { "id": 306, "titulo": "Inversión Controlada", "titulo_en": "Controlled Investment", "porque": "Aburrimiento crónico y falta de pasatiempos que activen tu mente.", "porque_en": "Chronic boredom and lack of hobbies to activate your mind.", "que_hacer": "Abre la aplicación de compras. Busca un objeto pequeño que impulse una actividad física real, como un libro o pincel. Adquiérelo con la certeza de invertir en tu propia creatividad.", "que_hacer_en": "Open the shopping app. Search for a small object that drives a real physical activity, like a book or paintbrush. Acquire it with the certainty of investing in your own creativity.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Pantalla móvil desde tu espacio de descanso habitual.", "donde_en": "Mobile screen from your usual resting space.", "gps": "local post office", "vector_necesidades": {"juego": 90, "creatividad": 90, "esperanza": 95, "organizacion": 70, "descanso": 60, "aprendizaje": 80, "movimiento": 10} },
-
-            { "id": 301, "titulo": "Auditoría de Frecuencias", "titulo_en": "Frequency Audit", "porque": "Monotonía aplastante y falta de estímulos rítmicos o sociales en tu rutina.", "porque_en": "Crushing monotony and lack of rhythmic or social stimuli in your routine.", "que_hacer": "Visita una zona de discotecas o un club céntrico nocturno. Sal un momento a la acera peatonal abierta. Escucha la vibración profunda del bajo golpeando las paredes del edificio. Siente el pulso acelerado de la vida nocturna.", "que_hacer_en": "Visit a club district or a downtown nightclub. Step outside to the open pedestrian sidewalk for a moment. Listen to the deep bass vibration hitting the building walls. Feel the accelerated pulse of nightlife.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Perímetro exterior, terraza o área abierta de un club nocturno urbano.", "donde_en": "Outer perimeter, terrace, or open area of an urban nightclub.", "gps": "dance club or nightclub", "vector_necesidades": {"juego": 100, "musica": 100, "comunidad": 90, "risa": 80, "movimiento": 70, "creatividad": 60, "silencio": 10, "descanso": 30} }, { "id": 302, "titulo": "Terapia de Pasillo", "titulo_en": "Aisle Therapy", "porque": "Estancamiento mental en casa y falta de variedad en tu entorno visual inmediato.", "porque_en": "Mental stagnation at home and lack of variety in your immediate visual environment.", "que_hacer": "Dirígete a una gran superficie comercial de tu área. Recorre el lugar de forma contemplativa sin la obligación de comprar. Observa la organización. Camina a paso firme para activar el flujo de tus piernas.", "que_hacer_en": "Head to a large department store in your area. Walk through the place contemplatively without the obligation to shop. Observe the layout. Walk steadily to activate the flow in your legs.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Gran superficie comercial o tienda céntrica en USA.", "donde_en": "Large department store or central shop in the USA.", "gps": "department store or retail", "vector_necesidades": {"movimiento": 80, "organizacion": 70, "contemplacion": 70, "comunidad": 60, "juego": 50, "descanso": 20, "silencio": 15} }, { "id": 303, "titulo": "Sabotaje Alimenticio", "titulo_en": "Food Sabotage", "porque": "Falta de estímulos sensoriales y monotonía en tu alimentación de la semana.", "porque_en": "Lack of sensory stimuli and monotony in your food during the week.", "que_hacer": "Dirígete a la cafetería o cadena de comida rápida más cercana. Pide un antojo específico. Disfrútalo bocado a bocado completamente alejado del teléfono. Presta atención exclusiva al sabor real.", "que_hacer_en": "Head to the nearest coffee shop or fast-food chain. Order a specific treat. Enjoy it bite by bite completely away from your phone. Pay exclusive attention to the real flavor.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Cadena de comida rápida o cafetería local en tu Código Postal.", "donde_en": "Fast food chain or local coffee shop in your Zip Code.", "gps": "fast food or local restaurant", "vector_necesidades": {"alimentacion": 100, "risa": 75, "juego": 70, "comunidad": 80, "movimiento": 30, "descanso": 50, "esperanza": 85, "silencio": 20} },
-
-            { "id": 253, "titulo": "Auditoría de Frecuencias", "titulo_en": "Frequency Audit", "porque": "Monotonía mental aplastante en tu semana. Necesitas un quiebre sensorial radical mediante ritmos y movimiento.", "porque_en": "Crushing mental monotony in your week. You need a radical sensory break through rhythm and movement.", "que_hacer": "Visita una zona de discotecas o un club céntrico nocturno. Sal un momento a la acera peatonal abierta. Escucha la vibración profunda del bajo golpeando las paredes del edificio. Siete el cambio súbito de temperatura en tu piel. Respira hondo. Permite que el pulso de la vida nocturna rompa el piloto automático del día.", "que_hacer_en": "Visit a club district or a downtown nightclub. Step outside to the open pedestrian sidewalk for a moment. Listen to the deep bass vibration hitting the building walls. Feel the sudden change of temperature on your skin. Breathe deeply. Let the pulse of nightlife break the daytime autopilot.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Perímetro exterior, terraza o área abierta de un club nocturno urbano.", "donde_en": "Outer perimeter, terrace, or open area of an urban nightclub.", "gps": "nightlife district or dance clubs", "vector_necesidades": {"juego": 100, "musica": 100, "comunidad": 90, "risa": 80, "movimiento": 70, "creatividad": 60, "silencio": 10, "descanso": 30} }, {"id": 114, "titulo": "Mercado de Agricultores", "titulo_en": "Farmers Market", "porque": "Necesitas nuevos estímulos. Sabores y olores frescos. Apoya lo local.", "porque_en": "Need new stimuli. Fresh tastes/smells. Support local.", "que_hacer": "Visita un mercado local. Prueba un producto diferente. Conversa con los vendedores.", "que_hacer_en": "Visit local market. Try a different product. Talk to vendors.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Mercado de agricultores.", "donde_en": "Farmers market.", "gps": "farmers market", "vector_necesidades": {"movimiento": 60, "naturaleza": 50, "silencio": 30, "agua": 10, "sol": 70, "sombra": 40, "aire_fresco": 80, "creatividad": 70, "comunidad": 90, "aprendizaje": 60, "juego": 40, "contemplacion": 50, "descanso": 30, "organizacion": 50, "alimentacion": 100, "musica": 30, "risa": 70, "esperanza": 80} }, {"id": 115, "titulo": "Exposición de Arte", "titulo_en": "Art Exhibition", "porque": "Mente en bucle. Busca inspiración. Despierta tu creatividad.", "porque_en": "Mind in a loop. Seek inspiration. Awaken creativity.", "que_hacer": "Visita una galería o museo local. Contempla las obras. Reflexiona en silencio.", "que_hacer_en": "Visit local gallery/museum. Observe the pieces. Reflect in silence.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Galería de arte o museo.", "donde_en": "Art gallery or museum.", "gps": "art gallery", "vector_necesidades": {"movimiento": 40, "naturaleza": 10, "silencio": 70, "agua": 0, "sol": 10, "sombra": 90, "aire_fresco": 30, "creatividad": 100, "comunidad": 50, "aprendizaje": 90, "juego": 10, "contemplacion": 95, "descanso": 60, "organizacion": 70, "alimentacion": 0, "musica": 60, "risa": 20, "esperanza": 85} },
-
-            {"id": 116, "titulo": "Parque de Patinaje", "titulo_en": "Skate Park", "porque": "Necesitas energía visual. Observa la libertad y el movimiento. Conéctate con el juego.", "porque_en": "Need visual energy. Observe freedom and movement. Connect with play.", "que_hacer": "Acércate a un skate park. Observa a los patinadores. Siente la vitalidad.", "que_hacer_en": "Go to a skate park. Watch skaters. Feel the vitality.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Skate park público.", "donde_en": "Public skate park.", "gps": "skate park", "vector_necesidades": {"movimiento": 70, "naturaleza": 30, "silencio": 20, "agua": 10, "sol": 80, "sombra": 50, "aire_fresco": 90, "creatividad": 80, "comunidad": 80, "aprendizaje": 30, "juego": 100, "contemplacion": 60, "descanso": 30, "organizacion": 20, "alimentacion": 20, "musica": 70, "risa": 90, "esperanza": 90} }, {"id": 117, "titulo": "Librería de Segunda Mano", "titulo_en": "Used Bookstore", "porque": "Busca historias and conocimiento. Desconéctate del mundo digital. Nutre tu mente.", "porque_en": "Seek stories and knowledge. Disconnect from digital. Nourish your mind.", "que_hacer": "Explora un local de libros usados. Busca títulos inesperados. Disfruta el aroma.", "que_hacer_en": "Explore a used bookstore. Look for unexpected titles. Enjoy the scent.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Librería de segunda mano.", "donde_en": "Used bookstore.", "gps": "used bookstore", "vector_necesidades": {"movimiento": 30, "naturaleza": 10, "silencio": 85, "agua": 0, "sol": 20, "sombra": 95, "aire_fresco": 40, "creatividad": 90, "comunidad": 30, "aprendizaje": 100, "juego": 20, "contemplacion": 90, "descanso": 80, "organizacion": 70, "alimentacion": 0, "musica": 10, "risa": 5, "esperanza": 75} }, {"id": 128, "titulo": "Cine al aire libre", "titulo_en": "Outdoor Cinema", "porque": "Necesitas un cambio de ambiente y una nueva perspectiva. Disfruta una historia en un entorno diferente.", "porque_en": "Need scene and perspective change. Enjoy a story in a new setting.", "que_hacer": "Asiste a una proyeccion en el exterior. Sumérgete en la película y el ambiente.", "que_hacer_en": "Attend an outdoor screening. Immerse yourself in the film and atmosphere.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Parque o plaza con proyecciones.", "donde_en": "Park or plaza with screenings.", "gps": "outdoor cinema", "vector_necesidades": {"movimiento": 30, "naturaleza": 60, "silencio": 40, "agua": 10, "sol": 50, "sombra": 70, "aire_fresco": 80, "creatividad": 90, "comunidad": 80, "aprendizaje": 70, "juego": 50, "contemplacion": 80, "descanso": 70, "organizacion": 20, "alimentacion": 60, "musica": 70, "risa": 70, "esperanza": 85} }, {"id": 221, "titulo": "Auditoría de Frecuencias", "titulo_en": "Frequency Audit", "porque": "Monotonía extrema y falta de estímulos rítmicos o sociales en tu semana.", "porque_en": "Extreme monotony, lack of rhythmic or social stimuli.", "que_hacer": "Visita un club nocturno. Sal al exterior. Siente la música. Nota el aire. Libérate de la inercia mental.", "que_hacer_en": "Visit a nightclub. Step outside. Feel the music. Notice the air. Break free from mental inertia.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Perímetro exterior o zona abierta de un club nocturno.", "donde_en": "Outer perimeter or open area of a nightclub.", "gps": "nightlife district lounge", "vector_necesidades": {"juego": 100, "comunidad": 90, "musica": 90, "risa": 80, "creatividad": 70, "movimiento": 60, "silencio": 10, "descanso": 30} }, {"id": 222, "titulo": "Hackeo Cognitivo", "titulo_en": "Cognitive Hack", "porque": "Falta de inspiración y embotamiento por consuming contenido basura repetitivo.", "porque_en": "Lack of inspiration, dullness from repetitive junk content.", "que_hacer": "Ve al cine o museo local. Entra al vestíbulo. Elige un cartel. Obsérvalo fijamente aislando tu mente del ruido. Usa el espacio como laboratorio de enfoque.", "que_hacer_en": "Head to a local cinema or museum. Enter the lobby. Choose a poster. Stare at it, isolating your mind from noise. Use the space as a focus lab.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Entrada pública de un centro cultural o cine.", "donde_en": "Public entrance of a cultural center or cinema.", "gps": "local cinema or museum", "vector_necesidades": {"creatividad": 100, "aprendizaje": 90, "contemplacion": 95, "juego": 60, "comunidad": 50, "descanso": 60, "silencio": 70} }, {"id": 223, "titulo": "Sabotaje de Rutina", "titulo_en": "Routine Sabotage", "porque": "Falta de variedad sensorial. Salir por un antojo físico rompe la inercia del día de forma inmediata.", "porque_en": "Lack of sensory variety. A physical treat immediately breaks the day's inertia.", "que_hacer": "Ve a un restaurante local. Pide algo. Disfrútalo bocado a bocado sin pantallas. Atiende al sabor y la textura real.", "que_hacer_en": "Head to a local restaurant. Order a treat. Enjoy it bite by byte with no screens. Focus on real taste and texture.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Cadena de comida rápida o restaurante del vecindario.", "donde_en": "Fast food chain or neighborhood restaurant.", "gps": "fast food or local restaurant", "vector_necesidades": {"alimentacion": 100, "risa": 75, "juego": 70, "comunidad": 80, "movimiento": 30, "descanso": 50, "esperanza": 85, "silencio": 20} },
-
-            {"id": 222, "titulo": "Hackeo Cognitivo", "titulo_en": "Cognitive Hack", "porque": "Falta de inspiración y embotamiento por consumir contenido basura repetitivo.", "porque_en": "Lack of inspiration, dullness from repetitive junk content.", "que_hacer": "Ve al cine o museo local. Entra al vestíbulo. Elige un cartel. Obsérvalo fijamente aislando tu mente del ruido. Usa el espacio como laboratorio de enfoque.", "que_hacer_en": "Head to a local cinema or museum. Enter the lobby. Choose a poster. Stare at it, isolating your mind from noise. Use the space as a focus lab.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Entrada pública de un centro cultural o cine.", "donde_en": "Public entrance of a cultural center or cinema.", "gps": "local cinema or museum", "vector_necesidades": {"creatividad": 100, "aprendizaje": 90, "contemplacion": 95, "juego": 60, "comunidad": 50, "descanso": 60, "silencio": 70} }, {"id": 223, "titulo": "Sabotaje de Rutina", "titulo_en": "Routine Sabotage", "porque": "Falta de variedad sensorial. Salir por un antojo físico rompe la inercia del día de forma inmediata.", "porque_en": "Lack of sensory variety. A physical treat immediately breaks the day's inertia.", "que_hacer": "Ve a un restaurante local. Pide algo. Disfrútalo bocado a bocado sin pantallas. Atiende al sabor y la textura real.", "que_hacer_en": "Head to a local restaurant. Order a treat. Enjoy it bite by bite with no screens. Focus on real taste and texture.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Cadena de comida rápida o restaurante del vecindario.", "donde_en": "Fast food chain or neighborhood restaurant.", "gps": "fast food or local restaurant", "vector_necesidades": {"alimentacion": 100, "risa": 75, "juego": 70, "comunidad": 80, "movimiento": 30, "descanso": 50, "esperanza": 85, "silencio": 20} } ],
-
-        "cansado": [
-            {"id": 104, "titulo": "Lectura en biblioteca", "titulo_en": "Library Reading", "porque": "Necesitas calma. Aprende sin distracciones. Recarga tu energía.", "porque_en": "Need calm. Learn without distractions. Recharge energy.", "que_hacer": "Visita tu biblioteca local. Busca un libro o disfruta el silencio.", "que_hacer_en": "Visit your local library. Find a book or enjoy silence.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Biblioteca pública.", "donde_en": "Public library.", "gps": "public library", "vector_necesidades": {"movimiento": 30, "naturaleza": 10, "silencio": 100, "agua": 0, "sol": 10, "sombra": 80, "aire_fresco": 50, "creatividad": 70, "comunidad": 50, "aprendizaje": 95, "juego": 10, "contemplacion": 90, "descanso": 85, "organizacion": 70, "alimentacion": 0, "musica": 0, "risa": 10, "esperanza": 70} }, {"id": 119, "titulo": "Paseo por el Puerto", "titulo_en": "Harbor Walk", "porque": "Necesitas despejar la mente. Aire fresco y vistas al agua. Caminata relajante.", "porque_en": "Need to clear mind. Fresh air, water views. Relaxing walk.", "que_hacer": "Camina por el puerto. Observa los barcos. Escucha el oleaje.", "que_hacer_en": "Walk along the harbor. Watch boats. Listen to the waves.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Puerto o muelle.", "donde_en": "Harbor or pier.", "gps": "harbor walk or pier", "vector_necesidades": {"movimiento": 70, "naturaleza": 80, "silencio": 60, "agua": 100, "sol": 70, "sombra": 50, "aire_fresco": 95, "creatividad": 50, "comunidad": 60, "aprendizaje": 40, "juego": 30, "contemplacion": 90, "descanso": 80, "organizacion": 20, "alimentacion": 20, "musica": 50, "risa": 40, "esperanza": 90} }, { "id": 328, "titulo": "Inversión Marítima", "titulo_en": "Maritime Inversion", "porque": "Cansancio acumulado de la rutina diaria. Tu mente requiere el estímulo de la inmensidad marina para disolver el encierro.", "porque_en": "Accumulated fatigue from daily routine. Your mind requires the stimulus of vast marine elements to dissolve confinement.", "que_hacer": "Dirígete al paseo costero más cercano de tu área. Contempla las grandes embarcaciones. Deja que el reflejo de la luz sobre el agua limpie la pesadez de tus pensamientos.", "que_hacer_en": "Head to the nearest coastal boardwalk in your area. Contemplate the large vessels. Let the reflection of light on the water clear away the heaviness of your thoughts.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Muelle, puerto local o zona costera abierta.", "donde_en": "Dock, local pier, or open coastal zone.", "gps": "cruise terminal or pier", "vector_necesidades": {"agua": 100, "contemplacion": 95, "descanso": 90, "aire_fresco": 90, "naturaleza": 80, "silencio": 60, "esperanza": 85} },
-
-            { "id": 329, "titulo": "Pausa en Ruta", "titulo_en": "Route Break", "porque": "Fatiga muscular y embotamiento cognitivo provocado por trayectos continuos y la inercia del asfalto.", "porque_en": "Muscular fatigue and cognitive dullness caused by continuous travel and asphalt inertia.", "que_hacer": "Busca la próxima área de servicio segura en tu ruta. Estaciona por completo, apaga el motor y sal del vehículo. Realiza un suave estiramiento corporal, respira el aire fresco y camina despacio un minuto para reactivar tu circulación.", "que_hacer_en": "Find the next safe service area on your route. Park completely, turn off the engine, and step out of the vehicle. Do a gentle body stretch, breathe the fresh air, and walk slowly for one minute to reactivate circulation.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Área de servicio de autopista o zona de descanso pública.", "donde_en": "Highway service area or public rest zone.", "gps": "highway rest stop or plaza", "vector_necesidades": {"descanso": 95, "movimiento": 60, "aire_fresco": 90, "salud": 85, "silencio": 50, "contemplacion": 70, "organizacion": 40} }, { "id": 330, "titulo": "Recuperación Pasiva", "titulo_en": "Passive Recovery", "porque": "Agotamiento mental debido a la predictibilidad de la rutina diaria. Necesitas un suave cambio de ritmo.", "porque_en": "Mental exhaustion due to the predictability of the daily routine. You need a gentle change of pace.", "que_hacer": "Ubica una zona histórica o plaza antigua a pie en tu perímetro comercial. Camina a un paso deliberadamente lento, sin prisa. Contempla las estructuras arquitectónicas del lugar y usa ese entorno público para despejar la mente.", "que_hacer_en": "Locate a historical zone or old plaza on foot within your commercial perimeter. Walk at a deliberately slow, unhurried pace. Contemplate the architectural structures of the place and use that public setting to clear your mind.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Centro histórico, plaza pública o calles peatonales.", "donde_en": "Historical center, public plaza, or pedestrian streets.", "gps": "historical landmark or walking tour", "vector_necesidades": {"aprendizaje": 90, "contemplacion": 95, "descanso": 80, "movimiento": 50, "silencio": 70, "creatividad": 60, "esperanza": 80} }, { "id": 331, "titulo": "Aislamiento Sensorial", "titulo_en": "Sensory Isolation", "porque": "Saturación del sistema nervioso por exceso de interacción humana y demandas de la rutina urbana diaria.", "porque_en": "Nervous system saturation from excessive human interaction and demands of the daily urban routine.", "que_hacer": "Dirígete al complejo de salas más cercano de tu Código Postal. Elige una función matinal o en horario de baja afluencia. Siéntate en la penumbra, suelta el teléfono y permite que la oscuridad y el distanciamiento controlado calmen el ruido de tu mente.", "que_hacer_en": "Head to the nearest theater complex in your Zip Code. Choose a morning or low-traffic screening. Sit in the dim light, drop your phone, and allow the darkness and controlled distancing to quiet the noise in your mind.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Sala de cine comercial o vestíbulo de proyecciones.", "donde_en": "Commercial movie theater or screening lobby.", "gps": "local cinema or amc", "vector_necesidades": {"descanso": 100, "silencio": 85, "contemplacion": 90, "sombra": 100, "juego": 40, "creatividad": 50, "movimiento": 5} },
-
-            { "id": 332, "titulo": "Homeostasis Verde", "titulo_en": "Green Homeostasis", "porque": "Agotamiento crónico debido al asfalto, aire acondicionado de oficina y falta de conexión orgánica.", "porque_en": "Chronic fatigue due to asphalt, office air conditioning, and lack of organic connection.", "que_hacer": "Ubica el jardín botánico o parque floral más cercano. Busca un banco protegido por la vegetación. Permanece allí inmóvil por dos minutos enteros. Respira el aire limpio del ambiente. Deja que los tonos verdes relajen tu mirada.", "que_hacer_en": "Locate the nearest botanical garden or floral park. Find a bench sheltered by vegetation. Remain there motionless for two whole minutes. Breathe the clean ambient air. Let the green tones relax your gaze.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Jardín botánico público, vivero o parque natural regional.", "donde_en": "Public botanical garden, nursery, or regional nature park.", "gps": "botanical garden or nursery", "vector_necesidades": {"naturaleza": 100, "aire_fresco": 100, "descanso": 90, "silencio": 80, "contemplacion": 95, "sombra": 90, "salud": 85, "movimiento": 25} }, { "id": 333, "titulo": "Módulo de Quietud", "titulo_en": "Quietness Module", "porque": "Cansancio mental plano y monotonía. Necesitas observar el movimiento sutil de la naturaleza sin prisas.", "porque_en": "Flat mental fatigue and monotony. You need to observe the subtle movement of nature without haste.", "que_hacer": "Encuentra un parque local con lago o estanque en tu Código Postal. Siéntate en el asiento más cercano a la orilla. Observa las ondas del agua y las aves del perímetro un minuto completo. Lleva tu respiración a un ritmo lento.", "que_hacer_en": "Find a local park with a lake or pond in your Zip Code. Sit on the seat closest to the edge. Observe the water ripples and the birds in the perimeter for a full minute. Lead your breathing to a slow pace.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Banco de parque junto a un estanque o lago público.", "donde_en": "Park bench next to a public pond or lake.", "gps": "public lake park or fountain", "vector_necesidades": {"agua": 100, "contemplacion": 100, "descanso": 95, "silencio": 75, "naturaleza": 85, "aire_fresco": 90, "movimiento": 15} }, {"id": 120, "titulo": "Observatorio Local", "titulo_en": "Local Observatory", "porque": "Mente ansiosa. Busca perspectiva universal. Maravíllate con el cosmos.", "porque_en": "Anxious mind. Seek universal perspective. Marvel at the cosmos.", "que_hacer": "Visita un centro astronómico. Aprende sobre el universo. Contempla las estrellas si el clima lo permite.", "que_hacer_en": "Visit an astronomical center. Learn about the universe. Contemplate stars if the weather allows it.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Observatorio astronómico.", "donde_en": "Astronomical observatory.", "gps": "astronomical observatory", "vector_necesidades": {"movimiento": 10, "naturaleza": 70, "silencio": 90, "agua": 0, "sol": 10, "sombra": 100, "aire_fresco": 70, "creatividad": 80, "comunidad": 40, "aprendizaje": 100, "juego": 10, "contemplacion": 100, "descanso": 90, "organizacion": 60, "alimentacion": 0, "musica": 30, "risa": 5, "esperanza": 95} },
-
-            {"id": 121, "titulo": "Banco en Plaza Céntrica", "titulo_en": "Bench in Central Plaza", "porque": "Necesitas observar. Conéctate con la vida urbana. Descansa y reflexiona.", "porque_en": "Need to observe. Connect with urban life. Rest and reflect.", "que_hacer": "Siéntate en un asiento público. Contempla a las personas pasar. Siente el pulso de la ciudad.", "que_hacer_en": "Sit on a public seat. Watch people pass. Feel the city's pulse.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Plaza pública o parque.", "donde_en": "Public plaza or park.", "gps": "public plaza", "vector_necesidades": {"movimiento": 20, "naturaleza": 60, "silencio": 30, "agua": 10, "sol": 90, "sombra": 70, "aire_fresco": 80, "creatividad": 50, "comunidad": 80, "aprendizaje": 40, "juego": 30, "contemplacion": 90, "descanso": 100, "organizacion": 20, "alimentacion": 10, "musica": 60, "risa": 50, "esperanza": 85} }, {"id": 129, "titulo": "Tour Histórico a Pie", "titulo_en": "Historical Walking Tour", "porque": "Mente agotada de lo predecible. Necesitas una inyección de conocimiento y un suave movimiento. Aprende mientras caminas.", "porque_en": "Mind tired of predictable. Need knowledge injection, gentle movement. Learn as you walk.", "que_hacer": "Busca un recorrido peatonal gratuito o de bajo costo. Descubre crónicas locales.", "que_hacer_en": "Find a free or low-cost pedestrian tour. Discover local chronicles.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Centro histórico de la ciudad.", "donde_en": "City historical center.", "gps": "free walking tour", "vector_necesidades": {"movimiento": 80, "naturaleza": 30, "silencio": 50, "agua": 10, "sol": 70, "sombra": 60, "aire_fresco": 80, "creatividad": 70, "comunidad": 70, "aprendizaje": 100, "juego": 20, "contemplacion": 80, "descanso": 60, "organizacion": 50, "alimentacion": 20, "musica": 30, "risa": 40, "esperanza": 90} }, {"id": 231, "titulo": "Inversión Marítima", "titulo_en": "Maritime Inversion", "porque": "Cansancio monótono. Tu mente requiere el estímulo visual de la inmensidad marina para romper el encierro urbano.", "porque_en": "Monotonous fatigue. Mind needs vast marine stimulus to break urban confinement.", "que_hacer": "Ve al puerto costero. Observa las grandes naves y el horizonte. Deja que el reflejo del agua limpie tus pensamientos.", "que_hacer_en": "Head to the coastal port. Observe large vessels and the horizon. Let the water reflection clear your thoughts.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Muelle, puerto o zona costera abierta.", "donde_en": "Dock, pier, or open coastal zone.", "gps": "cruise terminal or pier", "vector_necesidades": {"agua": 100, "contemplacion": 95, "descanso": 90, "aire_fresco": 90, "naturaleza": 80, "silencio": 60} },
-
-            {"id": 232, "titulo": "Quiebre de Inercia", "titulo_en": "Inertia Break", "porque": "Cansancio cerebral por exceso de rutinas repetitivas y falta de estímulos rítmicos reales.", "porque_en": "Brain fatigue from repetitive routines, lack of real rhythmic stimuli.", "que_hacer": "Visita centros nocturnos. Sal al área abierta. Escucha la vibración del bajo. Siente la música. Deja que el pulso urbano rompa el automatismo del día.", "que_hacer_en": "Visit nightlife spots. Step out to an open area. Listen to the bass vibration. Feel the music. Let the urban pulse break daytime autopilot.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Perímetro exterior o terraza de un club céntrico.", "donde_en": "Outer perimeter or terrace of a central club.", "gps": "dance club or nightclub", "vector_necesidades": {"musica": 100, "juego": 90, "comunidad": 80, "risa": 70, "movimiento": 60, "silencio": 10, "descanso": 40} } ], "ansioso": [ {"id": 105, "titulo": "Mirar el agua", "titulo_en": "Watch the Water", "porque": "Agua en movimiento. Calma tu mente. Relaja tensiones.", "porque_en": "Moving water. Calm mind. Release tensions.", "que_hacer": "Busca una fuente, lago o río cercano. Observa el flujo de la corriente. Déjate llevar.", "que_hacer_en": "Find a nearby fountain, lake, or river. Observe the stream flow. Let go.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Fuente de agua o lago.", "donde_en": "Water fountain or lake.", "gps": "public fountain or lake", "vector_necesidades": {"movimiento": 40, "naturaleza": 80, "silencio": 70, "agua": 100, "sol": 60, "sombra": 50, "aire_fresco": 90, "creatividad": 20, "comunidad": 30, "aprendizaje": 10, "juego": 20, "contemplacion": 90, "descanso": 80, "organizacion": 10, "alimentacion": 0, "musica": 50, "risa": 10, "esperanza": 80} }, {"id": 122, "titulo": "Paseo en Bote", "titulo_en": "Boat Ride", "porque": "Estrés acumulado. Necesitas desconexión total. Flota y relájate.", "porque_en": "Accumulated stress. Need total disconnection. Float and relax.", "que_hacer": "Realiza un viaje corto en lancha. Siente la brisa. Observa la inmensidad del paisaje líquido.", "que_hacer_en": "Take a short launch trip. Feel the breeze. Observe the vast liquid landscape.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Lago o río con alquiler de botes.", "donde_en": "Lake or river with boat rentals.", "gps": "boat rentals lake or river", "vector_necesidades": {"movimiento": 60, "naturaleza": 100, "silencio": 80, "agua": 100, "sol": 80, "sombra": 60, "aire_fresco": 100, "creatividad": 50, "comunidad": 50, "aprendizaje": 30, "juego": 60, "contemplacion": 95, "descanso": 90, "organizacion": 10, "alimentacion": 20, "musica": 60, "risa": 30, "esperanza": 90} },
+# Necesidades que las misiones pueden declarar aunque no formen parte del perfil del usuario
+NECESIDADES_EXTRA_CATALOGO = ("salud",)
+NECESIDADES_CONOCIDAS = frozenset(DEFAULT_NECESSITY_VECTOR) - {"indicador_ansiedad"} | set(NECESIDADES_EXTRA_CATALOGO)
+CAMPOS_CASA = ("titulo", "descripcion")
+CAMPOS_BILINGUES_SALIR = ("titulo", "porque", "que_hacer", "cuando", "para_que", "donde")
+
+class CatalogoInvalido(ValueError):
+    """El catálogo de misiones no pasa la validación de arranque."""
+
+class RegistroInmutable:
+    __slots__ = ()
 
-            { "id": 345, "titulo": "Distracción Absoluta", "titulo_en": "Absolute Distraction", "porque": "Ansiedad cíclica y rumiación mental masiva. Necesitas un impacto de juego y risas para apagar el pánico.", "porque_en": "Cyclic anxiety and massive mental rumination. You need a shock of play and laughter to quiet panic.", "que_hacer": "Dirígete al parque de mascotas o zona recreativa más cercana de tu Código Postal. Observa las interacciones de los animales. Escucha los sonidos del perímetro. Conéctate con la diversión inocente por un minuto completo para anular el bucle de pensamientos.", "que_hacer_en": "Head to the nearest dog park or recreational zone in your Zip Code. Observe animal interactions. Listen to the sounds of the perimeter. Connect with innocent fun for a full minute to cancel the thought loop.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Parque de perros local, zona infantil o centro de juegos.", "donde_en": "Local dog park, kids zone, or arcade center.", "gps": "dog park or amusement arcade", "vector_necesidades": {"juego": 100, "risa": 100, "comunidad": 90, "movimiento": 70, "esperanza": 95, "silencio": 20, "descanso": 50, "creatividad": 40} }, { "id": 346, "titulo": "Aislamiento Conciencial", "titulo_en": "Conscious Isolation", "porque": "Inquietud social aguda y ruido mental provocado por la sobrecarga de responsabilidades.", "porque_en": "Acute social uneasiness and mental noise caused by responsibilities overload.", "que_hacer": "Visita el jardín de un hotel o resort local. Siéntate sin costo en una de las butacas públicas. Cierra los ojos por sesenta segundos enteros. Respira a un ritmo lento. Habita tu propio cuerpo en total quietud.", "que_hacer_en": "Visit the garden of a local hotel or resort. Sit for free in one of the public armchairs. Close your eyes for sixty whole seconds. Breathe at a slow pace. Inhabit your own body in total stillness.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Zona de descanso, jardín interior o lobby de un hotel de USA.", "donde_en": "Lobby, interior garden, or lounge area of a USA hotel.", "gps": "boutique hotel lobby", "vector_necesidades": {"descanso": 100, "silencio": 95, "contemplacion": 95, "organizacion": 80, "salud": 90, "esperanza": 90, "sombra": 80} }, { "id": 347, "titulo": "Estrategia de Alivio", "titulo_en": "Relief Strategy", "porque": "Sensación de asfixia debido al encierro diario de la rutina laboral.", "porque_en": "Feeling of suffocation due to the daily confinement of the work routine.", "que_hacer": "Si estás cerca de una central de transportes, camina hacia el vestíbulo principal. Despega la mirada de la pantalla. Observa a los viajeros partir. Asimila que el mundo es inmenso y tu problema actual es transitorio.", "que_hacer_en": "If near a transit center, walk to the main lobby. Take your eyes off the screen. Watch travelers depart. Assimilate that the world is huge and your current issue is transient.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Vestíbulo público de aeropuerto o central de transportes regional.", "donde_en": "Public airport lobby or regional transit hub.", "gps": "transit center or airport terminal", "vector_necesidades": {"contemplacion": 100, "aire_fresco": 90, "esperanza": 95, "descanso": 70, "silencio": 60, "movimiento": 40, "aprendizaje": 50} },
+    def __setattr__(self, nombre, valor):
+        raise AttributeError(f"{type(self).__name__} es inmutable")
 
-            { "id": 348, "titulo": "Módulo de Silencio Comunitario", "titulo_en": "Community Silence Module", "porque": "Aislamiento mental nocivo y parálisis por ansiedad. Necesitas estar rodeado de flujos humanos tranquilos.", "porque_en": "Harmful mental isolation and anxiety paralysis. You need to be surrounded by calm human flows.", "que_hacer": "Dirígete a una cafetería tranquila de tu zona. Pide una bebida tibia o agua. Siéntate en un rincón. Evita revisar las redes sociales. Simplemente observa los movimientos pausados de las personas y el aroma del lugar para desacelerar tu pulso.", "que_hacer_en": "Head to a quiet coffee shop in your area. Order a warm drink or water. Sit in a corner. Avoid checking social media. Simply observe the slow movements of people and the aroma of the place to slow your pulse.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Cafetería o establecimiento de bebidas local en tu Código Postal.", "donde_en": "Local coffee shop or beverage venue in your Zip Code.", "gps": "quiet cafe or bakery", "vector_necesidades": {"comunidad": 90, "descanso": 85, "silencio": 75, "alimentacion": 60, "contemplacion": 80, "esperanza": 85, "musica": 30} }, {"id": 123, "titulo": "Jardín de Rocas Zen", "titulo_en": "Rock Zen Garden", "porque": "Mente agitada. Busca orden y armonía. Centra tus pensamientos.", "porque_en": "Agitated mind. Seek order and harmony. Center thoughts.", "que_hacer": "Encuentra un parque de piedras. Observa las formas y la disposición. Medita en su calma.", "que_hacer_en": "Find a stone park. Observe shapes and arrangement. Meditate in its calm.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Jardín de rocas o japonés.", "donde_en": "Rock or Japanese garden.", "gps": "zen garden", "vector_necesidades": {"movimiento": 10, "naturaleza": 90, "silencio": 100, "agua": 50, "sol": 50, "sombra": 80, "aire_fresco": 90, "creatividad": 70, "comunidad": 20, "aprendizaje": 60, "juego": 5, "contemplacion": 100, "descanso": 95, "organizacion": 100, "alimentacion": 0, "musica": 20, "risa": 5, "esperanza": 90} }, {"id": 124, "titulo": "Parque de Perros", "titulo_en": "Dog Park", "porque": "Necesitas risas y alegría. Observa el juego inocente. Contagia la energía positiva.", "porque_en": "Need laughter and joy. Observe innocent play. Catch positive energy.", "que_hacer": "Visita un recinto canino. Siente la diversión. Mira la interacción de los animales.", "que_hacer_en": "Visit a canine enclosure. Feel the fun. Watch the animals' interaction.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Parque de perros local.", "donde_en": "Local dog park.", "gps": "dog park", "vector_necesidades": {"movimiento": 70, "naturaleza": 70, "silencio": 30, "agua": 20, "sol": 80, "sombra": 40, "aire_fresco": 90, "creatividad": 60, "comunidad": 90, "aprendizaje": 10, "juego": 100, "contemplacion": 40, "descanso": 60, "organizacion": 10, "alimentacion": 10, "musica": 20, "risa": 100, "esperanza": 90} },
+    def __delattr__(self, nombre):
+        raise AttributeError(f"{type(self).__name__} es inmutable")
 
-            {"id": 125, "titulo": "Música en Vivo Suave", "titulo_en": "Calm Live Music", "porque": "Mente estresada. Necesitas una experiencia sensorial. Permite que el arte sonoro te calme.", "porque_en": "Stressed mind. Need sensory experience. Let sonic art calm you.", "que_hacer": "Encuentra un lugar con melodías tranquilas. Escucha. Relájate. Disfruta.", "que_hacer_en": "Find a place with calm melodies. Listen. Relax. Enjoy.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Bar o cafetería con música suave.", "donde_en": "Bar or cafe with calm music.", "gps": "live jazz bar", "vector_necesidades": {"movimiento": 10, "naturaleza": 10, "silencio": 10, "agua": 0, "sol": 10, "sombra": 90, "aire_fresco": 50, "creatividad": 90, "comunidad": 70, "aprendizaje": 20, "juego": 20, "contemplacion": 90, "descanso": 80, "organizacion": 10, "alimentacion": 50, "musica": 100, "risa": 40, "esperanza": 85} }, {"id": 130, "titulo": "Piscina Pública", "titulo_en": "Public Pool", "porque": "Cuerpo tenso, mente agitada. El líquido relaja y el movimiento controlado calma. Flota tus preocupaciones.", "porque_en": "Tense body, agitated mind. Liquid relaxes, controlled movement calms. Float your worries away.", "que_hacer": "Visita una alberca municipal. Date un chapuzón. Descansa en el agua.", "que_hacer_en": "Visit a municipal pool. Take a dip. Rest in the water.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Piscina municipal o comunitaria.", "donde_en": "Municipal or community pool.", "gps": "public swimming pool", "vector_necesidades": {"movimiento": 90, "naturaleza": 40, "silencio": 50, "agua": 100, "sol": 70, "sombra": 60, "aire_fresco": 80, "creatividad": 30, "comunidad": 70, "aprendizaje": 20, "juego": 80, "contemplacion": 70, "descanso": 90, "organizacion": 20, "alimentacion": 10, "musica": 40, "risa": 60, "esperanza": 85} }, {"id": 241, "titulo": "Distracción Absoluta", "titulo_en": "Absolute Distraction", "porque": "Ansiedad cíclica y rumiación mental masiva. Necesitas un shock de diversión y risas para apagar el pánico.", "porque_en": "Cyclic anxiety and massive mental rumination. You need a shock of fun and laughter to quiet panic.", "que_hacer": "Ve al parque de atracciones o centro familiar. Observa colores. Conecta con el juego inocente de la infancia.", "que_hacer_en": "Head to the amusement park or family center. Observe colors. Connect with the innocent play of childhood.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Parque recreativo, zona infantil o centro de juegos local.", "donde_en": "Recreation park, kid zone, or local arcade center.", "gps": "amusement park or arcade", "vector_necesidades": {"juego": 100, "risa": 100, "comunidad": 80, "movimiento": 70, "esperanza": 90, "silencio": 20, "descanso": 50} },
+    def _asignar(self, **campos):
+        for nombre, valor in campos.items():
+            object.__setattr__(self, nombre, valor)
 
-            {"id": 242, "titulo": "Estrategia de Alivio", "titulo_en": "Relief Strategy", "porque": "Sensación de asfixia debido al encierro de la rutina laboral.", "porque_en": "Feeling of suffocation due to work routine confinement.", "que_hacer": "Si estás cerca de una central de transportes, camina por el pasillo principal. Despega la mirada de la pantalla. Observa a los viajeros partir. Asimila que la Tierra es inmensa y tu problema transitorio.", "que_hacer_en": "If near a transit hub, walk through the main hall. Take your eyes off the screen. Watch travelers depart. Realize the Earth is huge and your issue is transient.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Vestíbulo público de aeropuerto o central de transportes.", "donde_en": "Public airport lobby or transit center.", "gps": "transit center or airport terminal", "vector_necesidades": {"contemplacion": 100, "aire_fresco": 90, "esperanza": 95, "descanso": 70, "silencio": 50, "movimiento": 30} }, {"id": 243, "titulo": "Aislamiento Conciencial", "titulo_en": "Conscious Isolation", "porque": "Inquietud social aguda y ruido mental por sobrecarga de responsabilidades.", "porque_en": "Acute social uneasiness and mental noise from responsibilities overload.", "que_hacer": "Visita la sala común de un hospedaje local de forma gratuita. Siéntate en una butaca cómoda. Cierra los ojos. Respira a un ritmo lento. Habita tu cuerpo con presencia absoluta.", "que_hacer_en": "Visit the common room of a local lodging for free. Sit in a comfortable armchair. Close your eyes. Breathe at a slow pace. Inhabit your body with absolute presence.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Zona de descanso o jardín de un hotel de USA.", "donde_en": "Lounge or garden of a USA hotel.", "gps": "boutique hotel lobby", "vector_necesidades": {"descanso": 100, "silencio": 90, "contemplacion": 95, "organizacion": 80, "salud": 85, "esperanza": 85} }, {"id": 244, "titulo": "Soberanía de Cabina", "titulo_en": "Cabin Sovereignty", "porque": "Pánico y desconexión corporal debido a la saturación ruidosa de los perímetros urbanos.", "porque_en": "Panic and bodily disconnection due to noisy urban perimeter saturation.", "que_hacer": "Ve a la terminal de vuelos. Busca un ventanal amplio con vista al cielo. Vacía el aire de tus pulmones tres veces profundamente. Siéntete libre.", "que_hacer_en": "Head to the flight terminal. Find a wide sky-view window. Empty the air from your lungs deeply three times. Feel free.", "cuando": WHEN_ES, "cuando_en": WHEN_EN, "para_que": FOR_WHAT_ES, "para_que_en": FOR_WHAT_EN, "donde": "Terminal de aeropuerto, central de tránsito o zona de observación abierta.", "donde_en": "Airport terminal, transit hub, or open observation zone.", "gps": "airport terminal or transit hub", "vector_necesidades": {"aire_fresco": 95, "contemplacion": 100, "esperanza": 90, "descanso": 70, "silencio": 60, "movimiento": 30} } ] } }
+class TextosMision(RegistroInmutable):
+    """Textos de una misión SALIR en un idioma."""
+    __slots__ = CAMPOS_BILINGUES_SALIR
+
+    def __init__(self, **textos):
+        self._asignar(**{campo: sys.intern(textos[campo]) for campo in CAMPOS_BILINGUES_SALIR})
+
+class MisionCasa(RegistroInmutable):
+    __slots__ = ("id", "titulo", "descripcion", "vector_necesidades")
+
+    def __init__(self, datos):
+        self._asignar(
+            id=datos["id"],
+            titulo=sys.intern(datos["titulo"]),
+            descripcion=sys.intern(datos["descripcion"]),
+            vector_necesidades=MappingProxyType(dict(datos["vector_necesidades"])),
+        )
+
+    def a_json(self):
+        return {
+            "id": self.id,
+            "titulo": self.titulo,
+            "descripcion": self.descripcion,
+            "vector_necesidades": dict(self.vector_necesidades),
+        }
+
+class MisionSalir(RegistroInmutable):
+    __slots__ = ("id", "mentes", "gps", "vector_necesidades", "textos_es", "textos_en")
+
+    def __init__(self, datos, mentes):
+        self._asignar(
+            id=datos["id"],
+            mentes=mentes,
+            gps=sys.intern(datos["gps"]),
+            vector_necesidades=MappingProxyType(dict(datos["vector_necesidades"])),
+            textos_es=TextosMision(**{campo: datos[campo] for campo in CAMPOS_BILINGUES_SALIR}),
+            textos_en=TextosMision(**{campo: datos[f"{campo}_en"] for campo in CAMPOS_BILINGUES_SALIR}),
+        )
+
+    def textos(self, lang):
+        return self.textos_en if lang == "en" else self.textos_es
+
+def _texto_valido(valor):
+    return isinstance(valor, str) and valor.strip() != ""
+
+def validar_mision(mision, campos_texto, ubicacion):
+    errores = []
+    if not isinstance(mision, dict):
+        return [f"{ubicacion}: la misión no es un objeto"]
+    if not isinstance(mision.get("id"), int) or isinstance(mision.get("id"), bool):
+        errores.append(f"{ubicacion}: 'id' ausente o no entero")
+    for campo in campos_texto:
+        if not _texto_valido(mision.get(campo)):
+            errores.append(f"{ubicacion} (id {mision.get('id')}): campo '{campo}' ausente o vacío")
+    vector = mision.get("vector_necesidades")
+    if not isinstance(vector, dict) or not vector:
+        errores.append(f"{ubicacion} (id {mision.get('id')}): 'vector_necesidades' ausente o vacío")
+        return errores
+    for necesidad, valor in vector.items():
+        if necesidad not in NECESIDADES_CONOCIDAS:
+            errores.append(f"{ubicacion} (id {mision.get('id')}): necesidad desconocida '{necesidad}'")
+        if not isinstance(valor, (int, float)) or isinstance(valor, bool) or not 0 <= valor <= 100:
+            errores.append(f"{ubicacion} (id {mision.get('id')}): valor fuera de rango en '{necesidad}'")
+    return errores
+
+def validar_ids_unicos(misiones, ubicacion):
+    vistos, errores = set(), []
+    for mision in misiones:
+        mision_id = mision.get("id") if isinstance(mision, dict) else None
+        if mision_id in vistos:
+            errores.append(f"{ubicacion}: id {mision_id} repetido")
+        vistos.add(mision_id)
+    return errores
+
+CLAVES_CASA = ("CASA_ES", "CASA_EN")
+CAMPOS_SALIR = ("gps", *CAMPOS_BILINGUES_SALIR, *(f"{campo}_en" for campo in CAMPOS_BILINGUES_SALIR))
+
+def validar_particion(clave, misiones):
+    """Devuelve la lista de errores de una partición (vacía si es válida)."""
+    if not isinstance(misiones, (list, tuple)) or not misiones:
+        return [f"{clave}: lista ausente o vacía"]
+    campos = CAMPOS_CASA if clave in CLAVES_CASA else CAMPOS_SALIR
+    errores = []
+    for posicion, mision in enumerate(misiones):
+        errores += validar_mision(mision, campos, f"{clave}[{posicion}]")
+    return errores + validar_ids_unicos(misiones, clave)
+
+def validar_catalogo(particiones):
+    """Valida todas las particiones ({clave: [misiones]}) y las reglas entre ellas."""
+    errores = []
+    for clave in (*CLAVES_CASA, "SALIR/aburrido"):
+        if clave not in particiones:
+            errores.append(f"{clave}: partición obligatoria ausente")
+    for clave, misiones in particiones.items():
+        if clave not in CLAVES_CASA and not clave.startswith("SALIR/"):
+            errores.append(f"{clave}: partición desconocida")
+            continue
+        errores += validar_particion(clave, misiones)
+    if not errores:
+        ids_es = {m["id"] for m in particiones["CASA_ES"]}
+        ids_en = {m["id"] for m in particiones["CASA_EN"]}
+        for mision_id in sorted(ids_es ^ ids_en):
+            errores.append(f"CASA: id {mision_id} no existe en ambos idiomas")
+        errores += validar_repetidas_salir({clave: misiones for clave, misiones in particiones.items() if clave.startswith("SALIR/")})
+    return errores
+
+def validar_repetidas_salir(particiones_salir):
+    """Una misión puede estar en varios ánimos, pero con los mismos datos en todos (se guarda una sola vez)."""
+    errores = []
+    primeras = {}
+    for clave, misiones in particiones_salir.items():
+        for mision in misiones:
+            clave_previa, previa = primeras.setdefault(mision["id"], (clave, mision))
+            if previa is not mision and previa != mision:
+                errores.append(f"{clave}: la misión {mision['id']} difiere de la de {clave_previa}")
+    if len(particiones_salir) > MAX_MENTES:
+        errores.append(f"SALIR: como máximo {MAX_MENTES} ánimos (hay {len(particiones_salir)})")
+    return errores
+
+def error_catalogo(errores):
+    return CatalogoInvalido("Catálogo de misiones inválido:\n  - " + "\n  - ".join(errores))
+
+def escribir_catalogo_jsonl(particiones, ruta):
+    """Escribe {clave: [misiones]} en el formato de data/catalogo_misiones.jsonl."""
+    errores = validar_catalogo(particiones)
+    if errores:
+        raise error_catalogo(errores)
+    # Archivo temporal + os.replace: el vigilante de cada worker nunca lee una escritura a medias
+    temporal = f"{ruta}.tmp"
+    with open(temporal, "w", encoding="utf-8") as archivo:
+        for clave, misiones in particiones.items():
+            archivo.write(json.dumps({"particion": clave}, ensure_ascii=False) + "\n")
+            for mision in misiones:
+                archivo.write(json.dumps(mision, ensure_ascii=False) + "\n")
+    os.replace(temporal, ruta)
+
+class ArchivoCatalogo:
+    """
+    Catálogo JSON-lines leído de una vez a memoria propia del proceso.
+    Al abrir solo se localizan las cabeceras de partición; las misiones de una
+    partición se decodifican cuando se piden. CatalogoCompilado libera los
+    bytes (cerrar) en cuanto ha compilado todas las particiones.
+
+    No se mapea el archivo: con recarga en caliente, reescribirlo en el sitio
+    truncaría las páginas mapeadas y el worker moriría con SIGBUS al decodificar
+    una partición pendiente. Aun así, las publicaciones deben escribir a un
+    temporal y renombrar con os.replace (escribir_catalogo_jsonl lo hace); una
+    escritura en el sitio puede leerse a medias, no validar y quedar para el
+    siguiente ciclo del vigilante.
+    """
+    MARCA_PARTICION = b'{"particion"'
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        with open(ruta, "rb") as archivo:
+            self._contenido = archivo.read()
+        if not self._contenido:
+            raise error_catalogo([f"{ruta}: archivo vacío"])
+        self.version = hashlib.sha256(self._contenido).hexdigest()[:12] # Versión = hash del contenido
+        self.particiones = self._indexar()
+
+    def _indexar(self):
+        """{clave: (inicio, fin)} con los bytes de las misiones de cada partición."""
+        contenido = self._contenido
+        cabeceras = []
+        posicion = contenido.find(self.MARCA_PARTICION)
+        while posicion != -1:
+            if posicion == 0 or contenido[posicion - 1:posicion] == b"\n":
+                fin_linea = contenido.find(b"\n", posicion)
+                fin_linea = len(contenido) if fin_linea == -1 else fin_linea
+                clave = json.loads(contenido[posicion:fin_linea])["particion"]
+                cabeceras.append((clave, posicion, fin_linea + 1))
+            posicion = contenido.find(self.MARCA_PARTICION, posicion + 1)
+        if not cabeceras or cabeceras[0][1] != 0:
+            raise error_catalogo([f"{self.ruta}: el archivo debe empezar con una cabecera de partición"])
+        particiones = {}
+        for indice, (clave, _, inicio) in enumerate(cabeceras):
+            fin = cabeceras[indice + 1][1] if indice + 1 < len(cabeceras) else len(contenido)
+            if clave in particiones:
+                raise error_catalogo([f"{clave}: partición repetida en {self.ruta}"])
+            particiones[clave] = (inicio, fin)
+        return particiones
+
+    def leer(self, clave):
+        if self._contenido is None:
+            raise RuntimeError(f"{self.ruta}: contenido ya liberado, todas las particiones están compiladas")
+        inicio, fin = self.particiones[clave]
+        return [json.loads(linea) for linea in self._contenido[inicio:fin].splitlines() if linea.strip()]
+
+    @property
+    def cerrado(self):
+        return self._contenido is None
+
+    def cerrar(self):
+        self._contenido = None
+
+# Recomendación por defecto (perfil neutro, sin historial) de cada
+# partición: se puntúa una sola vez al compilarla (en una recarga, en
+# el hilo del vigilante) y, cuando vence el plazo de una selección, en
+# el event loop solo se filtra por ánimo (ver EJECUCIÓN DE LA SELECCIÓN
+# FUERA DEL EVENT LOOP).
+MISIONES_POR_DEFECTO = 3
+
+def mejores_por_defecto(misiones, scores, filas=None):
+    """Las MISIONES_POR_DEFECTO misiones de mayor score; `filas` son las filas de `scores` si no es toda la lista."""
+    filas = range(len(misiones)) if filas is None else filas
+    mejores = heapq.nlargest(MISIONES_POR_DEFECTO, range(len(scores)), key=scores.__getitem__)
+    return tuple(misiones[filas[posicion]] for posicion in mejores)
+
+class ParticionCatalogo:
+    """Misiones compiladas de una partición, con su índice por id, su matriz de scoring y su recomendación por defecto."""
+    __slots__ = ("clave", "misiones", "por_id", "matriz", "por_defecto")
+
+    def __init__(self, clave, misiones):
+        self.clave = clave
+        self.misiones = misiones
+        self.por_id = {mision.id: mision for mision in misiones}
+        self.matriz = registrar_matriz(misiones)
+        self.por_defecto = mejores_por_defecto(misiones, self.matriz.puntuar(DEFAULT_NECESSITY_VECTOR, []))
+
+# ============================================================
+# TABLA UNIFICADA DE MISIONES SALIR
+# Todas las particiones SALIR/<mente> se compilan juntas en una sola
+# tabla sin repetidos (una misión presente en varios ánimos se guarda
+# una vez) con un bitmap por misión de los ánimos a los que pertenece,
+# y una única MatrizMisiones. Una consulta de ánimo se resuelve con una
+# máscara sobre ese bitmap; "cansado+ansioso" o "cansado:0.7+ansioso:0.3"
+# mezcla varios ánimos ponderando el score de cada misión con la suma de
+# los pesos (normalizados) de sus ánimos. Ánimos desconocidos se ignoran;
+# si no queda ninguno se usa "aburrido", como siempre.
+# ============================================================
+MAX_MENTES = 64 # bits del bitmap (uint64)
+SEPARADOR_MENTES = "+"
+
+class FiltroMentes:
+    """Misiones de una consulta de ánimo: filas de la tabla y, si se mezclan varios, sus pesos."""
+    __slots__ = ("tabla", "mascara", "filas", "pesos")
+
+    def __init__(self, tabla, mascara, filas, pesos=None):
+        self.tabla = tabla
+        self.mascara = mascara
+        self.filas = filas
+        self.pesos = pesos # ((bit, peso normalizado), ...) o None con un solo ánimo
+
+    def pesos_filas(self, filas):
+        """Peso de cada fila: suma de los pesos de los ánimos de la consulta a los que pertenece."""
+        mascaras = self.tabla.mascaras[filas]
+        pesos = np.zeros(len(filas))
+        for bit, peso in self.pesos:
+            pesos += peso * ((mascaras & np.uint64(bit)) != 0)
+        return pesos
+
+class TablaSalir:
+    """Misiones SALIR únicas + bitmap de ánimos por misión (bit i = self.mentes[i])."""
+
+    def __init__(self, particiones):
+        # particiones: {mente: [datos de misión]} en el orden del archivo
+        self.mentes = tuple(particiones)
+        self.bits = {mente: 1 << posicion for posicion, mente in enumerate(self.mentes)}
+        primeras, mascaras = {}, {}
+        for mente, misiones in particiones.items():
+            for datos in misiones:
+                primeras.setdefault(datos["id"], datos)
+                mascaras[datos["id"]] = mascaras.get(datos["id"], 0) | self.bits[mente]
+        self.misiones = tuple(
+            MisionSalir(datos, tuple(m for m in self.mentes if mascaras[mision_id] & self.bits[m]))
+            for mision_id, datos in primeras.items()
+        )
+        self.por_id = {mision.id: mision for mision in self.misiones}
+        self.mascaras = np.array([mascaras[mision.id] for mision in self.misiones], dtype=np.uint64)
+        self.matriz = registrar_matriz(self.misiones)
+        self._filas = {} # máscara -> filas; como mucho 2 ** len(self.mentes) entradas
+        self._listas = {} # mente -> (misiones, matriz) para misiones_de
+        self.scores_por_defecto = self.matriz.puntuar(DEFAULT_NECESSITY_VECTOR, [])
+        self._por_defecto = {} # máscara de un solo ánimo -> recomendación por defecto
+        for mente in self.mentes:
+            bit = self.bits[mente]
+            self._por_defecto[bit] = self.por_defecto(FiltroMentes(self, bit, self.filas(bit)))
+
+    def filas(self, mascara):
+        """Filas (ordenadas) de las misiones que pertenecen a alguno de los ánimos de la máscara."""
+        filas = self._filas.get(mascara)
+        if filas is None:
+            filas = np.flatnonzero(self.mascaras & np.uint64(mascara))
+            self._filas[mascara] = filas
+        return filas
+
+    def filtro(self, consulta):
+        """FiltroMentes de una consulta: "cansado", "cansado+ansioso" o "cansado:0.7+ansioso:0.3"."""
+        pesos = {}
+        for parte in consulta.split(SEPARADOR_MENTES):
+            mente, _, peso = parte.strip().partition(":")
+            try:
+                peso = float(peso) if peso else 1.0
+            except ValueError:
+                continue
+            if mente in self.bits and math.isfinite(peso) and peso > 0:
+                pesos[mente] = pesos.get(mente, 0) + peso
+        if not pesos:
+            pesos = {"aburrido": 1.0}
+        mascara = 0
+        for mente in pesos:
+            mascara |= self.bits[mente]
+        if len(pesos) == 1:
+            return FiltroMentes(self, mascara, self.filas(mascara))
+        total = sum(pesos.values())
+        return FiltroMentes(
+            self, mascara, self.filas(mascara), tuple((self.bits[mente], peso / total) for mente, peso in pesos.items())
+        )
 
+    def por_defecto(self, filtro):
+        """Recomendación por defecto de una consulta: filtra (y pondera) los scores del perfil neutro ya calculados."""
+        if filtro.pesos is None and filtro.mascara in self._por_defecto:
+            return self._por_defecto[filtro.mascara]
+        filas = filtro.filas.tolist()
+        scores = [self.scores_por_defecto[fila] for fila in filas]
+        if filtro.pesos is not None: # Mezcla de ánimos, como en puntuar_candidatos
+            pesos = filtro.pesos_filas(filtro.filas).tolist()
+            scores = [round(score * peso, 2) for score, peso in zip(scores, pesos)]
+        return mejores_por_defecto(self.misiones, scores, filas)
+
+    def misiones_de(self, mente):
+        """Tupla con las misiones de un ánimo (comparte los objetos de la tabla) y su matriz registrada."""
+        lista = self._listas.get(mente)
+        if lista is None:
+            misiones = tuple(self.misiones[fila] for fila in self.filas(self.bits[mente]).tolist())
+            lista = (misiones, registrar_matriz(misiones))
+            self._listas[mente] = lista
+        return lista[0]
+
+class CatalogoCompilado:
+    """Catálogo con carga perezosa por partición (idioma de CASA o ánimo de SALIR)."""
+
+    def __init__(self, archivo):
+        self.archivo = archivo
+        self.version = archivo.version
+        faltantes = [clave for clave in (*CLAVES_CASA, "SALIR/aburrido") if clave not in archivo.particiones]
+        if faltantes:
+            raise error_catalogo([f"{clave}: partición obligatoria ausente" for clave in faltantes])
+        self.mentes = tuple(clave[len("SALIR/"):] for clave in archivo.particiones if clave.startswith("SALIR/"))
+        self._particiones = {}
+        self._tabla_salir = None
+        self._lock = threading.Lock()
+
+    def particion(self, clave):
+        particion = self._particiones.get(clave)
+        if particion is None:
+            with self._lock:
+                particion = self._particiones.get(clave)
+                if particion is None:
+                    particion = self._compilar(clave)
+                    self._particiones[clave] = particion
+                    self._liberar_si_completo()
+        return particion
+
+    def _liberar_si_completo(self):
+        """Suelta los bytes del archivo cuando ya no queda ninguna partición por decodificar."""
+        if self._tabla_salir is not None and all(clave in self._particiones for clave in CLAVES_CASA):
+            self.archivo.cerrar()
+
+    def _compilar(self, clave):
+        if clave not in CLAVES_CASA:
+            raise KeyError(f"{clave}: las misiones SALIR están en tabla_salir()")
+        datos = self.archivo.leer(clave)
+        errores = validar_particion(clave, datos)
+        if errores:
+            raise error_catalogo(errores)
+        return ParticionCatalogo(clave, tuple(MisionCasa(mision) for mision in datos))
+
+    def tabla_salir(self):
+        """TablaSalir con todas las particiones SALIR (se compila entera la primera vez)."""
+        if self._tabla_salir is None:
+            with self._lock:
+                if self._tabla_salir is None:
+                    particiones = {f"SALIR/{mente}": self.archivo.leer(f"SALIR/{mente}") for mente in self.mentes}
+                    errores = []
+                    for clave, datos in particiones.items():
+                        errores += validar_particion(clave, datos)
+                    errores += validar_repetidas_salir(particiones)
+                    if errores:
+                        raise error_catalogo(errores)
+                    self._tabla_salir = TablaSalir({clave[len("SALIR/"):]: datos for clave, datos in particiones.items()})
+                    self._liberar_si_completo()
+        return self._tabla_salir
+
+    def misiones_casa(self, idioma):
+        return self.particion(f"CASA_{idioma}").misiones
+
+    def misiones_salir(self, mente):
+        """Misiones de un solo ánimo (el endpoint consulta la tabla con filtro_salir)."""
+        if mente not in self.mentes:
+            mente = "aburrido"
+        return self.tabla_salir().misiones_de(mente)
+
+    def filtro_salir(self, consulta):
+        return self.tabla_salir().filtro(consulta)
+
+    def salir_por_id(self):
+        """Índice {id: MisionSalir} de todas las misiones SALIR."""
+        return self.tabla_salir().por_id
+
+    def precargar(self):
+        """Decodifica y valida todas las particiones, incluidas las reglas entre particiones."""
+        if not self.archivo.cerrado: # Cerrado: ya se compilaron (y validaron) todas al pedirlas
+            errores = validar_catalogo({clave: self.archivo.leer(clave) for clave in self.archivo.particiones})
+            if errores:
+                raise error_catalogo(errores)
+        matrices = [self.particion(clave).matriz for clave in CLAVES_CASA] + [self.tabla_salir().matriz]
+        for matriz in matrices:
+            if limite_recuperacion(len(matriz.misiones)):
+                matriz.indice_recuperacion()
+        return self
 
 BIG_TECH_RESOURCES = {
     "spotify_audio_es": "https://open.spotify.com/genre/mood/relax-stress-relief",
@@ -351,13 +783,26 @@ BIG_TECH_RESOURCES = {
 # CWRE V2
 # SCORE INTELIGENTE (REFINADO)
 # ============================================================
+# Pesos del bonus por ansiedad (necesidad, peso), en el orden en que se suman.
+PESOS_ANSIEDAD_ALTA = (
+    ("silencio", 0.5),
+    ("descanso", 0.5),
+    ("esperanza", 0.4),
+    ("naturaleza", 0.3),
+    ("agua", 0.3),
+)
+PESOS_ANSIEDAD_MEDIA = (
+    ("descanso", 0.2),
+    ("silencio", 0.2),
+)
+
 def score_coincidencia(
     perfil_local,
     vector_necesidades,
     historial=None,
     mission_id=None
 ):
-    historial = historial or []
+    historial = IndiceHistorial.de(historial)
     score = 0
     # --------------------------------------------------
     # Coincidencia principal: Cuanto más cerca esté la necesidad
@@ -388,14 +833,11 @@ def score_coincidencia(
     # --------------------------------------------------
     ansiedad = perfil_local.get("indicador_ansiedad", 0)
     if ansiedad >= 70: # Nivel alto de ansiedad
-        score += vector_necesidades.get("silencio", 0) * 0.5
-        score += vector_necesidades.get("descanso", 0) * 0.5
-        score += vector_necesidades.get("esperanza", 0) * 0.4
-        score += vector_necesidades.get("naturaleza", 0) * 0.3
-        score += vector_necesidades.get("agua", 0) * 0.3
+        for necesidad, peso in PESOS_ANSIEDAD_ALTA:
+            score += vector_necesidades.get(necesidad, 0) * peso
     elif ansiedad >= 40: # Nivel medio de ansiedad
-        score += vector_necesidades.get("descanso", 0) * 0.2
-        score += vector_necesidades.get("silencio", 0) * 0.2
+        for necesidad, peso in PESOS_ANSIEDAD_MEDIA:
+            score += vector_necesidades.get(necesidad, 0) * peso
    
     # --------------------------------------------------
     # Penalización por repetición histórica y bonus por exploración
@@ -406,42 +848,346 @@ def score_coincidencia(
    
     return round(max(0, score), 2)
 
+# ============================================================
+# CWRE V3
+# MOTOR DE SCORING VECTORIZADO (NumPy)
+# Cada partición del catálogo se empaqueta al compilarse en una
+# matriz densa misión x necesidad; un perfil puntúa todo el
+# catálogo en una sola pasada con el mismo resultado que
+# score_coincidencia.
+# ============================================================
+NECESIDADES_SCORING = [k for k in DEFAULT_NECESSITY_VECTOR if k != "indicador_ansiedad"]
+# Tope de elementos (perfiles x misiones x necesidades) del temporal de puntuar_lote: se puntúa por bloques de perfiles
+MAX_ELEMENTOS_BLOQUE_SCORING = int(os.environ.get("OTG_SCORING_MAX_ELEMENTOS", 1 << 21))
+
+class MatrizMisiones:
+    """Lista de misiones compilada a matrices densas para puntuarla en bloque."""
+
+    def __init__(self, misiones):
+        self.misiones = misiones
+        self.ids = [m.id for m in misiones]
+        self.filas_por_id = {}
+        for fila, mision_id in enumerate(self.ids):
+            self.filas_por_id.setdefault(mision_id, []).append(fila)
+
+        vectores = [m.vector_necesidades for m in misiones]
+        # Columnas: las necesidades oficiales y, después, cualquier clave extra del catálogo (p. ej. "salud")
+        columnas = list(NECESIDADES_SCORING)
+        for vector in vectores:
+            for necesidad in vector:
+                if necesidad != "indicador_ansiedad" and necesidad not in columnas:
+                    columnas.append(necesidad)
+        self.columnas = columnas
+        indice = {necesidad: i for i, necesidad in enumerate(columnas)}
+
+        self.objetivos = np.zeros((len(misiones), len(columnas)))
+        self.presentes = np.zeros((len(misiones), len(columnas)), dtype=bool)
+        for fila, vector in enumerate(vectores):
+            for necesidad, objetivo in vector.items():
+                if necesidad == "indicador_ansiedad":
+                    continue
+                self.objetivos[fila, indice[necesidad]] = objetivo
+                self.presentes[fila, indice[necesidad]] = True
+
+        # Las claves ausentes de la misión cuentan como 0 en los bonus (vector_necesidades.get(necesidad, 0))
+        self.altos_70 = (self.objetivos > 70).astype(float)
+        self.altos_50 = (self.objetivos > 50).astype(float)
+        self.bonus_ansiedad_alta = self._bonus_ansiedad(PESOS_ANSIEDAD_ALTA, indice)
+        self.bonus_ansiedad_media = self._bonus_ansiedad(PESOS_ANSIEDAD_MEDIA, indice)
+
+        # Diversidad: mismos valores por defecto que diversidad_vector. Los selectores solo comparan cada
+        # candidata con las pocas ya elegidas, así que las distancias se calculan al vuelo (k x k, no n x n)
+        self.vectores_diversidad = np.array(
+            [[vector.get(k, DEFAULT_NECESSITY_VECTOR.get(k, 50)) for k in NECESIDADES_SCORING] for vector in vectores],
+            dtype=float
+        ).reshape(len(misiones), len(NECESIDADES_SCORING))
+        self._indice_recuperacion = None
+
+    def _bonus_ansiedad(self, pesos, indice):
+        bonus = np.zeros(len(self.misiones))
+        for necesidad, peso in pesos:
+            if necesidad in indice:
+                bonus += self.objetivos[:, indice[necesidad]] * peso
+        return bonus
+
+    def distancias_a(self, fila, filas):
+        """Distancias L1 de una fila a cada una de `filas`; equivalen a diversidad_vector sobre sus vectores."""
+        return np.abs(self.vectores_diversidad[filas] - self.vectores_diversidad[fila]).sum(axis=1)
+
+    def es_diversa(self, fila, filas, umbral):
+        """True si la fila está a distancia >= umbral de todas las de `filas` (las ya elegidas)."""
+        return not filas or bool((self.distancias_a(fila, filas) >= umbral).all())
+
+    def indice_recuperacion(self):
+        """Índice de la etapa de recuperación, construido la primera vez que se necesita."""
+        if self._indice_recuperacion is None:
+            self._indice_recuperacion = IndiceRecuperacion(self, UMBRAL_NECESIDAD_DOMINANTE)
+        return self._indice_recuperacion
+
+    def ajustes_historial(self, historial):
+        """Penalización por repetición + bonus de exploración para cada fila."""
+        ajustes = np.full(len(self.misiones), 20.0) # bonus_exploracion de una misión nunca vista
+        indice = IndiceHistorial.de(historial)
+        for mision_id in indice.recencia:
+            filas = self.filas_por_id.get(mision_id)
+            if filas:
+                ajustes[filas] = indice.bonus(mision_id) - indice.penalizacion(mision_id)
+        return ajustes
+
+    def puntuar(self, perfil_local, historial=None, filas=None):
+        """Devuelve el score de cada misión (mismo orden que self.misiones, o que `filas` si se indican)."""
+        return self.puntuar_lote([perfil_local], [historial], filas)[0]
+
+    def puntuar_lote(self, perfiles, historiales=None, filas=None):
+        """
+        Puntúa varios perfiles a la vez: una fila de scores por perfil (matriz perfil x misión).
+        Con `filas` (índices ordenados) solo se puntúan esas misiones, en ese orden.
+        """
+        historiales = [IndiceHistorial.de(h) for h in (historiales or [None] * len(perfiles))]
+        if not self.misiones:
+            return [[] for _ in perfiles]
+        por_bloque = max(1, MAX_ELEMENTOS_BLOQUE_SCORING // ((len(self.misiones) if filas is None else len(filas)) * len(self.columnas) or 1))
+        if len(perfiles) > por_bloque: # Memoria acotada con lotes grandes: cada bloque reserva como mucho el tope
+            scores = []
+            for inicio in range(0, len(perfiles), por_bloque):
+                scores += self.puntuar_lote(perfiles[inicio:inicio + por_bloque], historiales[inicio:inicio + por_bloque], filas)
+            return scores
+        if filas is None:
+            objetivos, presentes, altos_70, altos_50 = self.objetivos, self.presentes, self.altos_70, self.altos_50
+            bonus_alta, bonus_media = self.bonus_ansiedad_alta, self.bonus_ansiedad_media
+        else:
+            objetivos, presentes, altos_70, altos_50 = self.objetivos[filas], self.presentes[filas], self.altos_70[filas], self.altos_50[filas]
+            bonus_alta, bonus_media = self.bonus_ansiedad_alta[filas], self.bonus_ansiedad_media[filas]
+        usuarios = np.array(
+            [[perfil.get(k, DEFAULT_NECESSITY_VECTOR.get(k, 50)) for k in self.columnas] for perfil in perfiles],
+            dtype=float
+        ).reshape(len(perfiles), len(self.columnas))
+        en_perfil = np.array(
+            [[k in perfil for k in self.columnas] for perfil in perfiles],
+            dtype=bool
+        ).reshape(usuarios.shape)
+
+        # Coincidencia principal: solo las necesidades declaradas por cada misión (un único temporal, operado en su sitio)
+        coincidencias = usuarios[:, None, :] - objetivos[None, :, :]
+        np.abs(coincidencias, out=coincidencias)
+        np.subtract(100, coincidencias, out=coincidencias)
+        coincidencias *= 0.5
+        coincidencias *= presentes
+        base = coincidencias.sum(axis=2)
+        del coincidencias
+
+        # Necesidades insatisfechas: 0.3 si perfil y misión > 70, si no 0.1 si ambos > 50
+        usuario_alto = en_perfil & (usuarios > 70)
+        usuario_medio = en_perfil & (usuarios > 50)
+        bonus = (
+            np.where(usuario_alto, usuarios * 0.3, 0) @ altos_70.T
+            + np.where(usuario_medio, usuarios * 0.1, 0) @ altos_50.T
+            - np.where(usuario_alto, usuarios * 0.1, 0) @ altos_70.T
+        )
+
+        ansiedad = np.array([perfil.get("indicador_ansiedad", 0) for perfil in perfiles], dtype=float)
+        bonus_ansiedad = np.where(
+            (ansiedad >= 70)[:, None],
+            bonus_alta,
+            np.where((ansiedad >= 40)[:, None], bonus_media, 0)
+        )
+        ajustes = np.array([self.ajustes_historial(historial) for historial in historiales])
+        if filas is not None:
+            ajustes = ajustes[:, filas]
+        totales = base + bonus + bonus_ansiedad + ajustes
+
+        scores = [[round(max(0, total), 2) for total in fila] for fila in totales.tolist()]
+
+        # La suma vectorizada puede diferir en el último bit de la escalar; en los
+        # empates exactos de redondeo (x.xx5) se recalcula con score_coincidencia.
+        escalados = np.abs(totales * 100)
+        dudosos = np.argwhere(np.abs(escalados - np.floor(escalados) - 0.5) < 1e-6)
+        for fila_perfil, fila in dudosos.tolist():
+            mision = self.misiones[fila if filas is None else filas[fila]]
+            scores[fila_perfil][fila] = score_coincidencia(
+                perfil_local=perfiles[fila_perfil],
+                vector_necesidades=mision.vector_necesidades,
+                historial=historiales[fila_perfil],
+                mission_id=mision.id
+            )
+        return scores
+
+
+# Matrices de las particiones vivas del catálogo, por identidad de su tupla de misiones
+MATRICES_CATALOGO = weakref.WeakValueDictionary()
+
+def registrar_matriz(misiones):
+    matriz = MatrizMisiones(misiones)
+    MATRICES_CATALOGO[id(misiones)] = matriz
+    return matriz
+
+def matriz_para(misiones):
+    matriz = MATRICES_CATALOGO.get(id(misiones))
+    if matriz is None or matriz.misiones is not misiones:
+        matriz = MatrizMisiones(misiones) # Lista fuera del catálogo: se compila al vuelo
+    return matriz
+
+def puntuar_misiones(misiones, perfil_local, historial=None):
+    return matriz_para(misiones).puntuar(perfil_local, historial)
+
+# ============================================================
+# RECUPERACIÓN DE CANDIDATOS EN DOS ETAPAS
+# En particiones grandes no se puntúa todo. Un índice invertido
+# (necesidad -> misiones cuyo objetivo es >= UMBRAL) acumula, para las
+# necesidades altas del usuario, el bonus que les dará el scoring; se
+# suma el cubo de ansiedad que corresponda (bonus de ansiedad alta o
+# media) y las RECUPERACION_CANDIDATOS mejores forman la lista corta.
+# Solo esa lista pasa por el scoring completo y por los selectores.
+#   OTG_RECUPERACION_CANDIDATOS     tamaño de la lista corta (recall); 0 = siempre todo
+#   OTG_RECUPERACION_MIN_MISIONES   por debajo de este tamaño se puntúa todo
+#   OTG_RECUPERACION_UMBRAL         objetivo mínimo para entrar en el índice de una necesidad
+# Por defecto el catálogo real (decenas de misiones) se sigue puntuando entero.
+# ============================================================
+RECUPERACION_CANDIDATOS = int(os.environ.get("OTG_RECUPERACION_CANDIDATOS", 1000))
+RECUPERACION_MIN_MISIONES = int(os.environ.get("OTG_RECUPERACION_MIN_MISIONES", 5000))
+UMBRAL_NECESIDAD_DOMINANTE = float(os.environ.get("OTG_RECUPERACION_UMBRAL", 70))
+
+class IndiceRecuperacion:
+    """Listas invertidas por necesidad y bonus de ansiedad de una MatrizMisiones."""
+
+    def __init__(self, matriz, umbral):
+        self.total = len(matriz.misiones)
+        self.columnas = matriz.columnas
+        # Necesidad -> filas cuyo objetivo supera el umbral (las que reciben el bonus de necesidad alta)
+        self.listas = [np.flatnonzero(matriz.objetivos[:, columna] >= umbral).astype(np.int32) for columna in range(len(matriz.columnas))]
+        self.bonus_ansiedad_alta = matriz.bonus_ansiedad_alta
+        self.bonus_ansiedad_media = matriz.bonus_ansiedad_media
+        # Desempate entre misiones con el mismo acumulado: score para el perfil neutro, en una escala que no cruza puntos
+        neutros = np.asarray(matriz.puntuar(DEFAULT_NECESSITY_VECTOR), dtype=float)
+        self.desempate = neutros / (neutros.max() + 1) * 1e-3 if self.total else neutros
+
+    def recuperar(self, perfil_local, limite, filas=None):
+        """Índices (ordenados) de las `limite` misiones con más bonus acumulado, entre `filas` si se indican."""
+        if limite >= (self.total if filas is None else len(filas)):
+            return np.arange(self.total) if filas is None else filas
+        # Se acumula, lista a lista, el bonus que el scoring dará por las necesidades altas del usuario
+        ansiedad = perfil_local.get("indicador_ansiedad", 0)
+        if ansiedad >= 70:
+            acumulado = self.desempate + self.bonus_ansiedad_alta
+        elif ansiedad >= 40:
+            acumulado = self.desempate + self.bonus_ansiedad_media
+        else:
+            acumulado = self.desempate.copy()
+        for columna, necesidad in enumerate(self.columnas):
+            valor = perfil_local.get(necesidad, DEFAULT_NECESSITY_VECTOR.get(necesidad, 50))
+            if valor > 50:
+                acumulado[self.listas[columna]] += valor * (0.3 if valor > 70 else 0.1)
+        if filas is not None:
+            return filas[np.sort(np.argpartition(-acumulado[filas], limite - 1)[:limite])]
+        return np.sort(np.argpartition(-acumulado, limite - 1)[:limite])
+
+def limite_recuperacion(total):
+    """Tamaño de la lista corta para `total` misiones candidatas (0 = puntuarlas todas)."""
+    if total < RECUPERACION_MIN_MISIONES:
+        return 0
+    return max(0, RECUPERACION_CANDIDATOS)
+
+def puntuar_candidatos(misiones, perfil_local, historial=None, limite=None, filtro=None):
+    """
+    (filas, scores): las filas puntuadas (las del FiltroMentes y, con recuperación,
+    solo su lista corta) y sus scores; (None, scores de todas) si no hay ni filtro
+    ni recuperación. `limite` fuerza el tamaño de la lista corta.
+    """
+    matriz = matriz_para(misiones)
+    filas = None if filtro is None else filtro.filas
+    total = len(misiones) if filas is None else len(filas)
+    limite = limite_recuperacion(total) if limite is None else limite
+    if 0 < limite < total:
+        filas = matriz.indice_recuperacion().recuperar(perfil_local, limite, filas)
+    scores = matriz.puntuar(perfil_local, historial, filas)
+    if filtro is not None and filtro.pesos is not None: # Mezcla de ánimos
+        pesos = filtro.pesos_filas(filas).tolist()
+        scores = [round(score * peso, 2) for score, peso in zip(scores, pesos)]
+    return filas, scores
+
+CATALOGO = CatalogoCompilado(ArchivoCatalogo(RUTA_CATALOGO))
+if PRECARGAR_CATALOGO:
+    CATALOGO.precargar()
+
+# ============================================================
+# TOP-K PARCIAL
+# Los selectores solo consumen los primeros candidatos (o la banda
+# cercana al mejor score): se ordena solo lo que se consume.
+# Empates en el mismo orden que sorted(..., reverse=True).
+# ============================================================
+class RankingParcial:
+    """
+    Candidatos en orden de score descendente, extraídos de un heap a medida que
+    se recorren. Se puede iterar varias veces; solo se ordena el prefijo consumido.
+    """
+
+    def __init__(self, candidatos):
+        # La posición original desempata igual que el sort estable
+        self._heap = [(-c["score"], posicion, c) for posicion, c in enumerate(candidatos)]
+        heapq.heapify(self._heap)
+        self._ordenados = []
+
+    def __len__(self):
+        return len(self._ordenados) + len(self._heap)
+
+    def _extender(self, hasta):
+        while len(self._ordenados) < hasta and self._heap:
+            self._ordenados.append(heapq.heappop(self._heap)[2])
+
+    def __iter__(self):
+        posicion = 0
+        while True:
+            self._extender(posicion + 1)
+            if posicion >= len(self._ordenados):
+                return
+            yield self._ordenados[posicion]
+            posicion += 1
+
+    def top(self, k):
+        self._extender(k)
+        return self._ordenados[:k]
+
+def banda_superior(ranking, fraccion=0.8, margen=150):
+    """(mejor_score, banda): el prefijo del RankingParcial con score >= max(mejor * fraccion, mejor - margen)."""
+    mejor_score = ranking.top(1)[0]["score"]
+    score_umbral = max(mejor_score * fraccion, mejor_score - margen)
+    banda = []
+    for candidato in ranking:
+        if candidato["score"] < score_umbral:
+            break
+        banda.append(candidato)
+    return mejor_score, banda
+
+def top_k_candidatos(ranking, k):
+    """Los k mejores del RankingParcial; equivale a sorted(...)[:k]."""
+    return ranking.top(k)
+
 # ============================================================
 # Selección por Ranking Inteligente
 # ============================================================
-def seleccionar_por_ranking(candidatos):
-    if not candidatos:
-        return None
-   
-    candidatos = sorted(candidatos, key=lambda x: x["score"], reverse=True)
-   
+def seleccionar_por_ranking(candidatos, rng=random):
     if not candidatos:
         return None
 
-    mejor_score = candidatos[0]["score"]
+    # El 80% del mejor o 150 puntos menos que el mejor, sin ordenar todo el catálogo
+    ranking = RankingParcial(candidatos)
+    mejor_score, mejores_candidatos_para_eleccion = banda_superior(ranking)
    
     # Si todos tienen un score bajo, y todos son iguales, elige uno al azar.
     if mejor_score <= 100: # Umbral para considerar que los scores son "bajos"
         scores_unicos = {c["score"] for c in candidatos}
         if len(scores_unicos) == 1:
-            return random.choice(candidatos)
-
-    # Considerar un umbral dinámico para seleccionar entre los mejores
-    score_umbral = max(mejor_score * 0.8, mejor_score - 150) # El 80% del mejor o 150 puntos menos que el mejor
-   
-    mejores_candidatos_para_eleccion = [
-        c for c in candidatos if c["score"] >= score_umbral
-    ]
+            return rng.choice(candidatos) # Con empate total el orden ordenado es el original
    
     if not mejores_candidatos_para_eleccion: # Si el umbral fue demasiado estricto, relaja y toma del top 3
-        mejores_candidatos_para_eleccion = candidatos[:min(3, len(candidatos))]
+        mejores_candidatos_para_eleccion = top_k_candidatos(ranking, 3)
         if not mejores_candidatos_para_eleccion: return None
 
     pesos = [c["score"] for c in mejores_candidatos_para_eleccion]
     # Asegúrate de que ningún peso sea cero o negativo para random.choices
     pesos = [max(1, p) for p in pesos]
 
-    return random.choices(mejores_candidatos_para_eleccion, weights=pesos, k=1)[0]
+    return rng.choices(mejores_candidatos_para_eleccion, weights=pesos, k=1)[0]
 
 
 # ============================================================
@@ -451,26 +1197,22 @@ def seleccionar_por_ranking(candidatos):
 def seleccionar_mision_inteligente(
     misiones,
     perfil_local,
-    historial=None
+    historial=None,
+    scores=None,
+    rng=random,
+    filas=None
 ):
     historial = historial or []
-    candidatos = []
-    for mision in misiones:
-        mission_vector = mision.get("vector_necesidades", DEFAULT_NECESSITY_VECTOR)
-       
-        score = score_coincidencia(
-            perfil_local=perfil_local,
-            vector_necesidades=mission_vector,
-            historial=historial,
-            mission_id=mision["id"]
-        )
-        candidatos.append({
-            "mision": mision,
-            "score": score
-        })
-    seleccion = seleccionar_por_ranking(candidatos)
+    if scores is None:
+        scores = matriz_para(misiones).puntuar(perfil_local, historial, filas)
+    filas = range(len(misiones)) if filas is None else filas.tolist()
+    candidatos = [
+        {"mision": misiones[fila], "score": score}
+        for fila, score in zip(filas, scores)
+    ]
+    seleccion = seleccionar_por_ranking(candidatos, rng)
     if seleccion is None:
-        return random.choice(misiones) if misiones else None
+        return rng.choice(misiones) if misiones else None
     return seleccion["mision"]
 
 # ============================================================
@@ -481,74 +1223,76 @@ def seleccionar_n_misiones_inteligentes(
     n,
     misiones,
     perfil_local,
-    historial_actual=None
+    historial_actual=None,
+    scores=None,
+    rng=random,
+    filas=None
 ):
-    historial_actual = historial_actual or []
-    candidatos_base = []
-    for mision in misiones:
-        mission_vector = mision.get("vector_necesidades", DEFAULT_NECESSITY_VECTOR)
-        score = score_coincidencia(
-            perfil_local=perfil_local,
-            vector_necesidades=mission_vector,
-            historial=historial_actual,
-            mission_id=mision["id"]
-        )
-        candidatos_base.append({
-            "mision": mision,
-            "score": score
-        })
+    historial_actual = IndiceHistorial.de(historial_actual)
+    matriz = matriz_para(misiones)
+    if scores is None: # Scores ya calculados en bloque (p. ej. por el endpoint de lote)
+        scores = matriz.puntuar(perfil_local, historial_actual, filas)
+    ranking, filas = ranking_candidatos(misiones, scores, filas)
+    return elegir_n_diversas(n, misiones, matriz, ranking, filas, historial_actual, rng)
+
+def ranking_candidatos(misiones, scores, filas=None):
+    """(RankingParcial, filas) de las misiones puntuadas; se puede recorrer de nuevo para pedir más."""
+    # Con `filas` (ánimos pedidos o lista corta de la recuperación) los scores corresponden solo a esas misiones
+    filas = range(len(misiones)) if filas is None else filas.tolist()
+    candidatos_base = [
+        {"mision": misiones[fila], "score": score, "fila": fila}
+        for fila, score in zip(filas, scores)
+    ]
+    return RankingParcial(candidatos_base), filas # Solo se ordena lo que se recorre
 
-    candidatos_base.sort(key=lambda x: x["score"], reverse=True)
-   
+def elegir_n_diversas(n, misiones, matriz, candidatos_base, filas, excluidas, rng=random):
+    """Las n mejores del ranking que no estén en `excluidas` (historial y ya servidas), diversas entre sí."""
     seleccionadas = []
+    filas_seleccionadas = []
     ids_seleccionados = set()
    
     # Prioriza las de mayor score y las que no estén en el historial
     for cand in candidatos_base:
         if len(seleccionadas) >= n:
             break
-        if cand["mision"]["id"] not in ids_seleccionados and cand["mision"]["id"] not in historial_actual:
-            es_diversa = True
-            for sel_mision in seleccionadas:
-                distancia = diversidad_vector(
-                    cand["mision"].get("vector_necesidades", DEFAULT_NECESSITY_VECTOR),
-                    sel_mision.get("vector_necesidades", DEFAULT_NECESSITY_VECTOR)
-                )
-                # Define un umbral de diversidad. Si son muy parecidas, no la elijas.
-                if distancia < 100: # Ajusta este umbral según sea necesario para la diversidad
-                    es_diversa = False
-                    break
+        if cand["mision"].id not in ids_seleccionados and cand["mision"].id not in excluidas:
+            # Define un umbral de diversidad. Si son muy parecidas, no la elijas.
+            es_diversa = matriz.es_diversa(cand["fila"], filas_seleccionadas, 100) # Ajusta este umbral según sea necesario para la diversidad
             if es_diversa:
                 seleccionadas.append(cand["mision"])
-                ids_seleccionados.add(cand["mision"]["id"])
+                filas_seleccionadas.append(cand["fila"])
+                ids_seleccionados.add(cand["mision"].id)
    
     # Si aún no tenemos suficientes, toma las siguientes mejores aunque no sean tan diversas
     for cand in candidatos_base:
         if len(seleccionadas) >= n:
             break
-        if cand["mision"]["id"] not in ids_seleccionados and cand["mision"]["id"] not in historial_actual:
+        if cand["mision"].id not in ids_seleccionados and cand["mision"].id not in excluidas:
             seleccionadas.append(cand["mision"])
-            ids_seleccionados.add(cand["mision"]["id"])
+            ids_seleccionados.add(cand["mision"].id)
+
+    # Misiones entre las que se elige al azar: las candidatas (p. ej. las del ánimo pedido)
+    universo = [misiones[fila] for fila in filas] if len(seleccionadas) < n else []
 
     # Si todavía no tenemos suficientes, y el historial se ha agotado, reinicia y toma al azar
-    if len(seleccionadas) < n and len(misiones) >= n:
-        temp_misiones = [m for m in misiones if m["id"] not in ids_seleccionados]
+    if len(seleccionadas) < n and len(universo) >= n:
+        temp_misiones = [m for m in universo if m.id not in ids_seleccionados]
         if len(temp_misiones) < n - len(seleccionadas):
-            temp_misiones = misiones # Si no hay suficientes nuevas, recicla todo el catálogo
-        random.shuffle(temp_misiones)
+            temp_misiones = universo # Si no hay suficientes nuevas, recicla todo el catálogo
+        rng.shuffle(temp_misiones)
         for mision in temp_misiones:
             if len(seleccionadas) >= n:
                 break
-            if mision["id"] not in ids_seleccionados:
+            if mision.id not in ids_seleccionados:
                 seleccionadas.append(mision)
-                ids_seleccionados.add(mision["id"])
+                ids_seleccionados.add(mision.id)
 
     # Asegúrate de que el resultado final sea exactamente 'n' misiones si es posible
-    while len(seleccionadas) < n and len(misiones) > len(seleccionadas):
-        mision_aleatoria = random.choice(misiones)
-        if mision_aleatoria["id"] not in ids_seleccionados:
+    while len(seleccionadas) < n and len(universo) > len(seleccionadas):
+        mision_aleatoria = rng.choice(universo)
+        if mision_aleatoria.id not in ids_seleccionados:
             seleccionadas.append(mision_aleatoria)
-            ids_seleccionados.add(mision["id"])
+            ids_seleccionados.add(mision_aleatoria.id)
 
     return seleccionadas[:n]
 
@@ -557,11 +1301,11 @@ def seleccionar_n_misiones_inteligentes(
 # Filtrar historial (para disponibilidad de misiones)
 # ============================================================
 def filtrar_historial(misiones, historial):
-    historial = historial or []
+    historial = IndiceHistorial.de(historial)
     disponibles = [
         m
         for m in misiones
-        if m["id"] not in historial
+        if m.id not in historial
     ]
     return disponibles
 
@@ -573,60 +1317,45 @@ def seleccionar_misiones_casa_inteligente(
     misiones,
     perfil_local,
     historial_casa=None,
-    cantidad=3
+    cantidad=3,
+    scores=None,
+    filas=None
 ):
-    historial_casa = historial_casa or []
+    historial_casa = IndiceHistorial.de(historial_casa)
+    matriz = matriz_para(misiones)
    
-    disponibles = filtrar_historial(
-        misiones,
-        historial_casa
-    )
-   
-    if len(disponibles) < cantidad * 2: # Si quedan muy pocas sin repetir, considera todo el catálogo de nuevo
-        disponibles = misiones
-
-    candidatos = []
-    for mision in disponibles:
-        mission_vector = mision.get("vector_necesidades", DEFAULT_NECESSITY_VECTOR)
-
-        score = score_coincidencia(
-            perfil_local=perfil_local,
-            vector_necesidades=mission_vector,
-            historial=historial_casa,
-            mission_id=mision.get("id")
-        )
-        candidatos.append({
-            "mision": mision,
-            "score": score
-        })
+    # Misiones sin repetir = len(filtrar_historial(misiones, historial_casa)), contadas desde el historial
+    vistas = sum(len(matriz.filas_por_id.get(mision_id, ())) for mision_id in historial_casa.recencia)
+    catalogo_completo = len(misiones) - vistas < cantidad * 2 # Si quedan muy pocas sin repetir, considera todo el catálogo de nuevo
+
+    # Se puntúa la lista completa (matriz precompilada) y se descartan después las ya vistas
+    if scores is None:
+        scores = matriz.puntuar(perfil_local, historial_casa, filas)
+    filas = range(len(misiones)) if filas is None else filas.tolist()
+    candidatos = [
+        {"mision": misiones[fila], "score": score, "fila": fila}
+        for fila, score in zip(filas, scores)
+        if catalogo_completo or misiones[fila].id not in historial_casa
+    ]
    
-    candidatos.sort(
-        key=lambda x: x["score"],
-        reverse=True
-    )
+    candidatos = RankingParcial(candidatos) # Solo se ordena lo que se recorre
    
     resultado = []
+    filas_resultado = []
     ids_en_resultado = set()
    
     # Intenta seleccionar misiones diversas y de alto score
     for candidato in candidatos:
         mision = candidato["mision"]
-        if mision["id"] in ids_en_resultado:
+        if mision.id in ids_en_resultado:
             continue
 
-        es_diversa = True
-        for anterior_mision in resultado:
-            distancia = diversidad_vector(
-                mision.get("vector_necesidades", DEFAULT_NECESSITY_VECTOR),
-                anterior_mision.get("vector_necesidades", DEFAULT_NECESSITY_VECTOR)
-            )
-            if distancia < 60: # Umbral de diversidad para misiones CASA
-                es_diversa = False
-                break
+        es_diversa = matriz.es_diversa(candidato["fila"], filas_resultado, 60) # Umbral de diversidad para misiones CASA
        
         if es_diversa:
             resultado.append(mision)
-            ids_en_resultado.add(mision["id"])
+            filas_resultado.append(candidato["fila"])
+            ids_en_resultado.add(mision.id)
        
         if len(resultado) >= cantidad:
             break
@@ -635,25 +1364,117 @@ def seleccionar_misiones_casa_inteligente(
     if len(resultado) < cantidad:
         for candidato in candidatos:
             mision = candidato["mision"]
-            if mision["id"] not in ids_en_resultado:
+            if mision.id not in ids_en_resultado:
                 resultado.append(mision)
-                ids_en_resultado.add(mision["id"])
+                ids_en_resultado.add(mision.id)
             if len(resultado) >= cantidad:
                 break
                
     # Fallback final: si aún no hay suficientes, toma las primeras 'cantidad'
     if len(resultado) < cantidad and len(misiones) >= cantidad:
-        resultado = [c["mision"] for c in candidatos[:cantidad]]
+        resultado = [c["mision"] for c in candidatos.top(cantidad)]
     return resultado
 
 @app.get("/")
-async def index():
+async def index(request: Request):
     """Serves the main HTML page."""
+    if "session.html" in RECURSOS_ESTATICOS:
+        return RECURSOS_ESTATICOS["session.html"].responder(request)
     return FileResponse('static/session.html')
 
 # ==========================================================================================
 # INYECCIÓN OPERATIVA: CONTROLADORES DE COMPRA Y ACCESO ADMINISTRATIVO CON REQUEST SEGURO
 # ==========================================================================================
+# engine.js envía 'cliente_nuevo' si no hay otg_user_id; 'cliente_otg' es el valor por defecto del servidor
+USER_IDS_ANONIMOS = frozenset({"", "cliente_nuevo", "cliente_otg"})
+MAX_LONGITUD_NONCE_CHECKOUT = 128
+
+def identidad_checkout(data):
+    """
+    Quién reintenta un checkout: el user_id real o, si es anónimo, el nonce persistido
+    del cliente (nonce_cliente). None si no hay ninguno: esa petición no se deduplica.
+    """
+    user_id = data.get("user_id")
+    if isinstance(user_id, (str, int)) and not isinstance(user_id, bool) and str(user_id).strip() not in USER_IDS_ANONIMOS:
+        return f"usuario:{user_id}"
+    nonce = data.get("nonce_cliente")
+    if isinstance(nonce, str) and nonce.strip():
+        return f"nonce:{nonce.strip()[:MAX_LONGITUD_NONCE_CHECKOUT]}"
+    return None
+
+def clave_idempotencia_checkout(identidad, tipo_plan, ahora=None):
+    """Misma clave para la misma identidad y plan dentro de una ventana de OTG_STRIPE_VENTANA_SEGUNDOS."""
+    ventana = int((time.time() if ahora is None else ahora) // max(1, VENTANA_IDEMPOTENCIA_CHECKOUT))
+    return "otg-checkout-" + hashlib.sha256(f"{identidad}|{tipo_plan}|{ventana}".encode("utf-8")).hexdigest()[:40]
+
+class PasarelaCheckout:
+    """
+    Crea sesiones de Checkout fuera del event loop.
+    El StripeClient (con su requests.Session y pool de conexiones) y el pool de hilos se crean
+    perezosamente en cada worker, tras el fork. Los reintentos rápidos de la misma identidad y plan
+    (doble clic) comparten la llamada en curso y, durante OTG_STRIPE_CACHE_TTL_SEGUNDOS, su URL.
+    """
+
+    def __init__(self, api_key, api_base, trabajadores, timeout, reintentos, ttl):
+        self.api_key = api_key
+        self.api_base = api_base
+        self.trabajadores = trabajadores
+        self.timeout = timeout
+        self.reintentos = reintentos
+        self.ttl = ttl
+        self._cliente = None
+        self._pool = None
+        self._lock = threading.Lock()
+        self._recientes = {} # (identidad, tipo_plan) -> (expira, concurrent.futures.Future con la URL)
+
+    def _obtener(self):
+        with self._lock:
+            if self._cliente is None:
+                self._cliente = stripe.StripeClient(
+                    self.api_key or "",
+                    base_addresses={"api": self.api_base} if self.api_base else None,
+                    http_client=stripe.RequestsClient(timeout=self.timeout),
+                    max_network_retries=self.reintentos,
+                )
+                self._pool = ThreadPoolExecutor(max_workers=self.trabajadores, thread_name_prefix="otg-stripe")
+            return self._cliente, self._pool
+
+    def _crear(self, cliente, user_id, tipo_plan, clave):
+        opciones = {"idempotency_key": clave} if clave else None
+        session = cliente.v1.checkout.sessions.create({
+            "payment_method_types": ["card"],
+            "line_items": [{"price": PLANES_STRIPE[tipo_plan], "quantity": 1}],
+            "mode": "subscription" if tipo_plan != "unico" else "payment",
+            "success_url": "https://open-than-go.onrender.com",
+            "cancel_url": "https://open-than-go.onrender.com",
+            "client_reference_id": user_id,
+        }, opciones)
+        return session.url
+
+    def _purgar(self, ahora):
+        if len(self._recientes) > 1024:
+            for clave in [c for c, (expira, _) in self._recientes.items() if expira <= ahora]:
+                del self._recientes[clave]
+
+    async def url_checkout(self, user_id, tipo_plan, identidad=None):
+        """URL de Checkout para user_id; sin `identidad` (ver identidad_checkout) cada llamada crea su sesión."""
+        cliente, pool = self._obtener()
+        if identidad is None:
+            return await asyncio.wrap_future(pool.submit(self._crear, cliente, user_id, tipo_plan, None))
+        ahora = time.monotonic()
+        clave = (identidad, tipo_plan)
+        reciente = self._recientes.get(clave)
+        if reciente is None or reciente[0] <= ahora or (reciente[1].done() and reciente[1].exception()):
+            self._purgar(ahora)
+            futuro = pool.submit(self._crear, cliente, user_id, tipo_plan, clave_idempotencia_checkout(identidad, tipo_plan))
+            self._recientes[clave] = reciente = (ahora + self.ttl, futuro)
+        # shield: si un cliente se desconecta no cancela la llamada que comparten sus reintentos
+        return await asyncio.shield(asyncio.wrap_future(reciente[1]))
+
+PASARELA_CHECKOUT = PasarelaCheckout(
+    stripe.api_key, STRIPE_API_BASE, STRIPE_TRABAJADORES, STRIPE_TIMEOUT_SEGUNDOS, STRIPE_REINTENTOS, TTL_CHECKOUT_SEGUNDOS
+)
+
 @app.post("/crear-checkout")
 async def crear_checkout(request: Request):
     try:
@@ -664,16 +1485,10 @@ async def crear_checkout(request: Request):
         if tipo_plan not in PLANES_STRIPE:
             raise HTTPException(status_code=400, detail="Plan inválido")
 
-        session = stripe.checkout.Session.create(
-            payment_method_types=["card"],
-            line_items=[{"price": PLANES_STRIPE[tipo_plan], "quantity": 1}],
-            mode="subscription" if tipo_plan != "unico" else "payment",
-            success_url="https://open-than-go.onrender.com",
-            cancel_url="https://open-than-go.onrender.com",
-            client_reference_id=user_id
-        )
+        # Los user_id anónimos los comparten personas distintas: solo se deduplica por un id real o el nonce del cliente
+        url = await PASARELA_CHECKOUT.url_checkout(user_id, tipo_plan, identidad_checkout(data))
 
-        return {"url": session.url}
+        return {"url": url}
     except Exception as e:
         return JSONResponse(status_code=500, content={"error": str(e)})
 
@@ -710,57 +1525,1162 @@ async def webhook_stripe(request: Request):
 # ==========================================================================================
 # NUEVO ENDPOINT: Obtener preguntas específicas por empresa
 # ==========================================================================================
+# data/preguntas_empresas.json: {"<empresa>": {"logo_path": "...", "es": [...], "en": [...]}}
+# Cada (empresa, idioma) se serializa una sola vez, con su ETag y su variante gzip.
+RUTA_PREGUNTAS_EMPRESAS = os.environ.get(
+    "OTG_PREGUNTAS_EMPRESAS_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "preguntas_empresas.json")
+)
+CACHE_CONTROL_PREGUNTAS = "public, max-age=3600"
+
+def cargar_preguntas_empresas(ruta):
+    if not os.path.exists(ruta):
+        logger.warning("No existe %s: /api/get-company-questions responderá 404 a todas las empresas", ruta)
+        return {}
+    with open(ruta, encoding="utf-8") as archivo:
+        return {empresa.lower(): datos for empresa, datos in json.load(archivo).items()}
+
+def serializar_preguntas_empresas(preguntas):
+    """{(empresa, idioma): RecursoEstatico} con el cuerpo JSON ya codificado."""
+    return {
+        (empresa, idioma): RecursoEstatico(
+            JSONResponse({"questions": datos[idioma], "logo_path": datos["logo_path"]}).body,
+            "application/json",
+            CACHE_CONTROL_PREGUNTAS,
+        )
+        for empresa, datos in preguntas.items()
+        for idioma in datos
+        if idioma != "logo_path"
+    }
+
+COMPANY_QUESTIONS = cargar_preguntas_empresas(RUTA_PREGUNTAS_EMPRESAS)
+RESPUESTAS_PREGUNTAS_EMPRESAS = serializar_preguntas_empresas(COMPANY_QUESTIONS)
+
 @app.get("/api/get-company-questions")
-async def get_company_questions(company: str, lang: str = "es"):
-    company_lower = company.lower()
-    if company_lower not in COMPANY_QUESTIONS:
+async def get_company_questions(request: Request, company: str, lang: str = "es"):
+    recurso = RESPUESTAS_PREGUNTAS_EMPRESAS.get((company.lower(), lang))
+    if recurso is None:
         raise HTTPException(status_code=404, detail="Company not found")
-   
-    questions = COMPANY_QUESTIONS[company_lower][lang]
-    logo_path = COMPANY_QUESTIONS[company_lower]["logo_path"]
-    return JSONResponse({"questions": questions, "logo_path": logo_path})
+    return recurso.responder(request)
 
 # ==========================================================================================
 # OPEN THAN GO SYSTEM - Kernel Absolute Engine V.6.0.1
 # Company: May Roga LLC
 # File: main.py - SECCIÓN 2 DE 2 (CWRE Logic)
-@app.post("/api/mando-integral")
-async def mando_integral(request: Request):
+def renderizar_mision_salir(info_seleccionada, lang, budget, perfil_tipo, zip_code):
+    """Objeto de misión SALIR tal como lo recibe el frontend."""
+    # === MODIFICACIÓN: MENSAJES DE ACOMPAÑAMIENTO Y GASTO ACORTADOS ===
+    precio_real = ""
+    if budget == "0":
+        precio_real = "GASTO: Cero. Recarga sin costo." if lang == "es" else "COST: Zero. Free recharge."
+    elif budget == "1":
+        precio_real = "GASTO: Bajo. Pequeño gusto." if lang == "es" else "COST: Low. Small treat."
+    elif budget == "2":
+        precio_real = "GASTO: Libre. Tu escape." if lang == "es" else "COST: Free. Your escape."
+
+    quienes_van = ""
+    if perfil_tipo == "solo":
+        quienes_van = "ACOMPAÑAMIENTO: Solo. Reconecta." if lang == "es" else "COMPANIONSHIP: Solo. Reconnect."
+    elif perfil_tipo == "familia":
+        quienes_van = "ACOMPAÑAMIENTO: Familia. Desahogo." if lang == "es" else "COMPANIONSHIP: Family. Unwind."
+    elif perfil_tipo == "accesible":
+        quienes_van = "ACOMPAÑAMIENTO: Ruta accesible. Sin barreras." if lang == "es" else "COMPANIONSHIP: Accessible route. No barriers."
+
+    textos = info_seleccionada.textos(lang) # Textos ya resueltos por idioma en el compilador del catálogo
+    anclaje_geografico = zip_code
+    map_base_url = link_base
+
+    if lang == "en":
+        # === MODIFICACIÓN: guia_masticada (EN) ACORTADA ===
+        guia_masticada = (
+            f"TARGET: {textos.titulo}.\n"
+            f"WHAT TO DO: {textos.que_hacer}\n"
+            f"WHY: {textos.porque}\n"
+            f"WHEN: {textos.cuando}\n"
+            f"FOR WHAT: {textos.para_que}\n"
+            f"{quienes_van}\n{precio_real}"
+        )
+    else:
+        # === MODIFICACIÓN: guia_masticada (ES) ACORTADA ===
+        guia_masticada = (
+            f"DESTINO: {textos.titulo}.\n"
+            f"POR QUÉ: {textos.porque}\n"
+            f"QUÉ HACER: {textos.que_hacer}\n"
+            f"CUÁNDO: {textos.cuando}\n"
+            f"PARA QUÉ: {textos.para_que}\n"
+            f"{quienes_van}\n{precio_real}"
+        )
+
+    search_query_parts = []
+    if perfil_tipo == "accesible":
+        search_query_parts.append("wheelchair accessible")
+    elif perfil_tipo == "familia":
+        search_query_parts.append("family friendly")
+
+    search_query_parts.append(info_seleccionada.gps)
+    search_query_parts.append(f"in {anclaje_geografico}")
+
+    full_map_query_string = " ".join(search_query_parts)
+    target_link = f"{map_base_url}{urllib.parse.quote_plus(full_map_query_string)}"
+
+    final_vector_necesidades = {**DEFAULT_NECESSITY_VECTOR, **info_seleccionada.vector_necesidades}
+
+    return {
+        "destino_id": info_seleccionada.id,
+        "destino_titulo": textos.titulo.upper(),
+        "destino_titulo_en": info_seleccionada.textos_en.titulo,
+        "que_hacer": info_seleccionada.textos_es.que_hacer,
+        "que_hacer_en": info_seleccionada.textos_en.que_hacer,
+        "destino_entorno": textos.donde,
+        "destino_instruccion": guia_masticada.strip(),
+        "destino_instruccion_en": guia_masticada.strip(), # Ambos usan el mismo guia_masticada que ya fue construido en el idioma correcto
+        "destino_coordenadas_gps": target_link,
+        "vector_entorno_seleccionado": final_vector_necesidades,
+    }
+
+# ============================================================
+# SERIALIZACIÓN DE RESPUESTAS
+# RespuestaJSONRapida produce los mismos bytes que JSONResponse
+# (JSON compacto en UTF-8) pero con orjson cuando está instalado.
+# Modo compacto ("compacto": true en el payload): las misiones omiten
+# las entradas de vector_entorno_seleccionado iguales a
+# DEFAULT_NECESSITY_VECTOR (engine.js completa el vector con
+# DEFAULT_NECESSITY_PROFILE antes de sumarlo al perfil en el botón
+# GPS) y los campos *_en idénticos a su versión base (engine.js ya
+# usa `x_en || x`).
+# ============================================================
+class RespuestaJSONRapida(JSONResponse):
+    def render(self, content):
+        if orjson is not None:
+            try:
+                return orjson.dumps(content)
+            except TypeError: # p. ej. enteros de más de 64 bits en un user_id: se delega en json
+                pass
+        return super().render(content)
+
+def compactar_mision(mision):
+    compacta = {
+        clave: valor for clave, valor in mision.items()
+        if not (clave.endswith("_en") and clave[:-3] in mision and mision[clave[:-3]] == valor)
+    }
+    vector = mision.get("vector_entorno_seleccionado")
+    if vector is not None:
+        compacta["vector_entorno_seleccionado"] = {
+            necesidad: valor for necesidad, valor in vector.items()
+            if necesidad not in DEFAULT_NECESSITY_VECTOR or DEFAULT_NECESSITY_VECTOR[necesidad] != valor
+        }
+    return compacta
+
+def marcar_compacta(solicitud, respuesta):
+    if solicitud["compacto"]:
+        respuesta["compacto"] = True
+    return respuesta
+
+# ============================================================
+# FRAGMENTOS DE RESPUESTA SALIR PRE-RENDERIZADOS (LRU)
+# Cada misión SALIR renderizada depende solo de
+# (id de misión, lang, budget, perfil_tipo, zip).
+# ============================================================
+TAMANO_CACHE_FRAGMENTOS_SALIR = int(os.environ.get("OTG_CACHE_FRAGMENTOS_SALIR", 4096))
+
+class CacheLRU:
+    """LRU acotada con contadores de aciertos/fallos. Segura entre hilos."""
+
+    def __init__(self, tamano_maximo):
+        self.tamano_maximo = tamano_maximo
+        self._entradas = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def obtener(self, clave, default=None, es_valida=None):
+        """Valor cacheado o `default`; `es_valida(valor)` permite descartar una entrada obsoleta."""
+        with self._lock:
+            valor = self._entradas.get(clave, default)
+            if clave in self._entradas and (es_valida is None or es_valida(valor)):
+                self._entradas.move_to_end(clave)
+                self.hits += 1
+                return valor
+            self.misses += 1
+            return default
+
+    def guardar(self, clave, valor):
+        with self._lock:
+            self._entradas[clave] = valor
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.tamano_maximo:
+                self._entradas.popitem(last=False)
+
+    def limpiar(self):
+        with self._lock:
+            self._entradas.clear()
+
+    def estadisticas(self):
+        return {"hits": self.hits, "misses": self.misses, "tamano": len(self._entradas), "tamano_maximo": self.tamano_maximo}
+
+CACHE_FRAGMENTOS_SALIR = CacheLRU(TAMANO_CACHE_FRAGMENTOS_SALIR)
+
+def mision_salir_renderizada(info_seleccionada, lang, budget, perfil_tipo, zip_code, compacto=False):
     """
-    Main API endpoint for OPEN THAN GO.
-    Receives user input and local preference profile to return a personalized recommendation.
+    Devuelve el objeto de misión renderizado desde la caché (compartido: no mutar).
+    La misión cacheada se compara por identidad: tras recargar el catálogo un mismo id puede ser otro registro.
     """
-    payload = await request.json()
-    opcion_usuario = str(payload.get("modo", "")).strip().upper()
-    zip_code = str(payload.get("zip", "")).strip()
-    # estado = str(payload.get("estado", "FL")).strip() # Not used in current logic, but kept
-    # region = str(payload.get("region", "")).strip() # Not used in current logic, but kept
-    mente = str(payload.get("mente", "aburrido")).lower()
-    budget = str(payload.get("budget", "0"))
-    perfil_tipo = str(payload.get("perfil", "solo")).lower()
-    desahogo = str(payload.get("desahogo", "")).lower()
-    lang = str(payload.get("lang", "es")).lower()
-   
-    # NEW: calidez_humana_pregunta is passed from frontend company flow
-    calidez_humana_pregunta = payload.get("calidez_humana_pregunta", "")
+    clave = (info_seleccionada.id, lang, budget, perfil_tipo, zip_code, compacto)
+    entrada = CACHE_FRAGMENTOS_SALIR.obtener(clave, es_valida=lambda e: e[0] is info_seleccionada)
+    if entrada is not None:
+        return entrada[1]
+    renderizada = renderizar_mision_salir(info_seleccionada, lang, budget, perfil_tipo, zip_code)
+    if compacto:
+        renderizada = compactar_mision(renderizada)
+    CACHE_FRAGMENTOS_SALIR.guardar(clave, (info_seleccionada, renderizada))
+    return renderizada
+
+# ============================================================
+# RECARGA EN CALIENTE DEL CATÁLOGO
+# Un hilo vigila data/catalogo_misiones.jsonl; si cambia, compila
+# la nueva versión completa (particiones, matrices de scoring y de
+# diversidad por misión) en segundo plano y la instala con una sola asignación.
+# Las peticiones en curso conservan la versión con la que empezaron.
+# Para publicar cambios: escribir a un temporal y renombrar (os.replace);
+# nunca reescribir el archivo en el sitio.
+# ============================================================
+INTERVALO_RECARGA_CATALOGO = float(os.environ.get("OTG_CATALOGO_RECARGA_SEGUNDOS", 5)) # 0 desactiva
+
+def firma_archivo(ruta):
+    estado = os.stat(ruta)
+    return (estado.st_ino, estado.st_size, estado.st_mtime_ns)
+
+def instalar_catalogo(nuevo):
+    """Sustituye atómicamente el catálogo activo."""
+    global CATALOGO
+    CATALOGO = nuevo
+    CACHE_FRAGMENTOS_SALIR.limpiar()
+
+def recargar_catalogo(ruta=None):
+    """Compila y valida el catálogo de `ruta` y lo instala si su versión es distinta. Devuelve la versión activa."""
+    nuevo = CatalogoCompilado(ArchivoCatalogo(ruta or RUTA_CATALOGO)).precargar()
+    if nuevo.version != CATALOGO.version:
+        instalar_catalogo(nuevo)
+        logger.info("Catálogo de misiones recargado: versión %s", nuevo.version)
+    return CATALOGO.version
+
+class VigilanteCatalogo(threading.Thread):
+    """Sondea la firma (inodo, tamaño, mtime) del archivo y recarga cuando cambia."""
+
+    def __init__(self, ruta, intervalo):
+        super().__init__(name="vigilante-catalogo", daemon=True)
+        self.ruta = ruta
+        self.intervalo = intervalo
+        self.firma = firma_archivo(ruta)
+        self._parar = threading.Event()
+
+    def run(self):
+        while not self._parar.wait(self.intervalo):
+            self.revisar()
+
+    def revisar(self):
+        try:
+            firma = firma_archivo(self.ruta)
+        except OSError:
+            return # Archivo en plena sustitución; se reintenta en el siguiente ciclo
+        if firma == self.firma:
+            return
+        self.firma = firma
+        try:
+            recargar_catalogo(self.ruta)
+        except (CatalogoInvalido, OSError, ValueError) as e:
+            logger.warning("Catálogo de misiones no recargado, se mantiene la versión %s: %s", CATALOGO.version, e)
+
+    def detener(self):
+        self._parar.set()
+
+VIGILANTE_CATALOGO = None
+
+@app.on_event("startup")
+async def iniciar_vigilante_catalogo():
+    global VIGILANTE_CATALOGO
+    if INTERVALO_RECARGA_CATALOGO > 0 and VIGILANTE_CATALOGO is None:
+        VIGILANTE_CATALOGO = VigilanteCatalogo(RUTA_CATALOGO, INTERVALO_RECARGA_CATALOGO)
+        VIGILANTE_CATALOGO.start()
+
+@app.on_event("shutdown")
+async def detener_vigilante_catalogo():
+    global VIGILANTE_CATALOGO
+    if VIGILANTE_CATALOGO is not None:
+        VIGILANTE_CATALOGO.detener()
+        VIGILANTE_CATALOGO = None
+
+# ============================================================
+# MÉTRICAS DEL PIPELINE (/metrics, formato de texto Prometheus)
+# Cada solicitud de /api/mando-integral lleva una traza que marca el
+# fin de cada etapa; al cerrarla se vuelca en histogramas por
+# (etapa, modo) con un solo lock. Con OTG_METRICAS=0 la traza es un
+# objeto nulo cuyos métodos no hacen nada.
+# Cada worker de gunicorn expone sus propios contadores.
+# ============================================================
+METRICAS_ACTIVAS = os.environ.get("OTG_METRICAS", "0") == "1"
+LIMITES_HISTOGRAMA_SEGUNDOS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+class HistogramaLatencia:
+    __slots__ = ("cubetas", "suma", "total")
+
+    def __init__(self):
+        self.cubetas = [0] * (len(LIMITES_HISTOGRAMA_SEGUNDOS) + 1) # La última es +Inf
+        self.suma = 0.0
+        self.total = 0
+
+    def observar(self, segundos):
+        self.cubetas[bisect.bisect_left(LIMITES_HISTOGRAMA_SEGUNDOS, segundos)] += 1
+        self.suma += segundos
+        self.total += 1
+
+class RegistroMetricas:
+    """Histogramas de latencia por (etapa, modo) y contadores por (nombre, modo). Seguro entre hilos."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histogramas = {}
+        self.contadores = {}
+
+    def registrar(self, modo, etapas, contadores):
+        with self._lock:
+            for etapa, segundos in etapas:
+                histograma = self.histogramas.get((etapa, modo))
+                if histograma is None:
+                    histograma = self.histogramas[(etapa, modo)] = HistogramaLatencia()
+                histograma.observar(segundos)
+            for nombre, valor in contadores.items():
+                self.contadores[(nombre, modo)] = self.contadores.get((nombre, modo), 0) + valor
+
+    def exportar(self):
+        """Texto de exposición Prometheus (version 0.0.4)."""
+        lineas = [
+            "# HELP otg_etapa_segundos Duración de cada etapa de /api/mando-integral.",
+            "# TYPE otg_etapa_segundos histogram",
+        ]
+        with self._lock:
+            histogramas = sorted(self.histogramas.items())
+            contadores = sorted(self.contadores.items())
+            for (etapa, modo), histograma in histogramas:
+                etiquetas = f'etapa="{etapa}",modo="{modo}"'
+                acumulado = 0
+                for limite, cantidad in zip((*LIMITES_HISTOGRAMA_SEGUNDOS, "+Inf"), histograma.cubetas):
+                    acumulado += cantidad
+                    lineas.append(f'otg_etapa_segundos_bucket{{{etiquetas},le="{limite}"}} {acumulado}')
+                lineas.append(f"otg_etapa_segundos_sum{{{etiquetas}}} {histograma.suma}")
+                lineas.append(f"otg_etapa_segundos_count{{{etiquetas}}} {histograma.total}")
+        nombres_vistos = set()
+        for (nombre, modo), valor in contadores:
+            if nombre not in nombres_vistos:
+                nombres_vistos.add(nombre)
+                lineas.append(f"# TYPE otg_{nombre}_total counter")
+            lineas.append(f'otg_{nombre}_total{{modo="{modo}"}} {valor}')
+        cache = CACHE_FRAGMENTOS_SALIR.estadisticas()
+        lineas += [
+            "# TYPE otg_cache_fragmentos_salir_aciertos_total counter",
+            f"otg_cache_fragmentos_salir_aciertos_total {cache['hits']}",
+            "# TYPE otg_cache_fragmentos_salir_fallos_total counter",
+            f"otg_cache_fragmentos_salir_fallos_total {cache['misses']}",
+            "# TYPE otg_cache_fragmentos_salir_entradas gauge",
+            f"otg_cache_fragmentos_salir_entradas {cache['tamano']}",
+            "# TYPE otg_catalogo_info gauge",
+            f'otg_catalogo_info{{version="{CATALOGO.version}"}} 1',
+            *EJECUTOR_SELECCION.exportar(),
+        ]
+        return "\n".join(lineas) + "\n"
+
+METRICAS = RegistroMetricas()
+
+class TrazaSolicitud:
+    """Cronometra las etapas de una solicitud: `marcar(etapa)` cierra la etapa en curso."""
+    __slots__ = ("inicio", "ultimo", "etapas", "contadores", "modo")
+
+    def __init__(self):
+        self.inicio = self.ultimo = time.perf_counter()
+        self.etapas = []
+        self.contadores = {}
+        self.modo = "SALIR"
+
+    def marcar(self, etapa):
+        ahora = time.perf_counter()
+        self.etapas.append((etapa, ahora - self.ultimo))
+        self.ultimo = ahora
+
+    def contar(self, nombre, valor=1):
+        self.contadores[nombre] = self.contadores.get(nombre, 0) + valor
+
+    def cerrar(self):
+        self.etapas.append(("total", self.ultimo - self.inicio))
+        self.contadores["solicitudes"] = 1
+        METRICAS.registrar(self.modo, self.etapas, self.contadores)
+
+class TrazaNula:
+    """Traza usada con las métricas desactivadas: no mide nada."""
+    __slots__ = ()
+    modo = None
+
+    def __setattr__(self, nombre, valor):
+        pass
+
+    def marcar(self, etapa):
+        pass
+
+    def contar(self, nombre, valor=1):
+        pass
+
+    def cerrar(self):
+        pass
+
+TRAZA_NULA = TrazaNula()
+
+def nueva_traza():
+    return TrazaSolicitud() if METRICAS_ACTIVAS else TRAZA_NULA
+
+@app.get("/metrics")
+async def metricas():
+    return PlainTextResponse(METRICAS.exportar(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+# ============================================================
+# SESIONES EN EL SERVIDOR (opcional)
+# Si el payload trae "sesion" (user_id o sessionSeed del cliente), el
+# servidor guarda perfil_local e historiales y el cliente solo envía
+# el delta:
+#   perfil_local            necesidades que cambian (se fusionan con el perfil
+#                           guardado, ver MOTOR DE PERFILES)
+#   historial_salir/_casa   reemplazan el historial guardado (resincronización)
+#   historial_salir_delta/_casa_delta   ids que se añaden al historial guardado
+# La respuesta devuelve "sesion" en lugar de los historiales completos.
+# Sin "sesion" el endpoint se comporta exactamente como antes.
+# Un token desconocido (nunca visto, caducado o de otro servidor) solo
+# abre sesión si el payload trae el estado completo (historial_salir e
+# historial_casa); con un delta la respuesta lleva "sesion_desconocida"
+# y los historiales completos, no se guarda nada y el cliente debe
+# reenviar el estado completo.
+# Backends (OTG_SESIONES): "sqlite:/ruta.db" (por defecto, en
+# OTG_SESIONES_SQLITE_PATH) o "redis://host:puerto/db", compartidos entre
+# workers; "memoria" (LRU con TTL, solo para un único worker); cadena
+# vacía desactiva las sesiones. Las llamadas a SQLite y Redis se hacen
+# en el pool de hilos, fuera del event loop. El archivo SQLite se crea
+# con la primera sesión guardada; las caducadas se borran al abrirlo
+# cada worker y cada OTG_SESIONES_PURGA_CADA escrituras (Redis caduca
+# las suyas solo y la LRU en memoria al leerlas).
+# ============================================================
+RUTA_SESIONES_SQLITE = os.environ.get("OTG_SESIONES_SQLITE_PATH", "data/sesiones.db")
+CONFIG_SESIONES = os.environ.get("OTG_SESIONES", f"sqlite:{RUTA_SESIONES_SQLITE}")
+TTL_SESIONES_SEGUNDOS = int(os.environ.get("OTG_SESIONES_TTL_SEGUNDOS", 7 * 24 * 3600))
+MAX_SESIONES_MEMORIA = int(os.environ.get("OTG_SESIONES_MAX", 10000))
+PURGAR_SESIONES_CADA = int(os.environ.get("OTG_SESIONES_PURGA_CADA", 1000)) # Escrituras de cada worker entre purgas de SQLite
+MAX_LONGITUD_TOKEN_SESION = 128
+
+def estado_sesion_vacio():
+    return {"historial_salir": [], "historial_casa": []}
+
+class AlmacenSesionesMemoria:
+    """LRU acotada en memoria con caducidad. No se comparte entre workers."""
+    bloqueante = False
+
+    def __init__(self, tamano_maximo, ttl):
+        self.ttl = ttl
+        self._cache = CacheLRU(tamano_maximo)
+
+    def obtener(self, token):
+        entrada = self._cache.obtener(token, es_valida=lambda valor: valor[0] > time.time())
+        return None if entrada is None else json.loads(entrada[1])
+
+    def guardar(self, token, estado):
+        self._cache.guardar(token, (time.time() + self.ttl, json.dumps(estado)))
+
+class AlmacenSesionesSQLite:
+    """Tabla clave-valor en SQLite (modo WAL) compartida por todos los workers de la máquina."""
+    bloqueante = True
+
+    def __init__(self, ruta, ttl, purgar_cada=PURGAR_SESIONES_CADA):
+        # No se toca el disco hasta la primera escritura: importar main.py no crea la base de datos
+        self.ruta = ruta
+        self.ttl = ttl
+        self.purgar_cada = purgar_cada
+        self._lock = threading.Lock()
+        self._pid = None
+        self._conexion = None
+        self._escrituras = 0
+
+    def _conectar(self, crear=False):
+        """Conexión de este proceso, o None si la base de datos no existe y no hay que crearla."""
+        # Una conexión SQLite no sobrevive a un fork: con preload_app cada worker abre la suya
+        if self._pid != os.getpid():
+            if not crear and not os.path.exists(self.ruta):
+                return None # Aún no se ha guardado ninguna sesión
+            self._conexion = sqlite3.connect(self.ruta, check_same_thread=False, isolation_level=None)
+            self._conexion.execute("PRAGMA journal_mode=WAL")
+            self._conexion.execute("PRAGMA synchronous=NORMAL") # En WAL, sin fsync por escritura (solo en los checkpoints)
+            self._conexion.execute(
+                "CREATE TABLE IF NOT EXISTS sesiones (token TEXT PRIMARY KEY, estado TEXT NOT NULL, expira REAL NOT NULL)"
+            )
+            self._pid = os.getpid()
+            self._escrituras = 0
+            self._purgar() # Al abrir cada worker, lo caducado mientras estuvo parado
+        return self._conexion
+
+    def obtener(self, token):
+        with self._lock:
+            conexion = self._conectar()
+            if conexion is None:
+                return None
+            fila = conexion.execute(
+                "SELECT estado FROM sesiones WHERE token = ? AND expira > ?", (token, time.time())
+            ).fetchone()
+        return None if fila is None else json.loads(fila[0])
+
+    def guardar(self, token, estado):
+        with self._lock:
+            self._conectar(crear=True).execute(
+                "INSERT OR REPLACE INTO sesiones (token, estado, expira) VALUES (?, ?, ?)",
+                (token, json.dumps(estado), time.time() + self.ttl)
+            )
+            self._escrituras += 1
+            if self.purgar_cada and self._escrituras % self.purgar_cada == 0:
+                self._purgar()
+
+    def _purgar(self):
+        self._conexion.execute("DELETE FROM sesiones WHERE expira <= ?", (time.time(),))
+
+    def purgar(self):
+        """Borra las sesiones caducadas."""
+        with self._lock:
+            if self._conectar() is not None:
+                self._purgar()
+
+class AlmacenSesionesRedis:
+    """Cualquier servidor compatible con el protocolo Redis (redis, valkey, keydb...)."""
+    bloqueante = True
+
+    def __init__(self, url, ttl):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("OTG_SESIONES=redis://... requiere el paquete 'redis'") from e
+        self.ttl = ttl
+        self._cliente = redis.Redis.from_url(url)
+
+    def obtener(self, token):
+        valor = self._cliente.get(f"otg:sesion:{token}")
+        return None if valor is None else json.loads(valor)
+
+    def guardar(self, token, estado):
+        self._cliente.set(f"otg:sesion:{token}", json.dumps(estado), ex=self.ttl)
+
+def crear_almacen_sesiones(config):
+    if not config:
+        return None
+    if config == "memoria":
+        return AlmacenSesionesMemoria(MAX_SESIONES_MEMORIA, TTL_SESIONES_SEGUNDOS)
+    if config.startswith("sqlite:"):
+        return AlmacenSesionesSQLite(config[len("sqlite:"):], TTL_SESIONES_SEGUNDOS)
+    if config.startswith(("redis://", "rediss://", "unix://")):
+        return AlmacenSesionesRedis(config, TTL_SESIONES_SEGUNDOS)
+    raise ValueError(f"OTG_SESIONES no reconocido: {config!r}")
+
+ALMACEN_SESIONES = crear_almacen_sesiones(CONFIG_SESIONES)
+
+def token_sesion(token):
+    """Token de sesión normalizado, o None si no hay sesión (o el almacén está desactivado)."""
+    if ALMACEN_SESIONES is None or not isinstance(token, str) or not token.strip():
+        return None
+    return token.strip()[:MAX_LONGITUD_TOKEN_SESION]
+
+async def leer_sesion(token):
+    """Estado guardado de la sesión, o None si el token es desconocido o ha caducado."""
+    if ALMACEN_SESIONES.bloqueante:
+        return await run_in_threadpool(ALMACEN_SESIONES.obtener, token)
+    return ALMACEN_SESIONES.obtener(token)
+
+async def escribir_sesion(token, estado):
+    if ALMACEN_SESIONES.bloqueante:
+        await run_in_threadpool(ALMACEN_SESIONES.guardar, token, estado)
+    else:
+        ALMACEN_SESIONES.guardar(token, estado)
+
+def trae_estado_completo(payload):
+    return isinstance(payload.get("historial_salir"), list) and isinstance(payload.get("historial_casa"), list)
+
+async def hidratar_payload_sesion(payload, token):
+    """
+    Payload completo = estado guardado de la sesión + delta recibido. También devuelve el estado,
+    o None si el token es desconocido y el payload no trae el estado completo (sesión desconocida).
+    """
+    guardado = await leer_sesion(token)
+    conocida = guardado is not None or trae_estado_completo(payload)
+    estado = guardado or estado_sesion_vacio()
+    perfil = MOTOR_PERFILES.leer(estado)
+    perfil_delta = payload.get("perfil_local")
+    if isinstance(perfil_delta, dict) and perfil_delta:
+        perfil.update(perfil_delta)
+        MOTOR_PERFILES.fijar(estado, perfil) # Solo se persiste si la solicitud termina bien
+    for campo, limite in (("historial_salir", MAX_HISTORY_SALIR), ("historial_casa", MAX_HISTORY_CASA)):
+        if isinstance(payload.get(campo), list):
+            estado[campo] = limitar_historial(payload[campo], limite)
+        delta = payload.get(f"{campo}_delta")
+        if isinstance(delta, list):
+            for mision_id in delta:
+                estado[campo] = actualizar_historial(estado[campo], mision_id, limite)
+    return {
+        **payload,
+        "perfil_local": perfil,
+        "historial_salir": list(estado["historial_salir"]),
+        "historial_casa": list(estado["historial_casa"]),
+    }, estado if conocida else None
+
+async def cerrar_respuesta_sesion(respuesta, token, estado):
+    """
+    Guarda los historiales resultantes y los quita de la respuesta. Con una sesión
+    desconocida (estado None) no guarda nada y deja los historiales completos.
+    """
+    respuesta["sesion"] = token
+    if estado is None:
+        respuesta["sesion_desconocida"] = True
+        return respuesta
+    for campo in ("historial_salir", "historial_casa"):
+        actualizado = respuesta.pop(f"{campo}_actualizado", None)
+        if actualizado is not None:
+            estado[campo] = list(actualizado)
+    await escribir_sesion(token, estado)
+    return respuesta
+
+# ============================================================
+# MOTOR DE PERFILES EN EL SERVIDOR
+# Con sesión, el perfil se guarda como un vector base denso (en el
+# orden de DEFAULT_NECESSITY_VECTOR) más el instante en que se fijó.
+# El decaimiento de engine.js (hacia 50 con DECAY_PER_DAY ** días; el
+# indicador de ansiedad baja 2 puntos por día) se evalúa en forma
+# cerrada solo al leer el perfil: decaer d1 días y después d2 es lo
+# mismo que decaer d1 + d2, así que no hace falta ningún proceso
+# periódico ni que el cliente reenvíe el perfil completo. Cada
+# escritura (delta del cliente o evento de feedback) fija una base
+# nueva en el instante actual.
+#   POST /api/perfil-evento {"sesion", "evento", "mision_id" | "vector_necesidades"}
+#   GET  /api/perfil?sesion=...
+# Ambos devuelven solo las necesidades: el indicador de ansiedad se
+# usa en el servidor pero nunca sale de él.
+# ============================================================
+NECESIDADES_PERFIL = tuple(DEFAULT_NECESSITY_VECTOR)
+NECESIDADES_PUBLICAS = tuple(necesidad for necesidad in NECESIDADES_PERFIL if necesidad != "indicador_ansiedad")
+DECAY_POR_DIA = float(os.environ.get("OTG_PERFIL_DECAY_POR_DIA", 0.985)) # DECAY_PER_DAY de engine.js
+BASE_DECAY = 50
+DESCENSO_ANSIEDAD_POR_DIA = 2
+SEGUNDOS_POR_DIA = 24 * 3600
+# evento -> (fracción del vector de la misión que se suma a cada necesidad, cambio del indicador de ansiedad)
+EVENTOS_PERFIL = {
+    "salir_completada": (0.1, -10), # Botón GPS al terminar la cuenta atrás de SALIR
+    "casa_completada": (0.05, -5), # "HAZLO AHORA" en cada paso de CASA
+    "adelanto_respiracion": (0, 5), # Toque en el círculo de respiración de CASA
+}
+
+def es_numero(valor):
+    return isinstance(valor, (int, float)) and not isinstance(valor, bool) and math.isfinite(valor)
+
+def perfil_decaido(base, fijado, ahora):
+    """Perfil {necesidad: valor} en el instante ahora, a partir de la base fijada en el instante fijado."""
+    dias = max(0.0, (ahora - fijado) / SEGUNDOS_POR_DIA)
+    factor = DECAY_POR_DIA ** dias
+    perfil = {}
+    for necesidad, valor in zip(NECESIDADES_PERFIL, base):
+        if necesidad == "indicador_ansiedad":
+            perfil[necesidad] = round(max(0.0, valor - DESCENSO_ANSIEDAD_POR_DIA * dias), 2)
+        else:
+            perfil[necesidad] = round(BASE_DECAY + (valor - BASE_DECAY) * factor, 2)
+    return perfil
+
+class MotorPerfiles:
+    """Lectura perezosa y actualización incremental del perfil guardado en el estado de una sesión."""
+
+    def leer(self, estado, ahora=None):
+        """Perfil denso con el decaimiento hasta ahora ya aplicado."""
+        guardado = estado.get("perfil")
+        if guardado is None:
+            # Las sesiones anteriores guardaban perfil_local tal cual llegaba del cliente
+            anterior = estado.get("perfil_local") or {}
+            return {
+                necesidad: float(anterior[necesidad]) if es_numero(anterior.get(necesidad)) else float(valor)
+                for necesidad, valor in DEFAULT_NECESSITY_VECTOR.items()
+            }
+        return perfil_decaido(guardado["base"], guardado["fijado"], time.time() if ahora is None else ahora)
+
+    def fijar(self, estado, perfil, ahora=None):
+        """Nueva base = perfil (acotado a 0–100) en el instante ahora. Lo no numérico conserva el valor actual."""
+        ahora = time.time() if ahora is None else ahora
+        actual = self.leer(estado, ahora)
+        base = []
+        for necesidad in NECESIDADES_PERFIL:
+            valor = perfil.get(necesidad)
+            if isinstance(valor, str):
+                try:
+                    valor = float(valor)
+                except ValueError:
+                    pass
+            base.append(min(max(float(valor), 0.0), 100.0) if es_numero(valor) else actual[necesidad])
+        estado.pop("perfil_local", None)
+        estado["perfil"] = {"base": base, "fijado": ahora}
+
+    def aplicar_evento(self, estado, evento, vector=None, ahora=None):
+        """Aplica un evento de EVENTOS_PERFIL con las mismas reglas que engine.js y devuelve el perfil resultante."""
+        ahora = time.time() if ahora is None else ahora
+        fraccion, cambio_ansiedad = EVENTOS_PERFIL[evento]
+        perfil = self.leer(estado, ahora)
+        if fraccion:
+            for necesidad, objetivo in (vector or {}).items():
+                if necesidad != "indicador_ansiedad" and necesidad in perfil and es_numero(objetivo):
+                    perfil[necesidad] = min(perfil[necesidad] + objetivo * fraccion, 100)
+        perfil["indicador_ansiedad"] = min(max(perfil["indicador_ansiedad"] + cambio_ansiedad, 0), 100)
+        self.fijar(estado, perfil, ahora)
+        return self.leer(estado, ahora)
+
+MOTOR_PERFILES = MotorPerfiles()
+
+def perfil_publico(perfil):
+    """Lo que las rutas de perfil devuelven al cliente: las necesidades, sin el indicador de ansiedad."""
+    return {necesidad: perfil[necesidad] for necesidad in NECESIDADES_PUBLICAS}
+
+def es_id_mision(valor):
+    """Los ids de misión son enteros (CASA) o cadenas (SALIR); cualquier otra cosa no se puede buscar."""
+    return isinstance(valor, (int, str)) and not isinstance(valor, bool)
+
+def vector_evento(cuerpo, catalogo):
+    """
+    Vector de necesidades de la misión del evento: por mision_id en el catálogo o el enviado por el cliente.
+    En salir_completada se completa con DEFAULT_NECESSITY_VECTOR, como el vector_entorno_seleccionado
+    que engine.js suma al pulsar el botón GPS; en CASA engine.js usa el vector del paso tal cual.
+    """
+    mision_id = cuerpo.get("mision_id")
+    salir = cuerpo.get("evento") == "salir_completada"
+    if mision_id is None:
+        vector = cuerpo.get("vector_necesidades")
+        vector = vector if isinstance(vector, dict) else None
+    else:
+        if salir:
+            mision = catalogo.salir_por_id().get(mision_id)
+        else:
+            mision = next(
+                (catalogo.particion(clave).por_id[mision_id] for clave in CLAVES_CASA if mision_id in catalogo.particion(clave).por_id),
+                None
+            )
+        vector = None if mision is None else mision.vector_necesidades
+    if vector is None or not salir:
+        return vector
+    return {**DEFAULT_NECESSITY_VECTOR, **vector}
+
+def sesion_requerida(token):
+    if ALMACEN_SESIONES is None:
+        return "Las sesiones están desactivadas en este servidor."
+    if token is None:
+        return "Se requiere 'sesion'."
+    return None
+
+def respuesta_sesion_desconocida(token):
+    return RespuestaJSONRapida(status_code=404, content={
+        "error": "Sesión desconocida o caducada: reenvía el estado completo a /api/mando-integral.",
+        "sesion": token,
+        "sesion_desconocida": True,
+    })
+
+@app.post("/api/perfil-evento")
+async def perfil_evento(request: Request):
+    """Applies a feedback event (mission completed, breathing tap...) to the session's stored profile."""
+    try:
+        cuerpo = await request.json()
+    except Exception:
+        return RespuestaJSONRapida(status_code=400, content={"error": "Payload malformado"})
+    if not isinstance(cuerpo, dict):
+        return RespuestaJSONRapida(status_code=400, content={"error": "Payload malformado"})
+    token = token_sesion(cuerpo.get("sesion"))
+    error = sesion_requerida(token)
+    if error:
+        return RespuestaJSONRapida(status_code=400, content={"error": error})
+    evento = cuerpo.get("evento")
+    if evento not in EVENTOS_PERFIL:
+        return RespuestaJSONRapida(status_code=400, content={"error": f"Evento desconocido. Opciones: {', '.join(EVENTOS_PERFIL)}."})
+    if cuerpo.get("mision_id") is not None and not es_id_mision(cuerpo["mision_id"]):
+        return RespuestaJSONRapida(status_code=400, content={"error": "'mision_id' debe ser un entero o una cadena."})
+    vector = vector_evento(cuerpo, CATALOGO)
+    if vector is None and EVENTOS_PERFIL[evento][0]:
+        return RespuestaJSONRapida(status_code=400, content={"error": "Misión desconocida: envía 'mision_id' o 'vector_necesidades'."})
+    estado = await leer_sesion(token)
+    if estado is None:
+        return respuesta_sesion_desconocida(token)
+    perfil = MOTOR_PERFILES.aplicar_evento(estado, evento, vector)
+    await escribir_sesion(token, estado)
+    return RespuestaJSONRapida({"sesion": token, "perfil_local": perfil_publico(perfil)})
+
+@app.get("/api/perfil")
+async def perfil_sesion(sesion: str):
+    """Current (decayed) profile stored for a session."""
+    token = token_sesion(sesion)
+    error = sesion_requerida(token)
+    if error:
+        return RespuestaJSONRapida(status_code=400, content={"error": error})
+    estado = await leer_sesion(token)
+    if estado is None:
+        return respuesta_sesion_desconocida(token)
+    return RespuestaJSONRapida({"sesion": token, "perfil_local": perfil_publico(MOTOR_PERFILES.leer(estado))})
+
+# ============================================================
+# SELECCIÓN DETERMINISTA
+# Si el cliente envía "semilla" (el sessionSeed de engine.js), la
+# selección usa un random.Random propio de la petición sembrado con
+# esa semilla y con las entradas que deciden el resultado: mismas
+# entradas, mismas misiones (cacheables y reproducibles en pruebas de
+# carga). Entre sesiones la semilla cambia y la variedad es la de
+# siempre. Sin semilla se usa el generador global, como antes.
+# OTG_SELECCION_DETERMINISTA=1 siembra también las peticiones sin semilla.
+# ============================================================
+SELECCION_DETERMINISTA = os.environ.get("OTG_SELECCION_DETERMINISTA", "0") == "1"
+
+def semilla_solicitud(datos, catalogo):
+    """Entero derivado de la semilla del cliente y de las entradas normalizadas, o None (generador global)."""
+    if datos.semilla is None and not SELECCION_DETERMINISTA:
+        return None
+    entradas = json.dumps([
+        datos.semilla or "", datos.modo, datos.mente, datos.zip, datos.budget, datos.perfil, datos.lang,
+        datos.desahogo, list(vars(datos.perfil_local).values()), datos.historial_salir, datos.historial_casa,
+        catalogo.version,
+    ], separators=(",", ":"))
+    return int.from_bytes(hashlib.sha256(entradas.encode()).digest()[:8], "big")
+
+def generador_solicitud(solicitud):
+    semilla = solicitud.get("semilla")
+    return random if semilla is None else random.Random(semilla)
+
+# ============================================================
+# VALIDACIÓN DEL PAYLOAD DE /api/mando-integral
+# Modelo pydantic compilado una vez al importar. En una sola pasada
+# (directamente desde los bytes del cuerpo, sin json.loads previo)
+# convierte números a texto, normaliza modo/lang/mente, valida el zip,
+# ignora claves desconocidas de perfil_local, rellena las necesidades
+# ausentes con DEFAULT_NECESSITY_VECTOR y acota cada una a 0–100.
+# Cualquier fallo se responde con un 400 {"error": ...}.
+# ============================================================
+TextoMayusculas = Annotated[str, StringConstraints(strip_whitespace=True, to_upper=True)]
+TextoMinusculas = Annotated[str, StringConstraints(strip_whitespace=True, to_lower=True)]
+IdMision = Union[int, str]
+MENSAJE_ZIP_INVALIDO = "Código Postal inválido. Debe ser 5 dígitos numéricos."
+
+PerfilNecesidades = create_model(
+    "PerfilNecesidades",
+    __config__=ConfigDict(extra="ignore"),
+    **{necesidad: (Annotated[float, Field(allow_inf_nan=False)], valor) for necesidad, valor in DEFAULT_NECESSITY_VECTOR.items()}
+)
+
+class PayloadMando(BaseModel):
+    model_config = ConfigDict(extra="ignore", coerce_numbers_to_str=True)
+
+    modo: TextoMayusculas = ""
+    zip: Annotated[str, StringConstraints(strip_whitespace=True, pattern=r"^(\d{5})?$")] = ""
+    mente: Optional[TextoMinusculas] = "aburrido"
+    budget: Annotated[str, StringConstraints(strip_whitespace=True)] = "0"
+    perfil: TextoMinusculas = "solo"
+    desahogo: TextoMinusculas = ""
+    lang: Optional[TextoMinusculas] = "es"
+    calidez_humana_pregunta: Any = "" # NEW: calidez_humana_pregunta is passed from frontend company flow
+    perfil_local: Optional[PerfilNecesidades] = PerfilNecesidades()
+    historial_salir: Optional[List[IdMision]] = []
+    historial_casa: Optional[List[IdMision]] = []
+    compacto: bool = False
+    siguiente: bool = False # Prefetch del siguiente lote SALIR
+    continuar: bool = False # Paginar el ranking SALIR guardado de la sesión
+    sesion: Optional[str] = None
+    semilla: Optional[str] = None # sessionSeed de engine.js
+
+    @field_validator("mente", "lang", "perfil_local", "historial_salir", "historial_casa", mode="before")
+    @classmethod
+    def nulo_como_ausente(cls, valor, info):
+        """Un null explícito vale lo mismo que omitir el campo, como antes de la validación tipada."""
+        if valor is None:
+            return cls.model_fields[info.field_name].get_default(call_default_factory=True)
+        return valor
+
+def mensaje_validacion(error):
+    """Mensaje de 400 para el primer error de validación del payload."""
+    detalle = error.errors(include_url=False)[0]
+    campo = ".".join(str(parte) for parte in detalle["loc"])
+    if campo == "zip":
+        return MENSAJE_ZIP_INVALIDO
+    if not campo:
+        return "Payload malformado"
+    return f"Campo '{campo}' inválido: {detalle['msg']}"
+
+def acotar_necesidades(perfil):
+    """Copia del perfil con cada necesidad en 0–100 (min/max en C: el recorrido en Python solo si hay algo fuera de rango)."""
+    if min(perfil.values()) >= 0 and max(perfil.values()) <= 100:
+        return dict(perfil)
+    return {necesidad: min(max(valor, 0), 100) for necesidad, valor in perfil.items()}
+
+def leer_payload_mando(cuerpo):
+    """Valida el cuerpo crudo (bytes) de /api/mando-integral. Devuelve (PayloadMando, None) o (None, error)."""
+    try:
+        return PayloadMando.model_validate_json(cuerpo), None
+    except ValidationError as e:
+        return None, mensaje_validacion(e)
+
+def leer_solicitud_mando(payload, catalogo=None, traza=TRAZA_NULA):
+    """
+    Normaliza el payload de /api/mando-integral (dict ya decodificado o PayloadMando validado).
+    Devuelve (solicitud, None) o (None, mensaje de error para un 400).
+    La solicitud fija la versión del catálogo con la que se atenderá de principio a fin.
+    """
+    if isinstance(payload, PayloadMando):
+        datos = payload
+    else:
+        try:
+            datos = PayloadMando.model_validate(payload)
+        except ValidationError as e:
+            return None, mensaje_validacion(e)
+    traza.marcar("validacion")
+    desahogo_analizado = analizar_desahogo(datos.desahogo)
+    traza.marcar("deteccion_marca")
+    if desahogo_analizado.marca:
+        traza.modo = "RECUPERACION_FORZADA"
+    elif datos.modo == "CASA":
+        traza.modo = "CASA"
+
+    return {
+        "catalogo": catalogo or CATALOGO,
+        "opcion_usuario": datos.modo,
+        "zip_code": datos.zip,
+        "mente": datos.mente,
+        "budget": datos.budget,
+        "perfil_tipo": datos.perfil,
+        "desahogo": datos.desahogo,
+        "lang": datos.lang,
+        "calidez_humana_pregunta": datos.calidez_humana_pregunta,
+        "perfil_local": acotar_necesidades(vars(datos.perfil_local)),
+        "historial_salir": datos.historial_salir,
+        "historial_casa": datos.historial_casa,
+        "compacto": datos.compacto,
+        "siguiente": datos.siguiente,
+        "continuar": datos.continuar,
+        "semilla": semilla_solicitud(datos, catalogo or CATALOGO),
+        "desahogo_analizado": desahogo_analizado,
+        "marca_detectada": desahogo_analizado.marca,
+        "traza": traza,
+    }, None
+
+# ============================================================
+# REGISTRO DE INTERVENCIONES POR MARCA (data/intervenciones_marcas.json)
+# {"por_defecto": {...}, "marcas": {"walmart": {...}, ...}}. Cada marca
+# puede traer instruccion_es / instruccion_en (si faltan se usa
+# "por_defecto", donde {marca} se sustituye por la marca detectada) y un
+# objeto "mision" que sobrescribe campos fijos de la misión de rescate.
+# El orden de "marcas" es la prioridad de detección. Cada plantilla se
+# renderiza al arrancar: en la petición solo falta poner mente y zip.
+# ============================================================
+RUTA_INTERVENCIONES_MARCAS = os.environ.get(
+    "OTG_MARCAS_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "intervenciones_marcas.json")
+)
+CAMPOS_INSTRUCCION_MARCA = ("instruccion_es", "instruccion_en")
+CAMPOS_MISION_MARCA = ("destino_titulo", "destino_titulo_en", "que_hacer", "que_hacer_en", "destino_entorno")
+
+def validar_intervenciones(datos):
+    """Devuelve la lista de errores del registro de marcas (vacía si es válido)."""
+    if not isinstance(datos, dict) or not isinstance(datos.get("marcas"), dict) or not datos["marcas"]:
+        return ["'marcas' ausente o vacío"]
+    por_defecto = datos.get("por_defecto")
+    if not isinstance(por_defecto, dict):
+        return ["'por_defecto' ausente"]
+    errores = [f"por_defecto: falta '{campo}'" for campo in CAMPOS_INSTRUCCION_MARCA if not _texto_valido(por_defecto.get(campo))]
+    for marca, entrada in datos["marcas"].items():
+        if not marca or marca != marca.lower():
+            errores.append(f"{marca!r}: las marcas van en minúsculas")
+        if not isinstance(entrada, dict):
+            errores.append(f"{marca}: se esperaba un objeto")
+            continue
+        errores += [f"{marca}: '{campo}' vacío" for campo in CAMPOS_INSTRUCCION_MARCA if campo in entrada and not _texto_valido(entrada[campo])]
+        mision = entrada.get("mision", {})
+        if not isinstance(mision, dict):
+            errores.append(f"{marca}: 'mision' debe ser un objeto")
+            continue
+        errores += [
+            f"{marca}: campo de misión no admitido o vacío '{campo}'"
+            for campo, valor in mision.items()
+            if campo not in CAMPOS_MISION_MARCA or not _texto_valido(valor)
+        ]
+    return errores
+
+def escapar_formato(texto):
+    return texto.replace("{", "{{").replace("}", "}}")
+
+class IntervencionMarca:
+    """Misión de rescate pre-renderizada para una marca; `mision(mente, zip)` solo completa lo variable."""
+    __slots__ = ("marca", "plantilla", "diagnostico_es", "diagnostico_en", "prefijo_mapa")
+
+    def __init__(self, clave, entrada, por_defecto):
+        marca = clave.capitalize() # Igual que la marca detectada
+        self.marca = marca
+        instrucciones = {
+            campo: entrada.get(campo) or por_defecto[campo].replace("{marca}", marca)
+            for campo in CAMPOS_INSTRUCCION_MARCA
+        }
+        self.plantilla = {
+            "destino_id": 999,
+            "destino_titulo": f"HACKEO A {marca.upper()}",
+            "destino_titulo_en": f"HACKING {marca.upper()}",
+            "que_hacer": "Interrupción de Control Mental y Retorno al Cuerpo.",
+            "que_hacer_en": "Mental Control Interruption & Return to Body.",
+            "destino_entorno": "PERÍMETRO DE ACCIÓN DE CAMPO",
+            "destino_instruccion": instrucciones["instruccion_es"], # Instrucción concisa ES
+            "destino_instruccion_en": instrucciones["instruccion_en"], # Instrucción concisa EN
+            "destino_coordenadas_gps": None,
+            "vector_entorno_seleccionado": {**DEFAULT_NECESSITY_VECTOR, "homeostasis_urgente": True},
+            "diagnostico_sintoma_es": None,
+            "diagnostico_sintoma_en": None,
+            **entrada.get("mision", {}),
+        }
+        marca_formato = escapar_formato(marca)
+        self.diagnostico_es = f"Diagnóstico: El cliente experimenta [{{mente}}] en relación al estímulo corporativo [{marca_formato}] en Zip Code {{zip}}."
+        self.diagnostico_en = f"Diagnostic: Client experiences [{{mente}}] linked to corporate stimulus [{marca_formato}] in Zip Code {{zip}}."
+        # quote_plus codifica carácter a carácter: quote_plus(a + b) == quote_plus(a) + quote_plus(b)
+        self.prefijo_mapa = f"{link_base}{urllib.parse.quote_plus(f'{marca} in ')}"
+
+    def mision(self, mente, zip_code):
+        mente_str = mente.upper()
+        return {
+            **self.plantilla,
+            "destino_coordenadas_gps": self.prefijo_mapa + urllib.parse.quote_plus(zip_code),
+            "diagnostico_sintoma_es": self.diagnostico_es.format(mente=mente_str, zip=zip_code),
+            "diagnostico_sintoma_en": self.diagnostico_en.format(mente=mente_str, zip=zip_code),
+        }
+
+class RegistroIntervenciones:
+    def __init__(self, datos):
+        errores = validar_intervenciones(datos)
+        if errores:
+            raise ValueError("Registro de marcas inválido:\n  " + "\n  ".join(errores))
+        self.claves = tuple(datos["marcas"]) # Por prioridad de detección
+        self.por_defecto = datos["por_defecto"]
+        self.por_marca = {
+            clave.capitalize(): IntervencionMarca(clave, entrada, self.por_defecto)
+            for clave, entrada in datos["marcas"].items()
+        }
+
+    def intervencion(self, marca):
+        intervencion = self.por_marca.get(marca)
+        if intervencion is None: # Marca fuera del registro: se renderiza con las instrucciones por defecto
+            intervencion = IntervencionMarca(marca.lower(), {}, self.por_defecto)
+        return intervencion
+
+def cargar_intervenciones(ruta):
+    with open(ruta, encoding="utf-8") as archivo:
+        return RegistroIntervenciones(json.load(archivo))
+
+INTERVENCIONES_MARCAS = cargar_intervenciones(RUTA_INTERVENCIONES_MARCAS)
 
-    if zip_code and not re.fullmatch(r"^\d{5}$", zip_code):
-        return JSONResponse(
-            status_code=400,
-            content={"error": "Código Postal inválido. Debe ser 5 dígitos numéricos."}
+# ==========================================================================================
+# MANIFIESTO MATRICIAL ABSOLUTO: TRADUCTOR PARÁSITO E INTERCEPTOR RECONFIGURADO V2
+# Marcas, frases de búsqueda de empleo y palabras sensibles se buscan en una
+# sola pasada con una regex compilada al arrancar: los términos forman un trie
+# y cada posición del texto se recorre una vez, así que el coste por solicitud
+# no crece con el número de términos.
+# ==========================================================================================
+MARCAS_INTERCEPTADAS = INTERVENCIONES_MARCAS.claves # Por prioridad
+FRASES_BUSQUEDA_EMPLEO = ("quiero buscar trabajo", "necesito un empleo", "busco trabajo", "find a job", "looking for work")
+PALABRAS_SENSIBLES = (
+    "trabajo", "empleo", "job", "jobs", "work", "career", "interview", "resume", "cv", "curriculum", "linkedin", "indeed", "networking", "cliente", "client", "empresa", "company", "income", "earn money", "ganar dinero", "producir", "productividad", "buscar oportunidades", "buscar ofertas", "enviar currículo", "actualizar linkedin", "conseguir empleo", "salir a buscar trabajo", "metas profesionales", "presion economica", "presión económica", "biles", "deudas", "misery", "exploitation", "amazon", "walmart", "costco", "fresco", "tienda", "comprar", "dinero", "economy", "oportunidades laborales", "solicitudes de empleo", "visitar empresas", "buscando clientes", "producir dinero", "obligaciones laborales", "responsabilidades", "tareas", "negocio", "negocios", "presión", "presiones"
+)
+
+def regex_trie(terminos):
+    """Alternativa regex con los prefijos comunes factorizados; en cada posición casa el término más largo."""
+    trie = {}
+    for termino in terminos:
+        nodo = trie
+        for caracter in termino:
+            nodo = nodo.setdefault(caracter, {})
+        nodo[""] = {}
+
+    def emitir(nodo):
+        ramas = [re.escape(caracter) + emitir(hijo) for caracter, hijo in sorted(nodo.items()) if caracter]
+        if not ramas:
+            return ""
+        cuerpo = ramas[0] if len(ramas) == 1 else "(?:" + "|".join(ramas) + ")"
+        return f"(?:{cuerpo})?" if "" in nodo else cuerpo
+
+    return emitir(trie)
+
+class CoincidenciasDesahogo:
+    """Resultado de analizar un desahogo: términos encontrados por categoría y sus posiciones."""
+    __slots__ = ("marcas", "frases_empleo", "palabras_sensibles", "posiciones")
+
+    def __init__(self, marcas, frases_empleo, palabras_sensibles, posiciones):
+        self.marcas = marcas # En orden de prioridad de MARCAS_INTERCEPTADAS
+        self.frases_empleo = frases_empleo
+        self.palabras_sensibles = palabras_sensibles
+        self.posiciones = posiciones # [(inicio, término), ...] en orden de aparición
+
+    @property
+    def busca_empleo(self):
+        return bool(self.frases_empleo)
+
+    @property
+    def marca(self):
+        """Marca a interceptar (capitalizada) o None; quien busca empleo explícitamente no se intercepta."""
+        if self.busca_empleo or not self.marcas:
+            return None
+        return self.marcas[0].capitalize()
+
+class DetectorDesahogo:
+    """Encuentra todas las apariciones (también solapadas) de los términos de cada categoría en una pasada."""
+
+    def __init__(self, marcas, frases_empleo, palabras_sensibles):
+        self.prioridad_marcas = {marca: posicion for posicion, marca in enumerate(marcas)}
+        self.frases_empleo = frozenset(frases_empleo)
+        self.palabras_sensibles = frozenset(palabras_sensibles)
+        terminos = set(marcas) | self.frases_empleo | self.palabras_sensibles
+        # La regex devuelve el término más largo de cada posición; los términos que son prefijo suyo también están ahí
+        self.prefijos = {
+            termino: tuple(otro for otro in terminos if termino.startswith(otro))
+            for termino in terminos
+        }
+        self._patron = re.compile(f"(?=({regex_trie(terminos)}))")
+
+    def analizar(self, texto):
+        posiciones = []
+        if texto:
+            for coincidencia in self._patron.finditer(texto.lower()):
+                inicio = coincidencia.start()
+                posiciones += [(inicio, termino) for termino in self.prefijos[coincidencia.group(1)]]
+        encontrados = {termino for _, termino in posiciones}
+        return CoincidenciasDesahogo(
+            marcas=tuple(sorted(encontrados.intersection(self.prioridad_marcas), key=self.prioridad_marcas.get)),
+            frases_empleo=tuple(sorted(encontrados & self.frases_empleo)),
+            palabras_sensibles=tuple(sorted(encontrados & self.palabras_sensibles)),
+            posiciones=posiciones,
         )
 
-    perfil_local = payload.get("perfil_local", {})
-    if not isinstance(perfil_local, dict):
-        perfil_local = {}
+DETECTOR_DESAHOGO = DetectorDesahogo(MARCAS_INTERCEPTADAS, FRASES_BUSQUEDA_EMPLEO, PALABRAS_SENSIBLES)
 
-    perfil_local = {
-        **DEFAULT_NECESSITY_VECTOR,
-        **{k: v for k, v in perfil_local.items() if k in DEFAULT_NECESSITY_VECTOR or k == "indicador_ansiedad"}
-    }
+def analizar_desahogo(desahogo):
+    return DETECTOR_DESAHOGO.analizar(desahogo)
 
-    if "indicador_ansiedad" not in perfil_local:
-        perfil_local["indicador_ansiedad"] = 0
+def misiones_objetivo(solicitud):
+    """
+    (misiones, historial, filtro) que se puntúan para la solicitud (todo None si se fuerza
+    la recuperación). En SALIR las misiones son la tabla unificada y el filtro sus ánimos.
+    """
+    if solicitud["marca_detectada"]:
+        return None, None, None
+    catalogo = solicitud["catalogo"]
+    if solicitud["opcion_usuario"] == "CASA":
+        idioma = "EN" if solicitud["lang"] == "en" else "ES"
+        return catalogo.misiones_casa(idioma), solicitud["historial_casa"], None
+    return catalogo.tabla_salir().misiones, solicitud["historial_salir"], catalogo.filtro_salir(solicitud["mente"])
+
+def construir_respuesta_mando(solicitud, scores=None):
+    """Cuerpo JSON de /api/mando-integral. `scores` permite reutilizar un scoring hecho en bloque."""
+    zip_code = solicitud["zip_code"]
+    mente = solicitud["mente"]
+    budget = solicitud["budget"]
+    perfil_tipo = solicitud["perfil_tipo"]
+    lang = solicitud["lang"]
+    perfil_local = solicitud["perfil_local"]
+    traza = solicitud["traza"]
 
     # === INTERCEPCIÓN DE SEGURIDAD Y AVISO LEGAL OBLIGATORIO ===
     ADVERTENCIA_LEGAL_ES = (
@@ -772,199 +2692,517 @@ async def mando_integral(request: Request):
         "Use is at your own risk and exempts May Roga LLC from all liability."
     )
 
-    # Inicialización de variables para evitar NameError en todas las ramas de ejecución
-    marca_detectada = None
-    instruccion_fisiologica_es = "Detente, respira libre."
-    instruccion_fisiologica_en = "Stop, breathe free."
-    diagnostico_sintoma_es = "Agotamiento rutinario."
-    diagnostico_sintoma_en = "Routine exhaustion."
-    enlace_yt = ""
-    enlace_sp = ""
-       
-    # ==========================================================================================
-    # MANIFIESTO MATRICIAL ABSOLUTO: TRADUCTOR PARÁSITO E INTERCEPTOR RECONFIGURADO V2
-    # === MODIFICACIÓN: LÓGICA DE DETECCIÓN Y GENERACIÓN DE MENSAJES CONCISOS ===
-    # ==========================================================================================
-    sensitive_keywords = [
-        "trabajo", "empleo", "job", "jobs", "work", "career", "interview", "resume", "cv", "curriculum", "linkedin", "indeed", "networking", "cliente", "client", "empresa", "company", "income", "earn money", "ganar dinero", "producir", "productividad", "buscar oportunidades", "buscar ofertas", "enviar currículo", "actualizar linkedin", "conseguir empleo", "salir a buscar trabajo", "metas profesionales", "presion economica", "presión económica", "biles", "deudas", "misery", "exploitation", "amazon", "walmart", "costco", "fresco", "tienda", "comprar", "dinero", "economy", "oportunidades laborales", "solicitudes de empleo", "visitar empresas", "buscando clientes", "producir dinero", "obligaciones laborales", "responsabilidades", "tareas", "negocio", "negocios", "presión", "presiones"
-    ]
-   
-    force_recovery_mission = False
-    explicitly_seeking_job = any(phrase in desahogo for phrase in ["quiero buscar trabajo", "necesito un empleo", "busco trabajo", "find a job", "looking for work"])
-   
-    # DETECCIÓN DE SÍNTOMAS CORPORATIVOS O AMBIENTALES DEL ENTORNO DE USA
-    marca_detectada = None
-    if desahogo and not explicitly_seeking_job:
-        desahogo_lower = desahogo.lower()
-        for keyword in ["walmart", "amazon", "costco", "starbucks", "mcdonald", "spotify", "youtube", "tiktok", "instagram"]: # Agregadas marcas de redes
-            if keyword in desahogo_lower:
-                marca_detectada = keyword.capitalize()
-                break
-        if marca_detectada: # Solo forzar si se detectó una marca
-             force_recovery_mission = True
-
     # INVERSIÓN SISTÉMICA CRÍTICA: SI HAY SÍNTOMA CORPORATIVO, NO HUYES A CASA, EJECUTAS UN CONTRAATAQUE DE CAMPO
-    if force_recovery_mission and marca_detectada:
-        mente_str_es = mente.upper()
-        mente_str_en = mente.upper()
-
-        diagnostico_sintoma_es = f"Diagnóstico: El cliente experimenta [{mente_str_es}] en relación al estímulo corporativo [{marca_detectada}] en Zip Code {zip_code}."
-        diagnostico_sintoma_en = f"Diagnostic: Client experiences [{mente_str_en}] linked to corporate stimulus [{marca_detectada}] in Zip Code {zip_code}."
-
-        instruccion_fisiologica_es = ""
-        instruccion_fisiologica_en = ""
-       
-        if marca_detectada == "Walmart":
-            instruccion_fisiologica_es = "Estás en el templo del consumo. Hackea: detén tu marcha, inhala/exhala profundo. Repite: 'Yo soy el único producto que importa hoy'. Sal de la rutina."
-            instruccion_fisiologica_en = "You are in the consumption temple. Hack it: stop, inhale/exhale deeply. Repeat: 'I am the only product that matters today'. Exit routine."
-        elif marca_detectada == "Amazon":
-            instruccion_fisiologica_es = "Tu mente busca dopamina rápida. Bloquea la pantalla. Enfócate en tu espacio biológico: hidrátate o elimina toxinas. Invierte en tus células, no en el mercado digital."
-            instruccion_fisiologica_en = "Mind seeks quick dopamine. Block screen. Focus on biological space: hydrate or detox. Invest in cells, not digital market."
-        elif marca_detectada in ["Youtube", "Tiktok", "Instagram"]:
-            instruccion_fisiologica_es = "El algoritmo secuestra tu atención. Interrumpe el bucle mental. Suelta el teléfono, cierra ojos 60 segundos. Respira profundo, libera estrés."
-            instruccion_fisiologica_en = "Algorithm hijacks attention. Break mental loop. Drop phone, close eyes 60 secs. Breathe deep, release stress."
-        elif marca_detectada == "Spotify":
-            instruccion_fisiologica_es = "Usas sonidos para aislarte. Detén el audio. Ejecuta el Módulo Silencio Mental 1 minuto. Siente tu ritmo cardíaco en este Código Postal."
-            instruccion_fisiologica_en = "You use sounds to isolate. Stop audio. Execute 1-minute Mental Silence Module. Feel your heart rhythm in this Zip Code."
-        else: # Default case
-            instruccion_fisiologica_es = f"Identificaste que [{marca_detectada}] satura tu mente. Rebélate: usa pasillos, aire libre o ventanas. Haz una pausa biológica profunda de 60 segundos. Recupera el control."
-            instruccion_fisiologica_en = f"You identified [{marca_detectada}] saturating your mind. Rebel: use halls, open air, or windows. Take a deep 60-sec biological pause. Regain control."
-
-        query_mapa_url = urllib.parse.quote_plus(f"{marca_detectada} in {zip_code}")
-        target_link = f"{link_base}{query_mapa_url}"
-
-        final_misiones_para_frontend = [{
-            "destino_id": 999,
-            "destino_titulo": f"HACKEO A {marca_detectada.upper()}",
-            "destino_titulo_en": f"HACKING {marca_detectada.upper()}",
-            "que_hacer": "Interrupción de Control Mental y Retorno al Cuerpo.",
-            "que_hacer_en": "Mental Control Interruption & Return to Body.",
-            "destino_entorno": "PERÍMETRO DE ACCIÓN DE CAMPO",
-            "destino_instruccion": instruccion_fisiologica_es, # Instrucción concisa ES
-            "destino_instruccion_en": instruccion_fisiologica_en, # Instrucción concisa EN
-            "destino_coordenadas_gps": target_link,
-            "vector_entorno_seleccionado": {**DEFAULT_NECESSITY_VECTOR, "homeostasis_urgente": True},
-            "diagnostico_sintoma_es": diagnostico_sintoma_es,
-            "diagnostico_sintoma_en": diagnostico_sintoma_en,
-        }]
-
-        return JSONResponse({
+    marca_detectada = solicitud["marca_detectada"]
+    if marca_detectada:
+        mision_rescate = INTERVENCIONES_MARCAS.intervencion(marca_detectada).mision(mente, zip_code)
+        if solicitud["compacto"]:
+            mision_rescate = compactar_mision(mision_rescate)
+        return marcar_compacta(solicitud, {
             "DIRECCIONAMIENTO_MASTER": "ACCION_CAMPO",
-            "misiones": final_misiones_para_frontend,
-            "historial_salir_actualizado": payload.get("historial_salir", []),
-            "forced_recovery": True
+            "misiones": [mision_rescate],
+            "historial_salir_actualizado": solicitud["historial_salir"],
+            "forced_recovery": True,
+            "catalogo_version": solicitud["catalogo"].version
         })
 
     # CONTINUACIÓN CONTINUA DEL FLUJO DE TRABAJO BASE DE LA PLATAFORMA OPEN THAN GO
     # 1. INTERVENCIÓN DOMÉSTICA (MODO CASA)
-    if opcion_usuario == "CASA":
-        idioma = "EN" if lang.lower() == "en" else "ES"
-        misiones_completas = BASE_MISIONES[f"CASA_{idioma}"]
-        historial_casa = payload.get("historial_casa", [])
-        misiones_casa = seleccionar_misiones_casa_inteligente(misiones_completas, perfil_local, historial_casa, cantidad=3)
+    misiones_completas, historial, filtro = misiones_objetivo(solicitud)
+    filas = None if filtro is None else filtro.filas
+    if scores is None:
+        filas, scores = puntuar_candidatos(misiones_completas, perfil_local, historial, filtro=filtro)
+    traza.contar("candidatos_puntuados", len(scores))
+    traza.marcar("scoring")
+    if solicitud["opcion_usuario"] == "CASA":
+        historial_casa = historial
+        misiones_casa = seleccionar_misiones_casa_inteligente(misiones_completas, perfil_local, historial_casa, cantidad=3, scores=scores, filas=filas)
+        traza.marcar("diversidad")
         for m in misiones_casa:
-            historial_casa = actualizar_historial(historial_casa, m["id"], MAX_HISTORY_CASA)
-        return JSONResponse({
+            historial_casa = actualizar_historial(historial_casa, m.id, MAX_HISTORY_CASA)
+        return {
             "DIRECCIONAMIENTO_MASTER": "INTERVENCION_DOMESTICA",
-            "misiones": misiones_casa,
-            "historial_casa_actualizado": historial_casa
-        })
+            "misiones": [m.a_json() for m in misiones_casa],
+            "historial_casa_actualizado": historial_casa,
+            "catalogo_version": solicitud["catalogo"].version
+        }
        
     # ==============================================================================
     # 2. ACTION DE CAMPO (MODO SALIR - SELECCIÓN PREDICTIVA ORIGINAL)
     # ==============================================================================
-    opciones_salir_candidatas = BASE_MISIONES["SALIR"].get(mente, BASE_MISIONES["SALIR"]["aburrido"])
-    historial_salir = payload.get("historial_salir", [])
+    opciones_salir_candidatas = misiones_completas
+    historial_salir = historial
    
-    misiones_seleccionadas_raw = seleccionar_n_misiones_inteligentes(
-        n=3,
-        misiones=opciones_salir_candidatas,
-        perfil_local=perfil_local,
-        historial_actual=historial_salir
+    # Mismo resultado que seleccionar_n_misiones_inteligentes, conservando el ranking para el prefetch y el cursor
+    matriz = matriz_para(opciones_salir_candidatas)
+    ranking, filas = ranking_candidatos(opciones_salir_candidatas, scores, filas)
+    rng = generador_solicitud(solicitud)
+    vistas = IndiceHistorial.de(historial_salir)
+    servidas_antes = solicitud.get("servidas") or frozenset() # "continuar" sin cursor: lo ya servido en la sesión
+    excluidas = set(vistas.recencia) | servidas_antes if servidas_antes else vistas
+    misiones_seleccionadas_raw = elegir_n_diversas(
+        MISIONES_POR_LOTE_SALIR, opciones_salir_candidatas, matriz, ranking, filas, excluidas, rng
     )
+    servidas = servidas_antes | {m.id for m in misiones_seleccionadas_raw}
+    siguiente = None
+    if solicitud["siguiente"]:
+        siguiente = elegir_n_diversas(
+            MISIONES_POR_LOTE_SALIR, opciones_salir_candidatas, matriz, ranking, filas, set(vistas.recencia) | servidas, rng
+        )
+        servidas = servidas | {m.id for m in siguiente}
+    if solicitud.get("sesion"):
+        # Solo se prepara: lo guarda mando_integral si entrega esta respuesta (no si venció el plazo)
+        solicitud["cursor"] = cursor_ranking(solicitud, opciones_salir_candidatas, matriz, ranking, servidas)
+    traza.marcar("diversidad")
    
     final_misiones_para_frontend = []
    
     for info_seleccionada in misiones_seleccionadas_raw:
-        # === MODIFICACIÓN: MENSAJES DE ACOMPAÑAMIENTO Y GASTO ACORTADOS ===
-        precio_real = ""
-        if budget == "0":
-            precio_real = "GASTO: Cero. Recarga sin costo." if lang == "es" else "COST: Zero. Free recharge."
-        elif budget == "1":
-            precio_real = "GASTO: Bajo. Pequeño gusto." if lang == "es" else "COST: Low. Small treat."
-        elif budget == "2":
-            precio_real = "GASTO: Libre. Tu escape." if lang == "es" else "COST: Free. Your escape."
-
-        quienes_van = ""
-        if perfil_tipo == "solo":
-            quienes_van = "ACOMPAÑAMIENTO: Solo. Reconecta." if lang == "es" else "COMPANIONSHIP: Solo. Reconnect."
-        elif perfil_tipo == "familia":
-            quienes_van = "ACOMPAÑAMIENTO: Familia. Desahogo." if lang == "es" else "COMPANIONSHIP: Family. Unwind."
-        elif perfil_tipo == "accesible":
-            quienes_van = "ACOMPAÑAMIENTO: Ruta accesible. Sin barreras." if lang == "es" else "COMPANIONSHIP: Accessible route. No barriers."
-
-        titulo_ganador = info_seleccionada.get("titulo_en", info_seleccionada["titulo"]) if lang == "en" else info_seleccionada["titulo"]
-        donde_base = info_seleccionada.get("donde_en", info_seleccionada["donde"]) if lang == "en" else info_seleccionada["donde"]
-        anclaje_geografico = zip_code
-        map_base_url = link_base
-
-        if lang == "en":
-            # === MODIFICACIÓN: guia_masticada (EN) ACORTADA ===
-            guia_masticada = (
-                f"TARGET: {info_seleccionada.get('titulo_en', info_seleccionada['titulo']) or ''}.\n"
-                f"WHAT TO DO: {info_seleccionada.get('que_hacer_en', info_seleccionada['que_hacer']) or ''}\n"
-                f"WHY: {info_seleccionada.get('porque_en', info_seleccionada['porque']) or ''}\n"
-                f"WHEN: {info_seleccionada.get('cuando_en', info_seleccionada['cuando']) or ''}\n"
-                f"FOR WHAT: {info_seleccionada.get('para_que_en', info_seleccionada['para_que']) or ''}\n"
-                f"{quienes_van}\n{precio_real}"
-            )
-            titulo_ganador_lang = (info_seleccionada.get("titulo_en", info_seleccionada["titulo"]) or "").upper()
-            que_hacer_lang = info_seleccionada.get('que_hacer_en', info_seleccionada['que_hacer']) or ''
-        else:
-            # === MODIFICACIÓN: guia_masticada (ES) ACORTADA ===
-            guia_masticada = (
-                f"DESTINO: {info_seleccionada['titulo'] or ''}.\n"
-                f"POR QUÉ: {info_seleccionada['porque'] or ''}\n"
-                f"QUÉ HACER: {info_seleccionada['que_hacer'] or ''}\n"
-                f"CUÁNDO: {info_seleccionada['cuando'] or ''}\n"
-                f"PARA QUÉ: {info_seleccionada['para_que'] or ''}\n"
-                f"{quienes_van}\n{precio_real}"
-            )
-            titulo_ganador_lang = (info_seleccionada["titulo"] or "").upper()
-            que_hacer_lang = info_seleccionada["que_hacer"] or ""
-
-        search_query_parts = []
-        if perfil_tipo == "accesible":
-            search_query_parts.append("wheelchair accessible")
-        elif perfil_tipo == "familia":
-            search_query_parts.append("family friendly")
-
-        search_query_parts.append(info_seleccionada["gps"])
-        search_query_parts.append(f"in {anclaje_geografico}")
-
-        full_map_query_string = " ".join(search_query_parts)
-        target_link = f"{map_base_url}{urllib.parse.quote_plus(full_map_query_string)}"
-
-        final_vector_necesidades = {**DEFAULT_NECESSITY_VECTOR, **info_seleccionada.get("vector_necesidades", {})}
-
-        final_misiones_para_frontend.append({
-            "destino_id": info_seleccionada.get("id"),
-            "destino_titulo": titulo_ganador_lang,
-            "destino_titulo_en": info_seleccionada.get("titulo_en", info_seleccionada["titulo"]),
-            "que_hacer": info_seleccionada["que_hacer"],
-            "que_hacer_en": info_seleccionada.get("que_hacer_en", info_seleccionada["que_hacer"]),
-            "destino_entorno": donde_base,
-            "destino_instruccion": guia_masticada.strip(),
-            "destino_instruccion_en": guia_masticada.strip(), # Ambos usan el mismo guia_masticada que ya fue construido en el idioma correcto
-            "destino_coordenadas_gps": target_link,
-            "vector_entorno_seleccionado": final_vector_necesidades,
-        })
+        final_misiones_para_frontend.append(
+            mision_salir_renderizada(info_seleccionada, lang, budget, perfil_tipo, zip_code, solicitud["compacto"])
+        )
 
-    return JSONResponse({
+    respuesta = {
         "DIRECCIONAMIENTO_MASTER": "ACCION_CAMPO",
         "misiones": final_misiones_para_frontend,
-        "historial_salir_actualizado": historial_salir
-    })
+        "historial_salir_actualizado": historial_salir,
+        "catalogo_version": solicitud["catalogo"].version
+    }
+    if siguiente is not None:
+        respuesta["siguiente"] = renderizar_lote_salir(solicitud, siguiente)
+    return marcar_compacta(solicitud, respuesta)
+
+# ============================================================
+# PREFETCH Y CURSOR DEL RANKING SALIR
+# "siguiente": true añade a la respuesta el lote que vendría después,
+# elegido del mismo ranking (sin volver a puntuar). Con sesión, los
+# primeros OTG_CURSOR_PROFUNDIDAD candidatos del ranking quedan en la
+# memoria del worker durante OTG_CURSOR_TTL_SEGUNDOS: una petición con
+# "continuar": true y los mismos ánimos pagina ese ranking (salta lo ya
+# servido y el historial) en lugar de puntuar el catálogo otra vez, y se
+# atiende sin pasar por el pool. Si no hay cursor (caducó, cambió el
+# catálogo, se agotó o la petición cae en otro worker) se atiende como
+# siempre, pero sin repetir las misiones ya servidas: sus ids (los
+# OTG_CURSOR_PROFUNDIDAD más recientes) se guardan en el estado de la
+# sesión junto con los ánimos. El cursor solo se guarda si la respuesta
+# que lo generó es la que se entrega (no si venció el plazo y se sirvió
+# la recomendación por defecto). Con OTG_EJECUCION=procesos la selección
+# no deja cursor.
+# ============================================================
+MISIONES_POR_LOTE_SALIR = 3
+TTL_CURSOR_SEGUNDOS = float(os.environ.get("OTG_CURSOR_TTL_SEGUNDOS", 300))
+PROFUNDIDAD_CURSOR = int(os.environ.get("OTG_CURSOR_PROFUNDIDAD", 60))
+MAX_CURSORES = int(os.environ.get("OTG_CURSORES_MAX", 2000))
+MAX_SERVIDAS_SESION = max(PROFUNDIDAD_CURSOR, MISIONES_POR_LOTE_SALIR)
+
+class CursorRanking:
+    """Prefijo del ranking SALIR de una sesión y las misiones ya servidas de él."""
+    __slots__ = ("misiones", "matriz", "candidatos", "mente", "version", "servidas", "expira", "lock")
+
+    def __init__(self, misiones, matriz, candidatos, mente, version, servidas):
+        self.misiones = misiones
+        self.matriz = matriz
+        self.candidatos = candidatos
+        self.mente = mente
+        self.version = version
+        self.servidas = set(servidas)
+        self.expira = time.time() + TTL_CURSOR_SEGUNDOS
+        self.lock = threading.Lock()
+
+    def siguientes(self, n, historial):
+        """El siguiente lote del prefijo guardado, o None si ya no da para un lote completo."""
+        with self.lock:
+            excluidas = self.servidas | set(IndiceHistorial.de(historial).recencia)
+            lote = elegir_n_diversas(n, self.misiones, self.matriz, self.candidatos, (), excluidas)
+            if len(lote) < n:
+                return None
+            self.servidas.update(m.id for m in lote)
+            self.expira = time.time() + TTL_CURSOR_SEGUNDOS
+            return lote
+
+CURSORES_RANKING = CacheLRU(MAX_CURSORES)
+
+def cursor_ranking(solicitud, misiones, matriz, ranking, servidas):
+    if PROFUNDIDAD_CURSOR <= 0:
+        return None
+    return CursorRanking(
+        misiones, matriz, ranking.top(PROFUNDIDAD_CURSOR), solicitud["mente"], solicitud["catalogo"].version, servidas
+    )
+
+def guardar_cursor(solicitud, cuerpo):
+    """Guarda el cursor preparado al construir `cuerpo`, salvo que se entregue otra respuesta (la por defecto)."""
+    cursor = solicitud.pop("cursor", None)
+    if cursor is not None and not cuerpo.get("recomendacion_por_defecto"):
+        CURSORES_RANKING.guardar(solicitud["sesion"], cursor)
+
+def servidas_sesion(estado, solicitud):
+    """Misiones SALIR ya servidas en la sesión que una petición "continuar" no debe repetir."""
+    guardado = (estado or {}).get("cursor_salir")
+    if not solicitud["continuar"] or not guardado or guardado.get("mente") != solicitud["mente"]:
+        return frozenset()
+    return frozenset(guardado["servidas"])
+
+def anotar_servidas(estado, solicitud, cuerpo):
+    """Añade al estado de la sesión las misiones SALIR (y el prefetch) de la respuesta entregada."""
+    if estado is None or cuerpo.get("DIRECCIONAMIENTO_MASTER") != "ACCION_CAMPO" or cuerpo.get("forced_recovery"):
+        return
+    servidas = list(estado["cursor_salir"]["servidas"]) if servidas_sesion(estado, solicitud) else [] # Sin "continuar" el ranking empieza de cero
+    for mision in cuerpo["misiones"] + cuerpo.get("siguiente", []):
+        servidas = actualizar_historial(servidas, mision["destino_id"], MAX_SERVIDAS_SESION)
+    estado["cursor_salir"] = {"mente": solicitud["mente"], "servidas": servidas}
+
+def renderizar_lote_salir(solicitud, lote):
+    return [
+        mision_salir_renderizada(m, solicitud["lang"], solicitud["budget"], solicitud["perfil_tipo"], solicitud["zip_code"], solicitud["compacto"])
+        for m in lote
+    ]
+
+def respuesta_desde_cursor(solicitud):
+    """Cuerpo SALIR con la siguiente página del cursor de la sesión, o None si no hay uno utilizable."""
+    token = solicitud.get("sesion")
+    if not token or not solicitud["continuar"] or solicitud["opcion_usuario"] == "CASA" or solicitud["marca_detectada"]:
+        return None
+    cursor = CURSORES_RANKING.obtener(token, es_valida=lambda c: c.expira > time.time())
+    if cursor is None or cursor.version != solicitud["catalogo"].version or cursor.mente != solicitud["mente"]:
+        return None
+    lote = cursor.siguientes(MISIONES_POR_LOTE_SALIR, solicitud["historial_salir"])
+    if lote is None:
+        return None
+    respuesta = {
+        "DIRECCIONAMIENTO_MASTER": "ACCION_CAMPO",
+        "misiones": renderizar_lote_salir(solicitud, lote),
+        "historial_salir_actualizado": solicitud["historial_salir"],
+        "catalogo_version": solicitud["catalogo"].version,
+        "desde_cursor": True,
+    }
+    if solicitud["siguiente"]:
+        siguiente = cursor.siguientes(MISIONES_POR_LOTE_SALIR, solicitud["historial_salir"])
+        if siguiente is not None:
+            respuesta["siguiente"] = renderizar_lote_salir(solicitud, siguiente)
+    return marcar_compacta(solicitud, respuesta)
+
+# ============================================================
+# EJECUCIÓN DE LA SELECCIÓN FUERA DEL EVENT LOOP
+# OTG_EJECUCION: "hilos" (por defecto) o "procesos" envían el scoring,
+# la diversidad y el render a un pool acotado; "directo" los ejecuta en
+# el propio event loop (comportamiento original).
+# - Contrapresión: con OTG_SELECCION_MAX_EN_CURSO tareas en curso o en
+#   cola, la petición recibe un 503 con Retry-After en vez de encolarse.
+# - Plazo: si la selección no termina en OTG_SELECCION_PLAZO_MS se
+#   responde con la recomendación por defecto precalculada (perfil
+#   neutro, sin historial) marcada con "recomendacion_por_defecto": true.
+# En modo "procesos" cada hijo conserva su copia del catálogo y la
+# recarga si la versión pedida no coincide con la suya.
+# /api/mando-integral-lote pasa por el mismo pool: el lote se reparte
+# en tramos (uno por trabajador como mucho), cada tramo ocupa una plaza
+# de la contrapresión y los que no terminan en OTG_LOTE_PLAZO_MS
+# reciben la recomendación por defecto.
+# ============================================================
+MODO_EJECUCION = os.environ.get("OTG_EJECUCION", "hilos")
+TRABAJADORES_SELECCION = int(os.environ.get("OTG_SELECCION_TRABAJADORES", os.cpu_count() or 1))
+MAX_SELECCIONES_EN_CURSO = int(os.environ.get("OTG_SELECCION_MAX_EN_CURSO", TRABAJADORES_SELECCION * 8))
+PLAZO_SELECCION_SEGUNDOS = float(os.environ.get("OTG_SELECCION_PLAZO_MS", 2000)) / 1000
+
+def construir_respuesta_en_hilo(solicitud):
+    solicitud["traza"].marcar("cola")
+    return construir_respuesta_mando(solicitud)
+
+def construir_respuesta_en_proceso(datos, version_catalogo, servidas=()):
+    """Punto de entrada en los procesos hijos: valida de nuevo el payload y atiende con el catálogo pedido."""
+    if CATALOGO.version != version_catalogo:
+        recargar_catalogo()
+    solicitud, error = leer_solicitud_mando(datos)
+    if error:
+        return {"error": error}
+    solicitud["servidas"] = frozenset(servidas)
+    return construir_respuesta_mando(solicitud)
+
+class EjecutorSeleccion:
+    """Pool acotado con contador de tareas en curso (solo se toca desde el event loop)."""
+
+    def __init__(self, modo, trabajadores, max_en_curso, plazo):
+        if modo not in ("directo", "hilos", "procesos"):
+            raise ValueError(f"OTG_EJECUCION no reconocido: {modo!r}")
+        self.modo = modo
+        self.trabajadores = trabajadores
+        self.max_en_curso = max_en_curso
+        self.plazo = plazo
+        self.en_curso = 0
+        self.rechazadas = 0
+        self.fuera_de_plazo = 0
+        self._pool = None
+
+    def _obtener_pool(self):
+        # Se crea en el primer uso: con gunicorn, ya dentro de cada worker y no en el maestro
+        if self._pool is None:
+            if self.modo == "procesos":
+                self._pool = ProcessPoolExecutor(max_workers=self.trabajadores)
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=self.trabajadores, thread_name_prefix="seleccion")
+        return self._pool
+
+    def admite(self, tareas):
+        return self.modo == "directo" or self.en_curso + tareas <= self.max_en_curso
+
+    def lleno(self):
+        return not self.admite(1)
+
+    def _liberar(self, _futuro):
+        self.en_curso -= 1
+
+    def _enviar(self, funcion, *argumentos):
+        futuro = asyncio.get_running_loop().run_in_executor(self._obtener_pool(), funcion, *argumentos)
+        self.en_curso += 1
+        futuro.add_done_callback(self._liberar) # Cuenta hasta que el trabajo acaba de verdad, aunque venza el plazo
+        return futuro
+
+    async def ejecutar(self, solicitud, datos):
+        """Cuerpo de la respuesta de `solicitud`; `datos` es el payload serializable para el modo procesos."""
+        if self.modo == "directo":
+            return construir_respuesta_mando(solicitud)
+        if self.modo == "procesos":
+            futuro = self._enviar(construir_respuesta_en_proceso, datos, solicitud["catalogo"].version, tuple(solicitud.get("servidas", ())))
+        else:
+            futuro = self._enviar(construir_respuesta_en_hilo, solicitud)
+        try:
+            return await asyncio.wait_for(asyncio.shield(futuro), self.plazo)
+        except asyncio.TimeoutError:
+            self.fuera_de_plazo += 1
+            return respuesta_por_defecto(solicitud)
+
+    async def ejecutar_lote(self, tramos, catalogo, plazo):
+        """Resultados de cada tramo de payloads, en orden. Los tramos que vencen `plazo` reciben la respuesta por defecto."""
+        if self.modo == "directo":
+            return [atender_lote(tramo, catalogo) for tramo in tramos]
+        if self.modo == "procesos":
+            futuros = [self._enviar(atender_lote_en_proceso, tramo, catalogo.version) for tramo in tramos]
+        else:
+            futuros = [self._enviar(atender_lote, tramo, catalogo) for tramo in tramos]
+        if futuros:
+            await asyncio.wait(futuros, timeout=plazo) # No cancela los que siguen en curso
+        resultados = []
+        for tramo, futuro in zip(tramos, futuros):
+            if futuro.done():
+                resultados.append(futuro.result())
+            else:
+                self.fuera_de_plazo += 1
+                resultados.append(respuestas_por_defecto_lote(tramo, catalogo))
+        return resultados
+
+    def cerrar(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def exportar(self):
+        return [
+            "# TYPE otg_seleccion_en_curso gauge",
+            f"otg_seleccion_en_curso {self.en_curso}",
+            "# TYPE otg_seleccion_rechazadas_total counter",
+            f"otg_seleccion_rechazadas_total {self.rechazadas}",
+            "# TYPE otg_seleccion_fuera_de_plazo_total counter",
+            f"otg_seleccion_fuera_de_plazo_total {self.fuera_de_plazo}",
+        ]
+
+EJECUTOR_SELECCION = EjecutorSeleccion(MODO_EJECUCION, TRABAJADORES_SELECCION, MAX_SELECCIONES_EN_CURSO, PLAZO_SELECCION_SEGUNDOS)
+
+@app.on_event("shutdown")
+async def cerrar_ejecutor_seleccion():
+    EJECUTOR_SELECCION.cerrar()
+
+def misiones_por_defecto(solicitud):
+    """Las mejores misiones para el perfil neutro y sin historial, precalculadas al compilar la partición."""
+    catalogo = solicitud["catalogo"]
+    if solicitud["opcion_usuario"] == "CASA":
+        return catalogo.particion(f"CASA_{'EN' if solicitud['lang'] == 'en' else 'ES'}").por_defecto
+    filtro = catalogo.filtro_salir(solicitud["mente"])
+    return filtro.tabla.por_defecto(filtro)
+
+def respuesta_por_defecto(solicitud):
+    """Respuesta con la misma forma que la normal, usada cuando la selección personalizada vence su plazo."""
+    seleccion = misiones_por_defecto(solicitud)
+    if solicitud["opcion_usuario"] == "CASA":
+        historial_casa = list(solicitud["historial_casa"])
+        for m in seleccion:
+            historial_casa = actualizar_historial(historial_casa, m.id, MAX_HISTORY_CASA)
+        respuesta = {
+            "DIRECCIONAMIENTO_MASTER": "INTERVENCION_DOMESTICA",
+            "misiones": [m.a_json() for m in seleccion],
+            "historial_casa_actualizado": historial_casa,
+        }
+    else:
+        respuesta = {
+            "DIRECCIONAMIENTO_MASTER": "ACCION_CAMPO",
+            "misiones": [
+                mision_salir_renderizada(m, solicitud["lang"], solicitud["budget"], solicitud["perfil_tipo"], solicitud["zip_code"], solicitud["compacto"])
+                for m in seleccion
+            ],
+            "historial_salir_actualizado": solicitud["historial_salir"],
+        }
+    respuesta["catalogo_version"] = solicitud["catalogo"].version
+    respuesta["recomendacion_por_defecto"] = True
+    return marcar_compacta(solicitud, respuesta)
+
+@app.post("/api/mando-integral")
+async def mando_integral(request: Request):
+    """
+    Main API endpoint for OPEN THAN GO.
+    Receives user input and local preference profile to return a personalized recommendation.
+    """
+    if EJECUTOR_SELECCION.lleno():
+        EJECUTOR_SELECCION.rechazadas += 1
+        return RespuestaJSONRapida(status_code=503, content={"error": "Servidor saturado, reintenta en un momento."}, headers={"Retry-After": "1"})
+    traza = nueva_traza()
+    cuerpo_crudo = await request.body()
+    payload, error = leer_payload_mando(cuerpo_crudo) # Decodifica y valida en una sola pasada
+    if error:
+        return RespuestaJSONRapida(status_code=400, content={"error": error})
+    token = token_sesion(payload.sesion)
+    if token: # Con sesión hace falta el dict crudo para fusionar el delta con el estado guardado
+        payload, estado_sesion = await hidratar_payload_sesion(json.loads(cuerpo_crudo), token)
+    traza.marcar("parseo_json")
+    solicitud, error = leer_solicitud_mando(payload, traza=traza)
+    if error:
+        return RespuestaJSONRapida(status_code=400, content={"error": error})
+    cuerpo = None
+    if token:
+        solicitud["sesion"] = token # Deja (o pagina) el cursor del ranking SALIR de la sesión
+        solicitud["servidas"] = servidas_sesion(estado_sesion, solicitud)
+        cuerpo = respuesta_desde_cursor(solicitud)
+    if cuerpo is not None: # Página del ranking guardado: nada que puntuar
+        pass
+    elif solicitud["marca_detectada"]: # Recuperación forzada: plantilla pre-renderizada, no merece un salto al pool
+        cuerpo = construir_respuesta_mando(solicitud)
+    else:
+        datos = payload.model_dump() if isinstance(payload, PayloadMando) else payload
+        cuerpo = await EJECUTOR_SELECCION.ejecutar(solicitud, datos)
+        if "error" in cuerpo:
+            return RespuestaJSONRapida(status_code=400, content=cuerpo)
+    if token:
+        guardar_cursor(solicitud, cuerpo)
+        anotar_servidas(estado_sesion, solicitud, cuerpo)
+        cuerpo = await cerrar_respuesta_sesion(cuerpo, token, estado_sesion)
+    respuesta = RespuestaJSONRapida(cuerpo)
+    traza.marcar("render")
+    traza.cerrar()
+    return respuesta
+
+# ==============================================================================
+# LOTE: RECOMENDACIONES PARA EQUIPOS COMPLETOS (INTEGRACIONES DE EMPRESA)
+# ==============================================================================
+MAX_SOLICITUDES_LOTE = 500
+TRAMO_MINIMO_LOTE = int(os.environ.get("OTG_LOTE_TRAMO_MINIMO", 25)) # Por debajo no compensa repartir
+PLAZO_LOTE_SEGUNDOS = float(os.environ.get("OTG_LOTE_PLAZO_MS", 5000)) / 1000
+
+def tramos_lote(payloads, partes):
+    """Reparte los payloads en como mucho `partes` tramos contiguos de al menos TRAMO_MINIMO_LOTE (salvo si no llegan)."""
+    if not payloads:
+        return []
+    partes = max(1, min(partes, len(payloads) // max(1, TRAMO_MINIMO_LOTE)))
+    tamano = -(-len(payloads) // partes)
+    return [payloads[inicio:inicio + tamano] for inicio in range(0, len(payloads), tamano)]
+
+def atender_lote(payloads, catalogo):
+    """
+    Respuestas de una lista de payloads (ya hidratados con su sesión), en el mismo orden.
+    Los payloads que puntúan la misma lista de misiones se puntúan juntos como una matriz perfil x misión.
+    """
+    resultados = [None] * len(payloads)
+    solicitudes = [None] * len(payloads)
+    grupos = {} # (id(lista de misiones), ánimos) -> (lista, filas, [(posición, historial)])
+    for posicion, payload in enumerate(payloads):
+        solicitud, error = leer_solicitud_mando(payload, catalogo)
+        if error:
+            resultados[posicion] = {"error": error}
+            continue
+        solicitudes[posicion] = solicitud
+        misiones, historial, filtro = misiones_objetivo(solicitud)
+        filas = None if filtro is None else filtro.filas
+        if (
+            misiones is None # Recuperación forzada
+            or limite_recuperacion(len(misiones) if filas is None else len(filas)) # Lista corta propia de cada perfil
+            or (filtro is not None and filtro.pesos is not None) # Mezcla de ánimos
+        ):
+            resultados[posicion] = construir_respuesta_mando(solicitud)
+            continue
+        clave = (id(misiones), None if filtro is None else filtro.mascara)
+        grupos.setdefault(clave, (misiones, filas, []))[2].append((posicion, historial))
+
+    for misiones, filas, miembros in grupos.values():
+        filas_scores = matriz_para(misiones).puntuar_lote(
+            [solicitudes[posicion]["perfil_local"] for posicion, _ in miembros],
+            [historial for _, historial in miembros],
+            filas
+        )
+        for (posicion, _), scores in zip(miembros, filas_scores):
+            resultados[posicion] = construir_respuesta_mando(solicitudes[posicion], scores=scores)
+    return resultados
+
+def atender_lote_en_proceso(payloads, version_catalogo):
+    """Punto de entrada de un tramo del lote en los procesos hijos."""
+    if CATALOGO.version != version_catalogo:
+        recargar_catalogo()
+    return atender_lote(payloads, CATALOGO)
+
+def respuestas_por_defecto_lote(payloads, catalogo):
+    """Respuestas de un tramo que venció el plazo: la recomendación por defecto de cada payload."""
+    respuestas = []
+    for payload in payloads:
+        solicitud, error = leer_solicitud_mando(payload, catalogo)
+        if error:
+            respuestas.append({"error": error})
+        elif solicitud["marca_detectada"]: # Plantilla pre-renderizada, igual que fuera de plazo en mando_integral
+            respuestas.append(construir_respuesta_mando(solicitud))
+        else:
+            respuestas.append(respuesta_por_defecto(solicitud))
+    return respuestas
+
+@app.post("/api/mando-integral-lote")
+async def mando_integral_lote(request: Request):
+    """
+    Batch version of /api/mando-integral for partner/company integrations.
+    Receives {"solicitudes": [payload, ...]} and returns {"resultados": [...]} in the same order.
+    Payloads that target the same mission list are scored together as one profile x mission matrix.
+    """
+    try:
+        cuerpo = await request.json()
+    except Exception:
+        return JSONResponse(status_code=400, content={"error": "Payload malformado"})
+    solicitudes_raw = cuerpo.get("solicitudes") if isinstance(cuerpo, dict) else None
+    if not isinstance(solicitudes_raw, list):
+        return JSONResponse(status_code=400, content={"error": "Se esperaba 'solicitudes' como lista de payloads."})
+    if len(solicitudes_raw) > MAX_SOLICITUDES_LOTE:
+        return JSONResponse(status_code=413, content={"error": f"Máximo {MAX_SOLICITUDES_LOTE} solicitudes por lote."})
+    posiciones = [posicion for posicion, payload in enumerate(solicitudes_raw) if isinstance(payload, dict)]
+    partes = 1 if EJECUTOR_SELECCION.modo == "directo" else EJECUTOR_SELECCION.trabajadores
+    if not EJECUTOR_SELECCION.admite(len(tramos_lote(posiciones, partes))):
+        EJECUTOR_SELECCION.rechazadas += 1
+        return RespuestaJSONRapida(status_code=503, content={"error": "Servidor saturado, reintenta en un momento."}, headers={"Retry-After": "1"})
+
+    catalogo = CATALOGO # Todo el lote se atiende con la misma versión del catálogo
+    resultados = [{"error": "Payload malformado"} for _ in solicitudes_raw]
+    payloads = []
+    sesiones = {} # posición -> (token, estado guardado)
+    for posicion in posiciones:
+        payload = solicitudes_raw[posicion]
+        token = token_sesion(payload.get("sesion"))
+        if token:
+            payload, estado_sesion = await hidratar_payload_sesion(payload, token)
+            sesiones[posicion] = (token, estado_sesion)
+        payloads.append(payload)
+
+    tramos = tramos_lote(payloads, partes)
+    respuestas = [respuesta for tramo in await EJECUTOR_SELECCION.ejecutar_lote(tramos, catalogo, PLAZO_LOTE_SEGUNDOS) for respuesta in tramo]
+    for posicion, respuesta in zip(posiciones, respuestas):
+        resultados[posicion] = respuesta
+
+    for posicion, (token, estado_sesion) in sesiones.items():
+        if "error" not in resultados[posicion]:
+            await cerrar_respuesta_sesion(resultados[posicion], token, estado_sesion)
+    for payload, resultado in zip(solicitudes_raw, resultados):
+        if isinstance(payload, dict) and "user_id" in payload:
+            resultado["user_id"] = payload["user_id"]
+    return RespuestaJSONRapida({"resultados": resultados})
 
 # ==============================================================================
 # APERTURA NATIVA DEL SERVIDOR FASTAPI (SINOPSIS ESTRUCTURAL DE CIERRE)
@@ -795,6 +795,7 @@ const KERNEL = {
             budget: document.getElementById('budget-selector') ? document.getElementById('budget-selector').value : "0",
             perfil: document.getElementById('perfil-selector') ? document.getElementById('perfil-selector').value : "solo",
             perfil_local: this.obtenerPerfilLocal(),
+            semilla: this.sessionSeed,
         };
 
         if (modoActual === "CASA") {
@@ -962,7 +963,8 @@ const KERNEL = {
                         btnGps.onclick = () => {
                             try {
                                 let perfil = KERNEL.obtenerPerfilLocal();
-                                const selectedVector = KERNEL.datosLugarGlobal.vector_entorno_seleccionado;
+                                // Compact responses omit needs equal to the default vector
+                                const selectedVector = { ...KERNEL.DEFAULT_NECESSITY_PROFILE, ...KERNEL.datosLugarGlobal.vector_entorno_seleccionado };
                                
                                 for (const need in selectedVector) {
                                     if (need !== "indicador_ansiedad" && perfil[need] !== undefined) {
@@ -1101,7 +1103,8 @@ const KERNEL = {
                         desahogo: "",
                         zip: document.getElementById('inp-zip') ? document.getElementById('inp-zip').value.trim() : "",
                         perfil_local: this.obtenerPerfilLocal(),
-                        historial_salir: this.historialSalir
+                        historial_salir: this.historialSalir,
+                        semilla: this.sessionSeed
                     })
                 });
                 const data = await r.json();
@@ -1688,7 +1691,7 @@ Continuar
     // ==========================================================================================
     // MÉTODOS DE STRIPE Y ENTRADA SECRETA ENLAZADOS NATIVAMENTE AL COMPÁS DEL KERNEL ORIGINAL
     // ==========================================================================================
-    procesarPagoStripe(planSeleccionado) { let userId = localStorage.getItem('otg_user_id') || 'cliente_nuevo'; fetch('/crear-checkout', { method: 'POST', headers: { 'Content-Type': 'application/json' }, body: JSON.stringify({ tipo_plan: planSeleccionado, user_id: userId }) }).then(res => res.json()).then(data => { if(data.url) window.location.href = data.url; }).catch(err => console.error('Error de pasarela:', err)); },
+    procesarPagoStripe(planSeleccionado) { let userId = localStorage.getItem('otg_user_id') || 'cliente_nuevo'; let nonce = localStorage.getItem('otg_checkout_nonce'); if (!nonce) { nonce = (window.crypto && crypto.randomUUID) ? crypto.randomUUID() : Math.random().toString(36).substring(2) + Date.now().toString(36); localStorage.setItem('otg_checkout_nonce', nonce); } fetch('/crear-checkout', { method: 'POST', headers: { 'Content-Type': 'application/json' }, body: JSON.stringify({ tipo_plan: planSeleccionado, user_id: userId, nonce_cliente: nonce }) }).then(res => res.json()).then(data => { if(data.url) window.location.href = data.url; }).catch(err => console.error('Error de pasarela:', err)); },
     inicializarBypassDesarrollador() { let clics = 0; let t; const trigger = document.getElementById('cierre-logo') || document.body; trigger.addEventListener('click', () => { clics++; clearTimeout(t); t = setTimeout(() => { clics = 0; }, 1500); if (clics === 3) { clics = 0; let user = prompt("Mantenimiento OTG - Usuario:"); let pass = prompt("Mantenimiento OTG - Contraseña:"); if (!user || !pass) return; fetch('/login-admin', { method: 'POST', headers: { 'Content-Type': 'application/json' }, body: JSON.stringify({ username: user, password: pass }) }).then(res => { if (!res.ok) throw new Error(); return res.json(); }).then(data => { if (data.status === "success") { localStorage.setItem('otg_user_role', 'admin'); alert("Acceso Desarrollador Concedido. Servicio Infinito Activo."); location.reload(); } }).catch(() => alert("Credenciales inválidas de Render. Acceso denegado.")); } }); }
 };
 
@@ -0,0 +1,12 @@
+import os
+import sys
+import tempfile
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+os.chdir(RAIZ) # main.py sirve static/ y data/ con rutas relativas al arrancar
+
+# El vigilante del catálogo no debe correr durante las pruebas
+os.environ.setdefault("OTG_CATALOGO_RECARGA_SEGUNDOS", "0")
+# Las sesiones van a una base temporal, no a data/sesiones.db
+os.environ.setdefault("OTG_SESIONES", "sqlite:" + os.path.join(tempfile.mkdtemp(prefix="otg-pruebas-"), "sesiones.db"))
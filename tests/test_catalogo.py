@@ -0,0 +1,30 @@
+"""ArchivoCatalogo trabaja sobre su propia copia del archivo y la suelta al compilarlo entero."""
+import shutil
+
+import main
+
+def test_reescritura_en_el_sitio_no_afecta_al_catalogo_abierto(tmp_path):
+    ruta = tmp_path / "catalogo_misiones.jsonl"
+    shutil.copyfile(main.RUTA_CATALOGO, ruta)
+    archivo = main.ArchivoCatalogo(str(ruta))
+    casa_es = archivo.leer("CASA_ES")
+    esperado_en = main.ArchivoCatalogo(main.RUTA_CATALOGO).leer("CASA_EN")
+    # Truncar y reescribir en el sitio (lo que os.replace evita) con un archivo mucho más corto
+    with open(ruta, "w", encoding="utf-8") as destino:
+        destino.write('{"particion": "CASA_ES"}\n')
+    assert archivo.leer("CASA_EN") == esperado_en
+    assert archivo.leer("CASA_ES") == casa_es
+    assert archivo.version == main.ArchivoCatalogo(main.RUTA_CATALOGO).version
+
+def test_libera_el_contenido_al_compilar_todas_las_particiones():
+    perezoso = main.CatalogoCompilado(main.ArchivoCatalogo(main.RUTA_CATALOGO))
+    perezoso.misiones_casa("ES")
+    perezoso.tabla_salir()
+    assert not perezoso.archivo.cerrado # Falta CASA_EN
+    perezoso.misiones_casa("EN")
+    assert perezoso.archivo.cerrado
+    assert perezoso.precargar() is perezoso and perezoso.misiones_casa("EN")
+
+    precargado = main.CatalogoCompilado(main.ArchivoCatalogo(main.RUTA_CATALOGO)).precargar()
+    assert precargado.archivo.cerrado
+    assert set(precargado.salir_por_id()) == set(main.CATALOGO.salir_por_id())
@@ -0,0 +1,76 @@
+"""Deduplicación de /crear-checkout contra un stand-in local de la API de Stripe."""
+import http.server
+import itertools
+import json
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+class StripeFalso(http.server.BaseHTTPRequestHandler):
+    """Crea una sesión por petición, salvo que se repita la Idempotency-Key."""
+    protocol_version = "HTTP/1.1"
+    contador = itertools.count(1)
+    por_clave = {}
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        clave = self.headers.get("Idempotency-Key")
+        if clave and clave in self.por_clave:
+            sesion = self.por_clave[clave]
+        else:
+            sesion = f"cs_test_{next(self.contador)}"
+            if clave:
+                self.por_clave[clave] = sesion
+        cuerpo = json.dumps({"id": sesion, "object": "checkout.session", "url": f"https://checkout.test/{sesion}"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def log_message(self, *argumentos):
+        pass
+
+@pytest.fixture(scope="module")
+def api_base():
+    servidor = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StripeFalso)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{servidor.server_address[1]}"
+    servidor.shutdown()
+
+def nueva_pasarela(api_base):
+    return main.PasarelaCheckout("sk_test_falsa", api_base, 2, 5, 0, 30)
+
+@pytest.fixture
+def checkout(api_base, monkeypatch):
+    monkeypatch.setattr(main, "PASARELA_CHECKOUT", nueva_pasarela(api_base))
+    cliente = TestClient(main.app)
+
+    def crear(**data):
+        respuesta = cliente.post("/crear-checkout", json={"tipo_plan": "mensual", **data})
+        assert respuesta.status_code == 200
+        return respuesta.json()["url"]
+    return crear
+
+def test_anonimos_sin_nonce_no_comparten_sesion(checkout):
+    assert checkout(user_id="cliente_nuevo") != checkout(user_id="cliente_nuevo")
+    assert checkout() != checkout()
+
+def test_mismo_nonce_misma_sesion(checkout, api_base, monkeypatch):
+    url = checkout(user_id="cliente_nuevo", nonce_cliente="nonce-a")
+    assert checkout(user_id="cliente_nuevo", nonce_cliente="nonce-a") == url
+    # Otro worker (sin la URL en memoria) recibe la misma sesión gracias a la Idempotency-Key
+    monkeypatch.setattr(main, "PASARELA_CHECKOUT", nueva_pasarela(api_base))
+    assert checkout(user_id="cliente_nuevo", nonce_cliente="nonce-a") == url
+
+def test_nonces_distintos_sesiones_distintas(checkout):
+    assert checkout(user_id="cliente_nuevo", nonce_cliente="nonce-b") != checkout(user_id="cliente_nuevo", nonce_cliente="nonce-c")
+
+def test_reintentos_del_mismo_usuario_real(checkout):
+    url = checkout(user_id="usuario-42", nonce_cliente="nonce-d")
+    assert checkout(user_id="usuario-42", nonce_cliente="nonce-e") == url # Manda el user_id real, no el nonce
+    assert checkout(user_id="usuario-43") != url
+    assert checkout(user_id="usuario-42", tipo_plan="anual") != url
@@ -0,0 +1,49 @@
+"""Cursor del ranking SALIR: paginación sin repetidos y cursor solo desde la respuesta entregada."""
+import time
+import uuid
+
+from fastapi.testclient import TestClient
+
+import main
+
+cliente = TestClient(main.app)
+
+BASE = {"modo": "SALIR", "mente": "aburrido", "lang": "es", "perfil_local": {"movimiento": 80}}
+
+def pedir(**campos):
+    respuesta = cliente.post("/api/mando-integral", json={**BASE, **campos})
+    assert respuesta.status_code == 200
+    return respuesta.json()
+
+def ids(respuesta, campo="misiones"):
+    return [mision["destino_id"] for mision in respuesta.get(campo, [])]
+
+def test_continuar_sin_cursor_no_repite_lo_servido():
+    token = f"prueba-{uuid.uuid4().hex}"
+    primera = pedir(sesion=token, historial_salir=[], historial_casa=[], siguiente=True)
+    servidas = set(ids(primera) + ids(primera, "siguiente"))
+    main.CURSORES_RANKING.limpiar() # Como si la petición cayera en otro worker
+    segunda = pedir(sesion=token, continuar=True)
+    assert "desde_cursor" not in segunda
+    assert not servidas & set(ids(segunda))
+    guardado = main.ALMACEN_SESIONES.obtener(token)["cursor_salir"]
+    assert guardado["mente"] == "aburrido" and servidas | set(ids(segunda)) == set(guardado["servidas"])
+
+def test_sin_continuar_el_ranking_empieza_de_cero():
+    token = f"prueba-{uuid.uuid4().hex}"
+    pedir(sesion=token, historial_salir=[], historial_casa=[])
+    segunda = pedir(sesion=token)
+    assert main.ALMACEN_SESIONES.obtener(token)["cursor_salir"]["servidas"] == ids(segunda)
+
+def test_fuera_de_plazo_no_deja_cursor(monkeypatch):
+    if main.EJECUTOR_SELECCION.modo != "hilos":
+        return
+    monkeypatch.setattr(main.EJECUTOR_SELECCION, "plazo", 0)
+    token = f"prueba-{uuid.uuid4().hex}"
+    respuesta = pedir(sesion=token, historial_salir=[], historial_casa=[])
+    assert respuesta["recomendacion_por_defecto"] is True
+    limite = time.time() + 5
+    while main.EJECUTOR_SELECCION.en_curso and time.time() < limite: # Deja terminar al hilo abandonado
+        time.sleep(0.01)
+    assert main.CURSORES_RANKING.obtener(token) is None
+    assert main.ALMACEN_SESIONES.obtener(token)["cursor_salir"]["servidas"] == ids(respuesta)
@@ -0,0 +1,35 @@
+"""Cabeceras de caché de los estáticos y preguntas por empresa."""
+import json
+
+from fastapi.testclient import TestClient
+
+import main
+
+cliente = TestClient(main.app)
+
+def test_solo_la_url_versionada_es_inmutable():
+    recurso = main.RECURSOS_ESTATICOS["engine.js"]
+    html = cliente.get("/static/session.html").text
+    assert f'"/static/engine.js?v={recurso.version}"' in html
+
+    versionada = cliente.get("/static/engine.js", params={"v": recurso.version})
+    assert versionada.headers["Cache-Control"] == main.CACHE_CONTROL_INMUTABLE
+    for params in ({}, {"v": "000000000000"}):
+        respuesta = cliente.get("/static/engine.js", params=params)
+        assert respuesta.headers["Cache-Control"] == main.CACHE_CONTROL_REVALIDAR
+        assert respuesta.headers["ETag"] == recurso.etag
+
+    revalidada = cliente.get("/static/engine.js", headers={"If-None-Match": recurso.etag})
+    assert revalidada.status_code == 304 and revalidada.headers["Cache-Control"] == main.CACHE_CONTROL_REVALIDAR
+
+def test_preguntas_de_empresa_del_archivo_de_datos(tmp_path, monkeypatch):
+    datos = {"Acme": {"logo_path": "/static/acme.png", "es": ["¿Pregunta?"], "en": ["Question?"]}}
+    ruta = tmp_path / "preguntas_empresas.json"
+    ruta.write_text(json.dumps(datos), encoding="utf-8")
+    preguntas = main.cargar_preguntas_empresas(str(ruta))
+    monkeypatch.setattr(main, "RESPUESTAS_PREGUNTAS_EMPRESAS", main.serializar_preguntas_empresas(preguntas))
+    for idioma in ("es", "en"):
+        respuesta = cliente.get("/api/get-company-questions", params={"company": "ACME", "lang": idioma})
+        assert respuesta.status_code == 200
+        assert respuesta.json() == {"questions": datos["Acme"][idioma], "logo_path": "/static/acme.png"}
+    assert cliente.get("/api/get-company-questions", params={"company": "desconocida"}).status_code == 404
@@ -0,0 +1,51 @@
+"""IndiceHistorial frente a la penalización y el bonus originales, recorriendo la lista en cada llamada."""
+import random
+
+import main
+
+def penalizacion_original(mision_id, historial):
+    if not historial:
+        return 0
+    historial = list(reversed(historial))
+    for posicion, antiguo_id in enumerate(historial):
+        if antiguo_id == mision_id:
+            if posicion == 0:
+                return main.HISTORY_PENALTY_BASE * 1.5
+            elif posicion == 1:
+                return main.HISTORY_PENALTY_BASE
+            elif posicion == 2:
+                return main.HISTORY_PENALTY_BASE * 0.70
+            elif posicion <= (len(historial) - 1):
+                return main.HISTORY_PENALTY_BASE * 0.30
+    return 0
+
+def bonus_original(mision_id, historial):
+    if not historial or mision_id not in historial:
+        return 20
+    if mision_id not in main.limitar_historial(historial, int(main.MAX_HISTORY_SALIR / 2)):
+        return 5
+    return 0
+
+def test_indice_equivale_a_la_curva_escalonada_original():
+    rng = random.Random(20240601)
+    for _ in range(2000):
+        historial = [rng.randint(1, 12) for _ in range(rng.randint(0, 10))] # Con repetidos
+        indice = main.IndiceHistorial(historial)
+        for mision_id in range(0, 14):
+            assert indice.penalizacion(mision_id) == penalizacion_original(mision_id, historial)
+            assert indice.bonus(mision_id) == bonus_original(mision_id, historial)
+            assert (mision_id in indice) == (mision_id in historial)
+
+def test_ajustes_de_la_matriz_usan_el_indice():
+    misiones = main.CATALOGO.misiones_casa("ES")
+    matriz = main.matriz_para(misiones)
+    historial = [misiones[3].id, misiones[0].id, misiones[7].id]
+    ajustes = matriz.ajustes_historial(historial).tolist()
+    for fila, mision in enumerate(misiones):
+        assert ajustes[fila] == bonus_original(mision.id, historial) - penalizacion_original(mision.id, historial)
+
+def test_curvas_configurables():
+    exponencial = main.curva_penalizacion("exponencial:2")
+    assert exponencial(0) == 1.5 and exponencial(2) == 0.75
+    lineal = main.curva_penalizacion("lineal:3")
+    assert lineal(0) == 1.5 and lineal(3) == 0 and lineal(10) == 0
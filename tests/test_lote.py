@@ -0,0 +1,63 @@
+"""Lote repartido en tramos por el pool de selección frente a las peticiones individuales."""
+import copy
+import random
+
+from fastapi.testclient import TestClient
+
+import main
+
+cliente = TestClient(main.app)
+
+def payloads_aleatorios(cantidad, rng):
+    ids = list(main.CATALOGO.salir_por_id())
+    return [{
+        "user_id": f"u{i}",
+        "semilla": f"semilla-{i}",
+        "modo": rng.choice(["CASA", "SALIR"]),
+        "mente": rng.choice(["aburrido", "agotado", "ansioso"]),
+        "lang": rng.choice(["es", "en"]),
+        "desahogo": rng.choice(["", "", "walmart"]),
+        "perfil_local": {k: rng.randint(0, 100) for k in main.DEFAULT_NECESSITY_VECTOR},
+        "historial_salir": [rng.choice(ids) for _ in range(3)],
+        "historial_casa": [rng.randint(1, 80) for _ in range(4)],
+    } for i in range(cantidad)]
+
+def test_tramos_lote():
+    assert main.tramos_lote([], 4) == []
+    payloads = list(range(100))
+    tramos = main.tramos_lote(payloads, 8)
+    assert len(tramos) == 100 // main.TRAMO_MINIMO_LOTE and sum(tramos, []) == payloads
+    assert main.tramos_lote(payloads[:3], 8) == [payloads[:3]]
+
+def test_lote_en_tramos_equivale_a_peticiones_individuales(monkeypatch):
+    monkeypatch.setattr(main, "TRAMO_MINIMO_LOTE", 4)
+    payloads = payloads_aleatorios(30, random.Random(20240601)) + ["basura"]
+    respuesta = cliente.post("/api/mando-integral-lote", json={"solicitudes": copy.deepcopy(payloads)})
+    assert respuesta.status_code == 200
+    resultados = respuesta.json()["resultados"]
+    assert resultados[-1] == {"error": "Payload malformado"}
+    for payload, resultado in zip(payloads, resultados):
+        if not isinstance(payload, dict):
+            continue
+        individual = cliente.post("/api/mando-integral", json=copy.deepcopy(payload)).json()
+        assert resultado.pop("user_id") == payload["user_id"]
+        assert resultado == individual
+
+def test_lote_sin_plazas_libres(monkeypatch):
+    if main.EJECUTOR_SELECCION.modo == "directo":
+        return
+    monkeypatch.setattr(main.EJECUTOR_SELECCION, "en_curso", main.EJECUTOR_SELECCION.max_en_curso)
+    respuesta = cliente.post("/api/mando-integral-lote", json={"solicitudes": payloads_aleatorios(2, random.Random(1))})
+    assert respuesta.status_code == 503 and respuesta.headers["Retry-After"] == "1"
+
+def test_recomendacion_por_defecto_precalculada():
+    def escaneo_completo(misiones, filtro=None):
+        filas, scores = main.puntuar_candidatos(misiones, main.DEFAULT_NECESSITY_VECTOR, [], limite=0, filtro=filtro)
+        return main.mejores_por_defecto(misiones, scores, None if filas is None else filas.tolist())
+    for idioma in ("ES", "EN"):
+        particion = main.CATALOGO.particion(f"CASA_{idioma}")
+        assert particion.por_defecto == escaneo_completo(particion.misiones)
+    tabla = main.CATALOGO.tabla_salir()
+    for consulta in (*main.CATALOGO.mentes, "cansado+ansioso", "aburrido:0.7+ansioso:0.3", "desconocido"):
+        filtro = main.CATALOGO.filtro_salir(consulta)
+        assert tabla.por_defecto(filtro) == escaneo_completo(tabla.misiones, filtro), consulta
@@ -0,0 +1,21 @@
+"""Validación tipada del payload de /api/mando-integral."""
+from fastapi.testclient import TestClient
+
+import main
+
+cliente = TestClient(main.app)
+
+BASE = {"modo": "CASA", "semilla": "semilla-fija"} # Con semilla la selección es determinista
+
+def test_null_explicito_equivale_a_omitir_el_campo():
+    omitidos = cliente.post("/api/mando-integral", json=BASE)
+    assert omitidos.status_code == 200
+    for campo in ("perfil_local", "historial_salir", "historial_casa", "mente", "lang"):
+        nulo = cliente.post("/api/mando-integral", json={**BASE, campo: None})
+        assert nulo.status_code == 200, campo
+        assert nulo.json() == omitidos.json(), campo
+
+def test_tipos_invalidos_siguen_siendo_400():
+    for campo, valor in (("perfil_local", [1]), ("historial_casa", {"id": 1}), ("lang", ["es"])):
+        respuesta = cliente.post("/api/mando-integral", json={**BASE, campo: valor})
+        assert respuesta.status_code == 400, campo
@@ -0,0 +1,61 @@
+"""Motor de perfiles frente a las reglas de engine.js."""
+import random
+import uuid
+
+from fastapi.testclient import TestClient
+
+import main
+
+def regla_boton_gps(perfil, vector):
+    """Transcripción de engine.js (botón GPS al terminar la cuenta atrás de SALIR)."""
+    perfil = dict(perfil)
+    for necesidad in vector:
+        if necesidad != "indicador_ansiedad" and perfil.get(necesidad) is not None:
+            perfil[necesidad] = min(perfil[necesidad] + (vector[necesidad] * 0.1), 100)
+    perfil["indicador_ansiedad"] = max(0, perfil["indicador_ansiedad"] - 10)
+    return perfil
+
+def test_salir_completada_equivale_al_boton_gps():
+    rng = random.Random(20240601)
+    ahora = 1_700_000_000
+    for mision in main.CATALOGO.tabla_salir().misiones:
+        # El cliente suma el vector_entorno_seleccionado que recibió en la respuesta
+        renderizada = main.renderizar_mision_salir(mision, "es", "0", "solo", "")
+        perfil = {necesidad: rng.randint(0, 100) for necesidad in main.NECESIDADES_PERFIL}
+        esperado = regla_boton_gps(perfil, renderizada["vector_entorno_seleccionado"])
+
+        estado = main.estado_sesion_vacio()
+        main.MOTOR_PERFILES.fijar(estado, perfil, ahora)
+        vector = main.vector_evento({"evento": "salir_completada", "mision_id": mision.id}, main.CATALOGO)
+        obtenido = main.MOTOR_PERFILES.aplicar_evento(estado, "salir_completada", vector, ahora)
+        for necesidad in main.NECESIDADES_PERFIL:
+            assert abs(obtenido[necesidad] - esperado[necesidad]) <= 0.005, (mision.id, necesidad)
+
+def test_vector_compacto_completado_como_en_engine_js():
+    for mision in main.CATALOGO.tabla_salir().misiones:
+        renderizada = main.renderizar_mision_salir(mision, "es", "0", "solo", "")
+        compacta = main.compactar_mision(renderizada)
+        # engine.js: { ...DEFAULT_NECESSITY_PROFILE, ...vector_entorno_seleccionado }
+        completado = {**main.DEFAULT_NECESSITY_VECTOR, **compacta["vector_entorno_seleccionado"]}
+        assert completado == renderizada["vector_entorno_seleccionado"]
+
+def test_rutas_de_perfil_no_exponen_el_indicador_de_ansiedad():
+    cliente = TestClient(main.app)
+    token = f"prueba-{uuid.uuid4().hex}"
+    main.ALMACEN_SESIONES.guardar(token, main.estado_sesion_vacio())
+    evento = cliente.post("/api/perfil-evento", json={"sesion": token, "evento": "adelanto_respiracion"})
+    perfil = cliente.get("/api/perfil", params={"sesion": token})
+    for respuesta in (evento, perfil):
+        assert respuesta.status_code == 200
+        assert set(respuesta.json()["perfil_local"]) == set(main.NECESIDADES_PUBLICAS)
+    # El evento sí se aplicó al perfil guardado
+    assert main.MOTOR_PERFILES.leer(main.ALMACEN_SESIONES.obtener(token))["indicador_ansiedad"] == 5
+
+def test_mision_id_que_no_es_entero_ni_cadena():
+    cliente = TestClient(main.app)
+    token = f"prueba-{uuid.uuid4().hex}"
+    main.ALMACEN_SESIONES.guardar(token, main.estado_sesion_vacio())
+    for mision_id in ([1], {"id": 1}, True, 1.5):
+        respuesta = cliente.post("/api/perfil-evento", json={"sesion": token, "evento": "casa_completada", "mision_id": mision_id})
+        assert respuesta.status_code == 400, mision_id
+    assert main.ALMACEN_SESIONES.obtener(token) == main.estado_sesion_vacio()
@@ -0,0 +1,70 @@
+"""Recuperación en dos etapas: la lista corta se puntúa igual que con el scoring completo."""
+import random
+
+import numpy as np
+
+import main
+
+NECESIDADES = [k for k in main.DEFAULT_NECESSITY_VECTOR if k != "indicador_ansiedad"]
+
+class MisionSintetica:
+    __slots__ = ("id", "vector_necesidades")
+
+    def __init__(self, mision_id, vector):
+        self.id = mision_id
+        self.vector_necesidades = vector
+
+def catalogo_sintetico(tamano, rng):
+    return tuple(
+        MisionSintetica(i, {k: rng.randint(0, 100) for k in rng.sample(NECESIDADES, rng.randint(2, 8))})
+        for i in range(tamano)
+    )
+
+def perfil_aleatorio(rng):
+    perfil = {k: rng.randint(0, 100) for k in NECESIDADES}
+    perfil["indicador_ansiedad"] = rng.choice((0, 50, 80))
+    return perfil
+
+def test_lista_corta_con_los_mismos_scores():
+    rng = random.Random(20240601)
+    misiones = catalogo_sintetico(3000, rng)
+    matriz = main.registrar_matriz(misiones)
+    for _ in range(20):
+        perfil = perfil_aleatorio(rng)
+        historial = [rng.randrange(3000) for _ in range(5)]
+        filas, scores = main.puntuar_candidatos(misiones, perfil, historial, limite=300)
+        assert len(filas) == 300 and np.all(np.diff(filas) > 0)
+        completo = matriz.puntuar(perfil, historial)
+        assert scores == [completo[fila] for fila in filas.tolist()]
+
+def test_sin_recuperacion_se_puntua_todo():
+    rng = random.Random(5)
+    misiones = catalogo_sintetico(500, rng)
+    matriz = main.registrar_matriz(misiones)
+    perfil = perfil_aleatorio(rng)
+    filas, scores = main.puntuar_candidatos(misiones, perfil, limite=0)
+    assert filas is None and scores == matriz.puntuar(perfil)
+    assert matriz.indice_recuperacion().recuperar(perfil, 500).tolist() == list(range(500))
+
+def test_recuperacion_respeta_las_filas_pedidas():
+    rng = random.Random(9)
+    misiones = catalogo_sintetico(2000, rng)
+    matriz = main.registrar_matriz(misiones)
+    filas_permitidas = np.arange(0, 2000, 3)
+    perfil = perfil_aleatorio(rng)
+    recuperadas = matriz.indice_recuperacion().recuperar(perfil, 100, filas_permitidas)
+    assert len(recuperadas) == 100 and set(recuperadas.tolist()) <= set(filas_permitidas.tolist())
+
+def test_recall_de_las_mejores_misiones():
+    rng = random.Random(20240601)
+    misiones = catalogo_sintetico(5000, rng)
+    matriz = main.registrar_matriz(misiones)
+    aciertos = total = 0
+    for _ in range(30):
+        perfil = perfil_aleatorio(rng)
+        completo = matriz.puntuar(perfil)
+        mejores = set(np.argsort(completo)[::-1][:3].tolist())
+        filas, _ = main.puntuar_candidatos(misiones, perfil, limite=1000)
+        aciertos += len(mejores & set(filas.tolist()))
+        total += len(mejores)
+    assert aciertos / total >= 0.75
@@ -0,0 +1,108 @@
+"""MatrizMisiones (scoring vectorizado) frente a score_coincidencia, la implementación escalar de referencia."""
+import random
+
+import pytest
+
+import main
+
+NECESIDADES = [k for k in main.DEFAULT_NECESSITY_VECTOR if k != "indicador_ansiedad"]
+
+def perfil_aleatorio(rng):
+    # Perfiles densos (como llegan tras validar) y dispersos (como los usan el benchmark y el lote)
+    claves = NECESIDADES if rng.random() < 0.5 else rng.sample(NECESIDADES, rng.randint(0, len(NECESIDADES)))
+    perfil = {k: rng.choice((rng.randint(0, 100), round(rng.uniform(0, 100), 2))) for k in claves}
+    perfil["indicador_ansiedad"] = rng.choice((0, 39, 40, 69, 70, 95))
+    return perfil
+
+def historial_aleatorio(rng, misiones):
+    ids = [m.id for m in misiones]
+    return [rng.choice(ids) for _ in range(rng.randint(0, 8))]
+
+def listas_catalogo():
+    return {
+        "CASA_ES": main.CATALOGO.misiones_casa("ES"),
+        "CASA_EN": main.CATALOGO.misiones_casa("EN"),
+        "SALIR": main.CATALOGO.tabla_salir().misiones,
+    }
+
+@pytest.mark.parametrize("clave", ["CASA_ES", "CASA_EN", "SALIR"])
+def test_puntuar_equivale_a_score_coincidencia(clave):
+    misiones = listas_catalogo()[clave]
+    matriz = main.matriz_para(misiones)
+    rng = random.Random(20240601)
+    for _ in range(300):
+        perfil = perfil_aleatorio(rng)
+        historial = historial_aleatorio(rng, misiones)
+        esperado = [
+            main.score_coincidencia(perfil, m.vector_necesidades, historial, m.id) for m in misiones
+        ]
+        assert matriz.puntuar(perfil, historial) == esperado
+
+def test_puntuar_con_filas_equivale_a_puntuar_todo():
+    misiones = main.CATALOGO.tabla_salir().misiones
+    matriz = main.matriz_para(misiones)
+    filas = main.CATALOGO.filtro_salir("cansado").filas
+    rng = random.Random(7)
+    for _ in range(50):
+        perfil = perfil_aleatorio(rng)
+        historial = historial_aleatorio(rng, misiones)
+        completo = matriz.puntuar(perfil, historial)
+        assert matriz.puntuar(perfil, historial, filas) == [completo[fila] for fila in filas.tolist()]
+
+def test_puntuar_lote_equivale_a_puntuar_por_perfil():
+    misiones = main.CATALOGO.tabla_salir().misiones
+    matriz = main.matriz_para(misiones)
+    rng = random.Random(11)
+    perfiles = [perfil_aleatorio(rng) for _ in range(120)]
+    historiales = [historial_aleatorio(rng, misiones) for _ in perfiles]
+    lote = matriz.puntuar_lote(perfiles, historiales)
+    assert lote == [matriz.puntuar(p, h) for p, h in zip(perfiles, historiales)]
+
+def test_ranking_parcial_ordena_como_sorted():
+    rng = random.Random(3)
+    candidatos = [{"score": rng.choice((10, 20, 20.5, 30)), "posicion": i} for i in range(200)]
+    esperado = sorted(candidatos, key=lambda c: c["score"], reverse=True)
+    ranking = main.RankingParcial(candidatos)
+    assert ranking.top(15) == esperado[:15]
+    assert list(ranking) == esperado
+
+def seleccionar_por_ranking_original(candidatos, rng):
+    """Transcripción del selector original: ordena todo y filtra la banda."""
+    candidatos = sorted(candidatos, key=lambda x: x["score"], reverse=True)
+    mejor_score = candidatos[0]["score"]
+    if mejor_score <= 100 and len({c["score"] for c in candidatos}) == 1:
+        return rng.choice(candidatos)
+    score_umbral = max(mejor_score * 0.8, mejor_score - 150)
+    banda = [c for c in candidatos if c["score"] >= score_umbral] or candidatos[:3]
+    return rng.choices(banda, weights=[max(1, c["score"]) for c in banda], k=1)[0]
+
+def test_seleccionar_por_ranking_como_el_original():
+    rng = random.Random(17)
+    for _ in range(300):
+        valores = rng.choice(((50,), (-40, -80, -120), (90, 180, 200, 320, 400)))
+        candidatos = [{"score": rng.choice(valores), "posicion": i} for i in range(rng.randint(1, 40))]
+        semilla = rng.random()
+        esperado = seleccionar_por_ranking_original(candidatos, random.Random(semilla))
+        assert main.seleccionar_por_ranking(candidatos, random.Random(semilla)) is esperado
+
+def test_puntuar_lote_por_bloques(monkeypatch):
+    misiones = main.CATALOGO.tabla_salir().misiones
+    matriz = main.matriz_para(misiones)
+    rng = random.Random(13)
+    perfiles = [perfil_aleatorio(rng) for _ in range(37)]
+    historiales = [historial_aleatorio(rng, misiones) for _ in perfiles]
+    completo = matriz.puntuar_lote(perfiles, historiales)
+    # Bloques de 5 perfiles: el último queda incompleto
+    monkeypatch.setattr(main, "MAX_ELEMENTOS_BLOQUE_SCORING", 5 * len(misiones) * len(matriz.columnas))
+    assert matriz.puntuar_lote(perfiles, historiales) == completo
+
+def test_distancias_equivalen_a_diversidad_vector():
+    misiones = main.CATALOGO.tabla_salir().misiones
+    matriz = main.matriz_para(misiones)
+    rng = random.Random(17)
+    for _ in range(200):
+        fila = rng.randrange(len(misiones))
+        filas = rng.sample(range(len(misiones)), 3)
+        esperado = [main.diversidad_vector(misiones[fila].vector_necesidades, misiones[otra].vector_necesidades) for otra in filas]
+        assert matriz.distancias_a(fila, filas).tolist() == esperado
+        assert matriz.es_diversa(fila, filas, 100) == all(d >= 100 for d in esperado)
@@ -0,0 +1,73 @@
+"""Sesiones en el servidor: estado completo, deltas y tokens desconocidos."""
+import sqlite3
+import uuid
+
+from fastapi.testclient import TestClient
+
+import main
+
+cliente = TestClient(main.app)
+
+def token_nuevo():
+    return f"prueba-{uuid.uuid4().hex}"
+
+def pedir(**campos):
+    payload = {"modo": "CASA", "mente": "aburrido", "lang": "es", **campos}
+    respuesta = cliente.post("/api/mando-integral", json=payload)
+    assert respuesta.status_code == 200
+    return respuesta.json()
+
+def test_ida_y_vuelta_con_estado_completo_y_delta():
+    token = token_nuevo()
+    primera = pedir(sesion=token, historial_salir=[], historial_casa=[3])
+    assert primera["sesion"] == token and "sesion_desconocida" not in primera
+    assert "historial_casa_actualizado" not in primera
+    guardado = main.ALMACEN_SESIONES.obtener(token)
+    assert guardado["historial_casa"][0] == 3 and len(guardado["historial_casa"]) > 1 # + las misiones servidas
+
+    segunda = pedir(sesion=token, historial_casa_delta=[5])
+    assert "sesion_desconocida" not in segunda
+    historial = main.ALMACEN_SESIONES.obtener(token)["historial_casa"]
+    assert historial[0] == 3 and 5 in historial and len(historial) > len(guardado["historial_casa"])
+
+    perfil = cliente.get("/api/perfil", params={"sesion": token})
+    assert perfil.status_code == 200 and perfil.json()["sesion"] == token
+
+def test_token_desconocido_con_delta():
+    token = token_nuevo()
+    respuesta = pedir(sesion=token, historial_casa_delta=[5])
+    assert respuesta["sesion_desconocida"] is True
+    assert isinstance(respuesta["historial_casa_actualizado"], list) # El cliente conserva el historial completo
+    assert main.ALMACEN_SESIONES.obtener(token) is None
+
+    perfil = cliente.get("/api/perfil", params={"sesion": token})
+    assert perfil.status_code == 404 and perfil.json()["sesion_desconocida"] is True
+    evento = cliente.post("/api/perfil-evento", json={"sesion": token, "evento": "adelanto_respiracion"})
+    assert evento.status_code == 404 and evento.json()["sesion_desconocida"] is True
+    assert main.ALMACEN_SESIONES.obtener(token) is None
+
+def test_sqlite_compartido_entre_almacenes(tmp_path):
+    ruta = str(tmp_path / "sesiones.db")
+    escritor = main.AlmacenSesionesSQLite(ruta, 60)
+    lector = main.AlmacenSesionesSQLite(ruta, 60) # Otro worker sobre el mismo archivo
+    estado = {"historial_salir": [1, 2], "historial_casa": [7]}
+    escritor.guardar("compartida", estado)
+    assert lector.obtener("compartida") == estado
+    assert lector.obtener("otra") is None
+
+def test_sqlite_se_crea_al_escribir_y_purga_lo_caducado(tmp_path):
+    ruta = tmp_path / "sesiones.db"
+    almacen = main.AlmacenSesionesSQLite(str(ruta), -1, purgar_cada=3) # Cada sesión nace caducada
+    assert almacen.obtener("a") is None and not ruta.exists()
+    almacen.purgar()
+    assert not ruta.exists()
+
+    def filas():
+        with sqlite3.connect(ruta) as conexion:
+            return sorted(token for (token,) in conexion.execute("SELECT token FROM sesiones"))
+    almacen.guardar("a", main.estado_sesion_vacio())
+    almacen.guardar("b", main.estado_sesion_vacio())
+    assert filas() == ["a", "b"]
+    almacen.ttl = 60
+    almacen.guardar("c", main.estado_sesion_vacio()) # Tercera escritura: purga
+    assert filas() == ["c"]